@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+from minicontrol import header, name_map, page, validate
+from minicontrol.model import ParameterModel
+
+
+# Wall time and peak memory of each generator on synthetic parameter sets, to catch
+# super-linear paths before they reach the forks with large parameter sets.
+# Run from the repository root: python -m benchmarks.bench_generator_scaling
+default_sizes = (1000, 5000, 10000, 50000)
+
+def stream_html(model):
+    with open(os.devnull, 'w') as f:
+        page.write_html(model, f)
+
+
+outputs = {
+    'index.html': lambda model: page.build_html(model),
+    'index.html (stream)': stream_html,
+    'sysex_handler.h': lambda model: header.build_sysex_handler(model),
+    'sysex_name_map.json': lambda model: name_map.render_name_map(model),
+    'validation': lambda model: validate.validate_model(model, page.parameter_name_order),
+}
+
+
+# Synthetic parameters.json spread over the real groups/subgroups, and a name order listing every parameter
+def synthetic_parameters(size):
+    layout = [
+        (group_name, param_group)
+        for group_name in page.group_order if group_name != 'rhythm_parameter'
+        for param_group in page.subgroup_order.get(group_name, [])
+    ]
+    parameters = {}
+    name_order = {}
+    for i in range(size):
+        group_name, param_group = layout[i % len(layout)]
+        name = f'param {i}'
+        sysex_address = 20 + i
+        parameters.setdefault(group_name, []).append({
+            'name': name,
+            'group': param_group,
+            'default_value': i % 100,
+            'data_type': 'float' if i % 3 == 0 else 'int',
+            'sysex_adress': sysex_address,
+            'curve': 'linear',
+            'min_value': 0,
+            'max_value': 100,
+            'tooltip': f'synthetic parameter {i}',
+            'iterate': 1 + i % 2,
+            'method': f'synthetic_parameter[{i}]=value;',
+            'introduction_version': 0.02,
+            'ui_type': ('slider', 'discrete_slider', 'switch', 'select')[i % 4],
+            'step': 1,
+        })
+        if parameters[group_name][-1]['ui_type'] == 'select':
+            parameters[group_name][-1]['options'] = [{'value': v, 'label': str(v)} for v in range(4)]
+        # List names in reverse so the order actually has to be applied
+        name_order.setdefault(group_name, {}).setdefault(param_group, []).insert(0, name)
+    return parameters, name_order
+
+
+def measure(render, model):
+    start = time.perf_counter()
+    render(model)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    render(model)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark generator scaling on synthetic parameter sets.')
+    parser.add_argument('sizes', nargs='*', type=int, default=default_sizes, help='parameter counts to generate')
+    args = parser.parse_args(argv)
+
+    print(f"{'params':>8}  {'output':<20} {'time (s)':>10} {'peak (MB)':>10} {'us/param':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            parameters, name_order = synthetic_parameters(size)
+            path = os.path.join(directory, f'parameters_{size}.json')
+            with open(path, 'w') as f:
+                json.dump(parameters, f)
+            model = ParameterModel(path, os.path.join(directory, 'missing_name_map.json'))
+            # Synthetic addresses run past the real 256-address space
+            with mock.patch.object(page, 'parameter_name_order', name_order), \
+                    mock.patch.object(validate, 'address_space', 20 + size):
+                for output, render in outputs.items():
+                    elapsed, peak = measure(render, model)
+                    print(f'{size:8d}  {output:<20} {elapsed:10.3f} {peak / 2**20:10.1f} {elapsed * 1e6 / size:10.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
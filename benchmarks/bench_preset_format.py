@@ -0,0 +1,54 @@
+import argparse
+import json
+import sys
+import timeit
+
+from minicontrol.preset import decode_binary, decode_legacy, encode_binary, encode_binary_text
+
+
+# Size and parse time of the legacy preset strings against the binary format.
+# Run from the repository root: python -m benchmarks.bench_preset_format
+def legacy_parse_js_style(code):
+    # What index.js does today: atob(code).split(';').map(parseFloat)
+    import base64
+    code = code + '=' * (-len(code) % 4)
+    return [float(field) if field else float('nan') for field in base64.b64decode(code).decode('ascii').split(';')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the binary preset format on a preset library.')
+    parser.add_argument('library', nargs='?', default='shared_presets.json')
+    parser.add_argument('--repeat', type=int, default=200, help='parses of the whole library per measurement')
+    args = parser.parse_args(argv)
+
+    with open(args.library, 'r') as f:
+        presets = json.load(f)['shared_presets']
+    legacy_codes = [preset['value'] for preset in presets]
+    values = [decode_legacy(code) for code in legacy_codes]
+    binaries = [encode_binary(preset) for preset in values]
+    binary_codes = [encode_binary_text(preset) for preset in values]
+
+    for preset, binary in zip(values, binaries):
+        assert decode_binary(binary)[0] == preset
+
+    legacy_size = sum(len(code) for code in legacy_codes)
+    binary_size = sum(len(binary) for binary in binaries)
+    binary_text_size = sum(len(code) for code in binary_codes)
+
+    def best_time(parse, codes):
+        return min(timeit.repeat(lambda: [parse(code) for code in codes], number=args.repeat, repeat=5)) / args.repeat
+
+    legacy_time = best_time(legacy_parse_js_style, legacy_codes)
+    binary_time = best_time(decode_binary, binaries)
+
+    print(f'{len(presets)} presets from {args.library}')
+    print(f'  legacy base64 text: {legacy_size:8d} bytes')
+    print(f'  binary:             {binary_size:8d} bytes ({binary_size / legacy_size:.0%})')
+    print(f'  binary as base64:   {binary_text_size:8d} bytes ({binary_text_size / legacy_size:.0%})')
+    print(f'  legacy parse:       {legacy_time * 1e6 / len(presets):8.1f} us/preset')
+    print(f'  binary parse:       {binary_time * 1e6 / len(presets):8.1f} us/preset ({legacy_time / binary_time:.1f}x faster)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
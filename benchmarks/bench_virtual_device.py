@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+
+from minicontrol.device import VirtualController, VirtualMinichord, bank_count
+from minicontrol.model import ParameterModel
+from minicontrol.preset import decode_preset, unset_value
+from minicontrol.transfer import TransferOrder, plan_transfer
+
+
+# Parameter push rate, dump and save round trips and preset load times against the virtual
+# device. Times are virtual, so the figures only depend on the link settings.
+# Run from the repository root: python -m benchmarks.bench_virtual_device
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the SysEx protocol against a virtual minichord.')
+    parser.add_argument('--bandwidth', type=float, default=3125.0, help='link bandwidth in bytes/s, 0 for unlimited (default: DIN MIDI rate)')
+    parser.add_argument('--latency', type=float, default=0.001, help='one-way link latency in seconds')
+    parser.add_argument('--processing', type=float, default=0.0001, help='device time per message in seconds')
+    parser.add_argument('--presets', default='shared_presets.json')
+    args = parser.parse_args(argv)
+
+    model = ParameterModel()
+    order = TransferOrder(model)
+
+    def connect():
+        device = VirtualMinichord(model, bandwidth=args.bandwidth, latency=args.latency, processing_time=args.processing)
+        return device, VirtualController(device)
+
+    print(f'link: {args.bandwidth:.0f} B/s, {args.latency * 1e3:.2f} ms latency, {args.processing * 1e6:.0f} us/message on device')
+
+    device, controller = connect()
+    count = 2000
+    for i in range(count):
+        sysex_address = order.addresses[i % len(order.addresses)]
+        controller.send_parameter(sysex_address, 0)
+    elapsed = device.busy_until
+    # An unlimited link with no latency or processing takes no virtual time
+    print(f"  parameter push:   {count / elapsed if elapsed else float('inf'):10.1f} messages/s")
+
+    device, controller = connect()
+    start = controller.clock
+    controller.request_dump(0)
+    print(f'  dump round trip:  {(controller.clock - start) * 1e3:10.2f} ms')
+
+    start = controller.clock
+    for bank in range(bank_count):
+        controller.save_current_settings(bank)
+    print(f'  save round trip:  {(controller.clock - start) * 1e3 / bank_count:10.2f} ms')
+
+    with open(args.presets, 'r') as f:
+        presets = [decode_preset(preset['value']) for preset in json.load(f)['shared_presets']]
+    full_time = 0.0
+    planned_time = 0.0
+    for previous, target in zip(presets, presets[1:]):
+        for planned in (False, True):
+            device, controller = connect()
+            for sysex_address in order.addresses:
+                if previous[sysex_address] != unset_value:
+                    device.apply(sysex_address, previous[sysex_address])
+            current = controller.request_dump(device.active_bank).values.tolist()
+            start = controller.clock
+            if planned:
+                messages = plan_transfer(current, target, model, order).messages
+            else:
+                messages = [(a, target[a]) for a in order.addresses if target[a] != unset_value] + [(0, 0)]
+            for sysex_address, value in messages:
+                controller.send_parameter(sysex_address, value)
+            controller.wait_dump()
+            loaded = controller.clock - start
+            if planned:
+                planned_time += loaded
+            else:
+                full_time += loaded
+    loads = max(len(presets) - 1, 1)
+    print(f'  preset load full: {full_time * 1e3 / loads:10.2f} ms')
+    print(f'  preset load diff: {planned_time * 1e3 / loads:10.2f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
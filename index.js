@@ -1,5 +1,10 @@
 // Global variables for MIDI controller interface
 let parameters = null;
+// Address-indexed parameters from the generated parameters.index.js
+let parameterIndex = typeof PARAMETER_INDEX !== 'undefined' ? PARAMETER_INDEX : null;
+// Firmware version this page was generated for, null on the full page
+const firmwareSlice = typeof FIRMWARE_SLICE !== 'undefined' ? FIRMWARE_SLICE : null;
+let firmwareSliceChecked = false;
 let currentValues = {};
 let controller = new MiniChordController();
 let tempValues = {};
@@ -13,6 +18,9 @@ let minichord_device = false;
 const BASE_ADDRESS_RHYTHM = 220;
 let notificationQueue = [];
 let isShowingNotification = false;
+// Callbacks waiting for the next dump from the device
+let dumpWaiters = [];
+const DUMP_TIMEOUT_MS = 1000;
 
 function getFloatMultiplier(param) {
   return parseFloat(param.float_multiplier) || (param.data_type === 'float' ? (controller.float_multiplier || 100.0) : 1);
@@ -43,29 +51,159 @@ async function loadParameters() {
   }
 }
 
-async function initializeDefaultValues() {
+// Switches to the page generated for the connected firmware, if the slices were built.
+// The manifest is named by the page when it is not in firmware/, its page paths are relative to it.
+async function openFirmwareSlice(firmwareVersion) {
+  if (firmwareSliceChecked) return;
+  firmwareSliceChecked = true;
+  try {
+    const manifest = document.querySelector('meta[name="firmware-slices"]');
+    const response = await fetch(manifest ? manifest.content : 'firmware/slices.json');
+    if (!response.ok) return;
+    const slices = await response.json();
+    const match = slices.filter(slice => slice.firmware <= firmwareVersion + 1e-9).pop();
+    if (match && match.firmware !== firmwareSlice) {
+      const page = new URL(match.page, response.url);
+      console.log(`[openFirmwareSlice] Firmware ${firmwareVersion}, opening ${page}`);
+      window.location.replace(page);
+    }
+  } catch (error) {
+    console.warn('[openFirmwareSlice] No firmware slices:', error);
+  }
+}
+
+// Builds the address index from parameters.json when parameters.index.js was not generated
+async function loadParameterIndex() {
+  if (parameterIndex) return parameterIndex;
   const params = await loadParameters();
-  defaultValues = {};
+  const index = new Array(256).fill(null);
   Object.keys(params).forEach(group => {
     if (group === 'sysex_name_map') return;
     params[group].forEach(param => {
       const sysex = param.sysex_adress;
+      if (sysex < 0 || sysex >= index.length || index[sysex]) return;
       const floatMultiplier = getFloatMultiplier(param);
-      defaultValues[sysex] = param.data_type === 'float' ? param.default_value * floatMultiplier : param.default_value;
+      const applied = [...(param.method || '').matchAll(/apply_audio_parameter\(\s*(\d+)/g)].map(m => parseInt(m[1]));
+      const dependents = new Set([...(param.dependent_addresses || []), ...applied]);
+      dependents.delete(sysex);
+      index[sysex] = {
+        ...param,
+        section: group,
+        float_multiplier: floatMultiplier,
+        scaled_default: param.data_type === 'float' ? param.default_value * floatMultiplier : param.default_value,
+        dependents: [...dependents].sort((a, b) => a - b)
+      };
     });
   });
+  parameterIndex = index;
+  return parameterIndex;
+}
+
+async function initializeDefaultValues() {
+  const index = await loadParameterIndex();
+  defaultValues = {};
+  index.forEach(param => {
+    if (param) defaultValues[param.sysex_adress] = param.scaled_default;
+  });
   applyOverrideDefaults(defaultValues);
   // console.log('[DEBUG] Default values:', defaultValues);
 }
 
 function findParameterBySysex(sysex) {
-  const params = parameters;
-  for (const group of Object.keys(params)) {
-    if (group === 'sysex_name_map') continue;
-    const param = params[group].find(p => p.sysex_adress === sysex);
-    if (param) return param;
-  }
-  return null;
+  return (parameterIndex && parameterIndex[sysex]) || null;
+}
+
+// Ordering of preset transfers, mirrors minicontrol/transfer.py
+let transferOrder = null;
+const SYSEX_MESSAGE_SIZE = 6;
+const FIRMWARE_ADDRESS = 7;
+
+function getTransferOrder() {
+  if (transferOrder) return transferOrder;
+  const addresses = [];
+  const effects = {};
+  const dependents = {};
+  parameterIndex.forEach(param => {
+    if (!param) return;
+    const sysex = param.sysex_adress;
+    // Addresses 0-1 are commands and the firmware revision is read-only
+    if (sysex < 2 || sysex === FIRMWARE_ADDRESS) return;
+    addresses.push(sysex);
+    if (param.deferred_effect) effects[sysex] = param.deferred_effect.trim();
+    if (param.dependents.length) dependents[sysex] = param.dependents;
+  });
+  const dependentOf = new Set(Object.values(dependents).flat());
+  const effectRank = {};
+  Object.keys(effects).map(Number).sort((a, b) => a - b).forEach(sysex => {
+    if (!(effects[sysex] in effectRank)) effectRank[effects[sysex]] = Object.keys(effectRank).length;
+  });
+  // Independent addresses first, then those re-applying others, then the re-applied ones,
+  // and the addresses with shared LED/potentiometer/timer side effects last
+  const sortKey = sysex => {
+    if (sysex in effects) return [3, effectRank[effects[sysex]], sysex];
+    if (dependentOf.has(sysex)) return [2, 0, sysex];
+    if (sysex in dependents) return [1, 0, sysex];
+    return [0, 0, sysex];
+  };
+  transferOrder = { addresses, sortKey };
+  return transferOrder;
+}
+
+// Ask the device for the values it holds in its active bank, resolves with the dumped parameters
+// or null when no dump arrives in time
+function requestDeviceValues(timeout = DUMP_TIMEOUT_MS) {
+  return new Promise(resolve => {
+    const waiter = data => {
+      clearTimeout(timer);
+      resolve(data.parameters);
+    };
+    const timer = setTimeout(() => {
+      dumpWaiters = dumpWaiters.filter(w => w !== waiter);
+      resolve(null);
+    }, timeout);
+    dumpWaiters.push(waiter);
+    controller.sendSysEx([0, 0, 0, Math.max(controller.active_bank_number, 0)]);
+  });
+}
+
+// Send a decoded preset, only what differs from a fresh dump of the device, everything when the
+// device does not answer since the page state may not match what it holds
+async function sendPreset(target) {
+  const deviceValues = await requestDeviceValues();
+  const plan = planTransfer(deviceValues ?? {}, target);
+  plan.messages.forEach(([sysex, value]) => {
+    controller.sendParameter(sysex, value);
+    if (sysex !== 0) currentValues[sysex] = value;
+  });
+  plan.fresh = deviceValues !== null;
+  return plan;
+}
+
+// Messages needed to bring the device from current to target, each address at most once
+function planTransfer(current, target) {
+  const order = getTransferOrder();
+  const changed = [];
+  let fullMessages = 1;
+  order.addresses.forEach(sysex => {
+    const value = target[sysex];
+    if (value === undefined || value === null || isNaN(value)) return;
+    fullMessages++;
+    const rounded = Math.round(value);
+    if (current[sysex] !== rounded) changed.push([sysex, rounded]);
+  });
+  changed.sort((a, b) => {
+    const ka = order.sortKey(a[0]);
+    const kb = order.sortKey(b[0]);
+    return ka[0] - kb[0] || ka[1] - kb[1] || ka[2] - kb[2];
+  });
+  const messages = changed.length ? [...changed, [0, 0]] : [];
+  return {
+    messages,
+    fullMessages,
+    messagesSaved: fullMessages - messages.length,
+    bytesSent: SYSEX_MESSAGE_SIZE * messages.length,
+    bytesSaved: SYSEX_MESSAGE_SIZE * (fullMessages - messages.length)
+  };
 }
 
 function updateConnectionStatus(connected, message) {
@@ -205,72 +343,70 @@ function applyUIValue(param, value) {
 }
 
 async function setupParameterControls() {
-  const params = await loadParameters();
-  Object.keys(params).forEach(group => {
-    if (group === 'sysex_name_map') return;
-    params[group].forEach(param => {
-      const sysex = param.sysex_adress;
-      const floatMultiplier = getFloatMultiplier(param);
-      const defaultValue = defaultValues[sysex] ?? (param.data_type === 'float' ? param.default_value * floatMultiplier : param.default_value);
-      currentValues[sysex] = currentValues[sysex] ?? defaultValue;
-      applyUIValue(param, currentValues[sysex]);
-
-      const element = document.getElementById(`param-${sysex}`);
-      const valueDisplay = document.getElementById(`value-${sysex}`);
-      if (!element) return;
-
-      if (param.ui_type.includes('slider')) {
-        element.min = param.min_value * floatMultiplier;
-        element.max = param.max_value * floatMultiplier;
-        element.step = param.data_type === 'float' ? 0.01 * floatMultiplier : 1;
-        element.addEventListener('input', () => {
-          const uiValue = parseFloat(element.value) / floatMultiplier;
-          const deviceValue = Math.round(parseFloat(element.value));
+  const index = await loadParameterIndex();
+  index.forEach(param => {
+    if (!param) return;
+    const sysex = param.sysex_adress;
+    const floatMultiplier = getFloatMultiplier(param);
+    const defaultValue = defaultValues[sysex] ?? param.scaled_default;
+    currentValues[sysex] = currentValues[sysex] ?? defaultValue;
+    applyUIValue(param, currentValues[sysex]);
+
+    const element = document.getElementById(`param-${sysex}`);
+    const valueDisplay = document.getElementById(`value-${sysex}`);
+    if (!element) return;
+
+    if (param.ui_type.includes('slider')) {
+      element.min = param.min_value * floatMultiplier;
+      element.max = param.max_value * floatMultiplier;
+      element.step = param.data_type === 'float' ? 0.01 * floatMultiplier : 1;
+      element.addEventListener('input', () => {
+        const uiValue = parseFloat(element.value) / floatMultiplier;
+        const deviceValue = Math.round(parseFloat(element.value));
+        tempValues[sysex] = deviceValue;
+        currentValues[sysex] = deviceValue;
+        if (valueDisplay) valueDisplay.value = param.data_type === 'float' ? uiValue.toFixed(2) : deviceValue;
+        controller.sendParameter(sysex, deviceValue);
+        const valuePercent = ((element.value - element.min) / (element.max - element.min)) * 100;
+        element.style.background = `linear-gradient(to right, var(--primary-color) 0%, var(--primary-color) ${valuePercent}%, #ccc 0%, #ccc 100%)`;
+        if (sysex === 20) updateUIColor();
+      });
+      if (valueDisplay) {
+        valueDisplay.addEventListener('input', () => {
+          let inputValue = param.data_type === 'float' ? parseFloat(valueDisplay.value) : parseInt(valueDisplay.value);
+          if (isNaN(inputValue)) {
+            console.warn(`[text-input] Invalid value for ${sysex}: ${valueDisplay.value}`);
+            return;
+          }
+          inputValue = Math.max(param.min_value, Math.min(param.max_value, inputValue));
+          const deviceValue = param.data_type === 'float' ? Math.round(inputValue * floatMultiplier) : inputValue;
+          element.value = deviceValue;
           tempValues[sysex] = deviceValue;
           currentValues[sysex] = deviceValue;
-          if (valueDisplay) valueDisplay.value = param.data_type === 'float' ? uiValue.toFixed(2) : deviceValue;
+          valueDisplay.value = param.data_type === 'float' ? inputValue.toFixed(2) : inputValue;
           controller.sendParameter(sysex, deviceValue);
           const valuePercent = ((element.value - element.min) / (element.max - element.min)) * 100;
           element.style.background = `linear-gradient(to right, var(--primary-color) 0%, var(--primary-color) ${valuePercent}%, #ccc 0%, #ccc 100%)`;
           if (sysex === 20) updateUIColor();
-        });
-        if (valueDisplay) {
-          valueDisplay.addEventListener('input', () => {
-            let inputValue = param.data_type === 'float' ? parseFloat(valueDisplay.value) : parseInt(valueDisplay.value);
-            if (isNaN(inputValue)) {
-              console.warn(`[text-input] Invalid value for ${sysex}: ${valueDisplay.value}`);
-              return;
-            }
-            inputValue = Math.max(param.min_value, Math.min(param.max_value, inputValue));
-            const deviceValue = param.data_type === 'float' ? Math.round(inputValue * floatMultiplier) : inputValue;
-            element.value = deviceValue;
-            tempValues[sysex] = deviceValue;
-            currentValues[sysex] = deviceValue;
-            valueDisplay.value = param.data_type === 'float' ? inputValue.toFixed(2) : inputValue;
-            controller.sendParameter(sysex, deviceValue);
-            const valuePercent = ((element.value - element.min) / (element.max - element.min)) * 100;
-            element.style.background = `linear-gradient(to right, var(--primary-color) 0%, var(--primary-color) ${valuePercent}%, #ccc 0%, #ccc 100%)`;
-            if (sysex === 20) updateUIColor();
-            // console.log(`[text-input] Param ${sysex}, Value=${inputValue}`);
-          });
-        }
-      } else if (param.ui_type === 'select') {
-        element.addEventListener('change', () => {
-          const value = parseInt(element.value);
-          tempValues[sysex] = value;
-          currentValues[sysex] = value;
-          controller.sendParameter(sysex, value);
-          if (sysex === 20) updateUIColor();
-        });
-      } else if (param.ui_type === 'switch') {
-        element.addEventListener('input', () => {
-          const value = element.checked ? 1 : 0;
-          tempValues[sysex] = value;
-          currentValues[sysex] = value;
-          controller.sendParameter(sysex, value);
+          // console.log(`[text-input] Param ${sysex}, Value=${inputValue}`);
         });
       }
-    });
+    } else if (param.ui_type === 'select') {
+      element.addEventListener('change', () => {
+        const value = parseInt(element.value);
+        tempValues[sysex] = value;
+        currentValues[sysex] = value;
+        controller.sendParameter(sysex, value);
+        if (sysex === 20) updateUIColor();
+      });
+    } else if (param.ui_type === 'switch') {
+      element.addEventListener('input', () => {
+        const value = element.checked ? 1 : 0;
+        tempValues[sysex] = value;
+        currentValues[sysex] = value;
+        controller.sendParameter(sysex, value);
+      });
+    }
   });
   updateUIColor();
 }
@@ -282,6 +418,9 @@ function handleDataReceived(data) {
     showNotification("Invalid firmware version", "error");
     return;
   }
+  const waiters = dumpWaiters;
+  dumpWaiters = [];
+  waiters.forEach(waiter => waiter(data));
   currentValues = {};
   data.parameters.forEach((value, sysex) => {
     if (value !== undefined) {
@@ -293,6 +432,15 @@ function handleDataReceived(data) {
   rhythmPattern = data.rhythmData.map(bits => bits.reduce((acc, bit, i) => acc | (bit ? (1 << i) : 0), 0));
   targetBank = data.bankNumber;
   updateUI(data.bankNumber);
+  openFirmwareSlice(data.firmwareVersion);
+  // A firmware slice only contains supported controls
+  if (firmwareSlice !== null && firmwareSlice <= data.firmwareVersion) {
+    document.querySelectorAll('input.inactive, button.inactive, select.inactive').forEach(element => {
+      element.classList.add('active');
+      element.classList.remove('inactive');
+    });
+    return;
+  }
   // Toggle active/inactive based on firmware version
   document.querySelectorAll('input, button, select').forEach(element => {
     const requiredVersion = parseFloat(element.getAttribute('version') || 0.01);
@@ -317,16 +465,9 @@ async function updateUI(bankNumber) {
   if (bankSelect && parseInt(bankSelect.value) !== bankNumber) {
     bankSelect.value = bankNumber;
   }
-  const params = await loadParameters();
-  if (!params) return;
-  Object.keys(params).forEach(group => {
-    if (group === 'sysex_name_map') return;
-    params[group].forEach(param => {
-      const sysex = param.sysex_adress;
-      const floatMultiplier = getFloatMultiplier(param);
-      const value = currentValues[sysex] ?? (param.data_type === 'float' ? param.default_value * floatMultiplier : param.default_value);
-      applyUIValue(param, value);
-    });
+  const index = await loadParameterIndex();
+  index.forEach(param => {
+    if (param) applyUIValue(param, currentValues[param.sysex_adress] ?? param.scaled_default);
   });
   updateUIColor();
   refreshRhythmGrid();
@@ -491,7 +632,16 @@ function setupRhythmGridControls() {
   }
 }
 
+// Selects sharing an option list reference a <template> emitted once by the generator
+function fillSharedOptions() {
+  document.querySelectorAll('select[data-options]').forEach(select => {
+    const template = document.getElementById(select.dataset.options);
+    if (template && !select.options.length) select.appendChild(template.content.cloneNode(true));
+  });
+}
+
 async function initialize() {
+  fillSharedOptions();
   await initializeDefaultValues();
   await setupParameterControls();
   setupRhythmGridControls();
@@ -563,7 +713,7 @@ document.getElementById("export-settings-btn")?.addEventListener("click", () =>
   showNotification("Preset code copied to clipboard", "success");
 });
 
-document.getElementById("load-settings-btn")?.addEventListener("click", () => {
+document.getElementById("load-settings-btn")?.addEventListener("click", async () => {
   if (!controller.isConnected()) {
     console.warn("[load-settings-btn] No device connected");
     document.getElementById("information_zone")?.focus();
@@ -578,16 +728,10 @@ document.getElementById("load-settings-btn")?.addEventListener("click", () => {
       showNotification("Malformed preset code", "error");
       return;
     }
-    for (let i = 2; i < parameters.length; i++) {
-      const param = findParameterBySysex(i);
-      if (param) {
-        const value = param.data_type === "float" ? Math.round(parameters[i]) : Math.round(parameters[i]);
-        controller.sendParameter(i, value);
-        currentValues[i] = value;
-      }
-    }
-    controller.sendParameter(0, 0);
-    console.log("[load-settings-btn] Loaded settings");
+    // Only send what differs from the device, dependent and side-effect parameters last
+    const plan = await sendPreset(parameters);
+    if (!plan.fresh) console.warn("[load-settings-btn] No dump from the device, sent the full preset");
+    console.log(`[load-settings-btn] Loaded settings, sent ${plan.messages.length} of ${plan.fullMessages} messages, saved ${plan.bytesSaved} bytes`);
     showNotification("Preset loaded", "success");
   } catch (error) {
     console.warn("[load-settings-btn] Invalid preset code:", error);
@@ -597,4 +741,21 @@ document.getElementById("load-settings-btn")?.addEventListener("click", () => {
 
 document.getElementById("randomise_btn")?.addEventListener("click", generateRandomPreset);
 
+// Reload after each rebuild when served by `python -m minicontrol --watch --serve PORT` and opened with ?watch
+function watchForRebuilds() {
+  if (!new URLSearchParams(window.location.search).has('watch')) return;
+  let lastBuild = null;
+  setInterval(async () => {
+    try {
+      const response = await fetch('/__build', { cache: 'no-store' });
+      const build = await response.text();
+      if (lastBuild !== null && build !== lastBuild) window.location.reload();
+      lastBuild = build;
+    } catch (error) {
+      // The watcher is restarting, try again on the next tick
+    }
+  }, 250);
+}
+
+watchForRebuilds();
 initialize();
\ No newline at end of file
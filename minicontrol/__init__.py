@@ -0,0 +1,18 @@
+from .model import ParameterModel
+
+# Generators are imported on first access so importing the package stays cheap
+_lazy_exports = {
+    'build_html': 'page',
+    'build_sysex_handler': 'header',
+    'build_name_map': 'name_map',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_exports:
+        from importlib import import_module
+        return getattr(import_module(f'.{_lazy_exports[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['ParameterModel', 'build_html', 'build_sysex_handler', 'build_name_map']
@@ -0,0 +1,141 @@
+import gzip
+import json
+import os
+import re
+
+from .page import build_html, svg_file
+from .param_index import build_parameter_index
+
+try:
+    import brotli
+except ImportError:  # Optional, .br copies are skipped without it
+    brotli = None
+
+
+# Files served with the page besides index.html
+static_files = ('index.css', 'index.js', 'minichordcontroller.js', 'parameters.json', 'shared_presets.json', svg_file)
+# Files precompressed next to their minified copy
+compressed_suffixes = ('.html', '.css', '.js', '.json', '.svg')
+
+# Inline styles used at least this often become a class
+min_style_count = 2
+style_class_prefix = 'mc-s'
+
+tag_pattern = re.compile(r'<[a-zA-Z][^>]*>')
+style_pattern = re.compile(r'\sstyle="([^"]*)"')
+class_pattern = re.compile(r'\sclass="([^"]*)"')
+
+
+def normalize_style(style):
+    return ';'.join(declaration.strip() for declaration in style.split(';') if declaration.strip())
+
+
+# Move repeated inline styles into classes. The declarations are marked !important so they keep
+# winning over index.css exactly like the inline styles did.
+def dedupe_styles(html):
+    counts = {}
+    for style in style_pattern.findall(html):
+        style = normalize_style(style)
+        counts[style] = counts.get(style, 0) + 1
+    classes = {}
+    for style, count in sorted(counts.items(), key=lambda item: -item[1]):
+        if count >= min_style_count and style:
+            classes[style] = f'{style_class_prefix}{len(classes)}'
+
+    def replace_tag(match):
+        tag = match.group(0)
+        style = style_pattern.search(tag)
+        if not style or normalize_style(style.group(1)) not in classes:
+            return tag
+        class_name = classes[normalize_style(style.group(1))]
+        tag = tag[:style.start()] + tag[style.end():]
+        existing = class_pattern.search(tag)
+        if existing:
+            return f'{tag[:existing.start(1)]}{existing.group(1)} {class_name}{tag[existing.end(1):]}'
+        return f'{tag[:-1].rstrip()} class="{class_name}">'
+
+    rules = [
+        f'.{class_name}{{{";".join(d + "!important" for d in style.split(";"))}}}'
+        for style, class_name in classes.items()
+    ]
+    return tag_pattern.sub(replace_tag, html), '\n'.join(rules)
+
+
+# Drop the indentation between tags and collapse the remaining whitespace runs
+def minify_html(html):
+    html = re.sub(r'>\s*\n\s*<', '><', html)
+    html = re.sub(r'\s+', ' ', html)
+    return html.strip()
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_json(text):
+    return json.dumps(json.loads(text), separators=(',', ':'), ensure_ascii=False)
+
+
+def write_file(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+# Production bundle: styles deduplicated into index.css, whitespace removed, .gz and .br copies.
+# JavaScript is only precompressed, it is not minified.
+# Returns [(file, source bytes, bundled bytes, gzip bytes, brotli bytes or None)]
+def build_dist(model, directory='dist'):
+    os.makedirs(directory, exist_ok=True)
+    source_html = build_html(model)
+    html, style_rules = dedupe_styles(source_html)
+    contents = {'index.html': (len(source_html.encode('utf-8')), minify_html(html).encode('utf-8'))}
+    parameter_index = build_parameter_index(model).encode('utf-8')
+    contents['parameters.index.js'] = (len(parameter_index), parameter_index)
+    for name in static_files:
+        with open(name, 'rb') as f:
+            source = f.read()
+        if name == 'index.css':
+            bundled = minify_css(source.decode('utf-8') + '\n' + style_rules).encode('utf-8')
+        elif name.endswith('.json'):
+            bundled = minify_json(source.decode('utf-8')).encode('utf-8')
+        else:
+            bundled = source
+        contents[name] = (len(source), bundled)
+
+    report = []
+    for name, (source_size, bundled) in contents.items():
+        path = os.path.join(directory, name)
+        write_file(path, bundled)
+        gzip_size = brotli_size = None
+        if name.endswith(compressed_suffixes):
+            compressed = gzip.compress(bundled, 9, mtime=0)
+            write_file(path + '.gz', compressed)
+            gzip_size = len(compressed)
+            if brotli is not None:
+                compressed = brotli.compress(bundled, quality=11)
+                write_file(path + '.br', compressed)
+                brotli_size = len(compressed)
+        report.append((name, source_size, len(bundled), gzip_size, brotli_size))
+    return report
+
+
+def format_report(report):
+    lines = [f"{'file':<28} {'source':>9} {'bundled':>9} {'gzip':>9} {'brotli':>9}"]
+    totals = [0, 0, 0, 0]
+    for name, source_size, bundled_size, gzip_size, brotli_size in report:
+        lines.append(
+            f'{name:<28} {source_size:9d} {bundled_size:9d} '
+            f"{gzip_size if gzip_size is not None else '-':>9} {brotli_size if brotli_size is not None else '-':>9}"
+        )
+        totals[0] += source_size
+        totals[1] += bundled_size
+        totals[2] += gzip_size if gzip_size is not None else bundled_size
+        totals[3] += brotli_size if brotli_size is not None else (gzip_size if gzip_size is not None else bundled_size)
+    lines.append(f"{'total':<28} {totals[0]:9d} {totals[1]:9d} {totals[2]:9d} {totals[3] if brotli else '-':>9}")
+    if brotli is None:
+        lines.append('brotli is not installed, .br copies were skipped (pip install brotli)')
+    return lines
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+
+
+# Build cache recording the inputs each output was last generated from
+cache_file = '.generate_cache.json'
+
+package_dir = os.path.dirname(os.path.abspath(__file__))
+# Digest of each package source, keyed by (path, mtime, size) so unchanged files are not read again
+_source_digests = {}
+
+
+# Hash of the package sources: any change to a generator, or to the code it calls, changes the
+# keys of the outputs and rebuilds them
+def generator_sources():
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if not name.endswith('.py'):
+            continue
+        path = os.path.join(package_dir, name)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in _source_digests:
+            _source_digests[key] = file_digest(path)
+        digest.update(f'{name}\0{_source_digests[key]}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Hash of everything an output depends on, in a stable serialisation
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+# Keep only the given fields of each parameter
+def project_parameters(model, fields):
+    return {
+        group_name: [{field: param[field] for field in fields if field in param} for param in params]
+        for group_name, params in model.groups()
+    }
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BuildCache:
+    def __init__(self, path=cache_file, force=False):
+        self.path = path
+        self.force = force
+        self.dirty = False
+        # A missing or corrupt cache just means a full rebuild
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (ValueError, OSError):
+                self.entries = {}
+
+    # An output is up to date if its inputs are unchanged and nobody touched the file since
+    def is_up_to_date(self, output, key):
+        entry = self.entries.get(output)
+        if self.force or not entry or entry.get('key') != key or not os.path.exists(output):
+            return False
+        return entry.get('digest') == file_digest(output)
+
+    # Write content, a string or an iterable of string fragments, streaming it to a temporary file
+    # that replaces the output once complete
+    def write_output(self, output, key, content):
+        if isinstance(content, str):
+            content = [content]
+        digest = hashlib.sha256()
+        partial = output + '.tmp'
+        try:
+            with open(partial, 'w', encoding='utf-8') as f:
+                for fragment in content:
+                    f.write(fragment)
+                    digest.update(fragment.encode('utf-8'))
+        except BaseException:
+            # A render that fails partway leaves the previous output in place and no partial file
+            os.remove(partial)
+            raise
+        os.replace(partial, output)
+        self.entries[output] = {'key': key, 'digest': digest.hexdigest()}
+        self.dirty = True
+
+    # Build an output only if its key changed, returns whether it was written
+    def build(self, output, key, render):
+        if self.is_up_to_date(output, key):
+            return False
+        self.write_output(output, key, render())
+        return True
+
+    # Only touch the cache file when something was rebuilt
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        self.dirty = False
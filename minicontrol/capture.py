@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from .codec import decode_dumps, frame_size, parameter_size, sysex_end, sysex_start
+from .model import ParameterModel
+
+
+# Ingest of raw MIDI captures (concatenated SysEx, as saved by a MIDI monitor) into a columnar store.
+# The capture is memory-mapped and scanned a chunk at a time, so its size does not matter. Each
+# 0xF0 ... 0xF7 frame of dump length becomes a row of the dump columns, one file per address, and
+# each 6-byte parameter message a row of the message columns.
+# Run from the repository root:
+#   python -m minicontrol.capture ingest session.syx session.store
+#   python -m minicontrol.capture query session.store 143
+
+# Raw captures carry no clock, timestamps are derived from the byte offset at the MIDI DIN rate
+# (31250 baud, 10 bits per byte) unless another rate is given
+default_byte_rate = 3125.0
+# Bytes scanned at a time
+chunk_size = 1 << 24
+message_size = 6
+# Frames copied out of the capture at a time
+gather_batch = 4096
+no_bank = 0xFF
+
+meta_file = 'capture.json'
+dump_columns = {'time': '<f8', 'offset': '<i8', 'bank': 'u1'}
+message_columns = {'time': '<f8', 'offset': '<i8', 'bank': 'u1', 'address': '<u2', 'value': '<u2'}
+value_dtype = '<u2'
+
+
+# Start offsets and lengths of the complete frames starting in data[start:stop], and the number of
+# frames dropped. A frame ends at the first 0xF7 and is dropped if a new 0xF0 comes first or it is
+# not closed within a dump length (truncated by the capture).
+def scan_frames(data, start, stop):
+    window = data[start:min(stop + frame_size, len(data))]
+    all_starts = np.flatnonzero(window == sysex_start)
+    ends = np.flatnonzero(window == sysex_end)
+    starts = all_starts[:np.searchsorted(all_starts, stop - start)]
+    scanned = len(starts)
+    following = np.searchsorted(ends, starts)
+    closed = following < len(ends)
+    starts, following = starts[closed], following[closed]
+    frame_ends = ends[following]
+    next_start = np.searchsorted(all_starts, starts, side='right')
+    interrupted = (next_start < len(all_starts)) & (all_starts[np.minimum(next_start, len(all_starts) - 1)] < frame_ends)
+    dropped = scanned - int((~interrupted).sum())
+    starts, frame_ends = starts[~interrupted], frame_ends[~interrupted]
+    return starts + start, frame_ends - starts + 1, dropped
+
+
+# (n, width) bytes of the frames at offsets, and which of them only hold 7-bit data bytes.
+# Copied a batch at a time so the index arrays stay small.
+def gather_frames(data, offsets, width):
+    frames = np.empty((len(offsets), width), dtype=np.uint8)
+    for first in range(0, len(offsets), gather_batch):
+        batch = offsets[first:first + gather_batch]
+        frames[first:first + len(batch)] = data[batch[:, None] + np.arange(width)]
+    return frames, (frames[:, 1:-1] < 0x80).all(axis=1)
+
+
+def column_path(directory, name, dtype):
+    return os.path.join(directory, f'{name}.{np.dtype(dtype).str[1:]}')
+
+
+class StoreExistsError(Exception):
+    pass
+
+
+class CaptureWriter:
+    # Only an earlier store is replaced, any other existing path needs force
+    def __init__(self, directory, byte_rate=default_byte_rate, force=False):
+        if os.path.exists(directory):
+            if not force and not os.path.exists(os.path.join(directory, meta_file)):
+                raise StoreExistsError(f'{directory} exists and is not a capture store, pass --force to replace it')
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+            else:
+                os.remove(directory)
+        os.makedirs(os.path.join(directory, 'dumps'))
+        os.makedirs(os.path.join(directory, 'messages'))
+        self.directory = directory
+        self.byte_rate = byte_rate
+        self.files = {}
+        for name, dtype in dump_columns.items():
+            self.files['dumps', name] = open(column_path(os.path.join(directory, 'dumps'), name, dtype), 'wb')
+        for sysex_address in range(parameter_size):
+            self.files['dumps', sysex_address] = open(
+                column_path(os.path.join(directory, 'dumps'), f'{sysex_address:03d}', value_dtype), 'wb'
+            )
+        for name, dtype in message_columns.items():
+            self.files['messages', name] = open(column_path(os.path.join(directory, 'messages'), name, dtype), 'wb')
+        self.dumps = 0
+        self.messages = 0
+        self.skipped = 0
+        self.bank = no_bank
+
+    def write(self, table, name, array, dtype):
+        self.files[table, name].write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+
+    def add_dumps(self, offsets, frames):
+        if not len(offsets):
+            return
+        dumps = decode_dumps(frames)
+        self.write('dumps', 'time', offsets / self.byte_rate, dump_columns['time'])
+        self.write('dumps', 'offset', offsets, dump_columns['offset'])
+        self.write('dumps', 'bank', dumps.bank, dump_columns['bank'])
+        values = np.asfortranarray(dumps.values)
+        for sysex_address in range(parameter_size):
+            self.write('dumps', sysex_address, values[:, sysex_address], value_dtype)
+        self.dumps += len(offsets)
+
+    # Messages are tagged with the bank of the last dump before them, the bank the page was showing
+    def add_messages(self, offsets, frames, dump_offsets, dump_banks):
+        if len(offsets):
+            if len(dump_banks):
+                previous = np.searchsorted(dump_offsets, offsets) - 1
+                banks = np.where(previous >= 0, dump_banks[np.maximum(previous, 0)], self.bank)
+            else:
+                banks = np.full(len(offsets), self.bank, dtype=np.uint8)
+            self.write('messages', 'time', offsets / self.byte_rate, message_columns['time'])
+            self.write('messages', 'offset', offsets, message_columns['offset'])
+            self.write('messages', 'bank', banks, message_columns['bank'])
+            self.write('messages', 'address', frames[:, 1].astype(np.uint16) | (frames[:, 2].astype(np.uint16) << 7), '<u2')
+            self.write('messages', 'value', frames[:, 3].astype(np.uint16) | (frames[:, 4].astype(np.uint16) << 7), '<u2')
+            self.messages += len(offsets)
+        if len(dump_banks):
+            self.bank = int(dump_banks[-1])
+
+    def close(self, source, size):
+        for f in self.files.values():
+            f.close()
+        meta = {
+            'source': os.path.abspath(source),
+            'size': size,
+            'byte_rate': self.byte_rate,
+            'dumps': self.dumps,
+            'messages': self.messages,
+            'skipped': self.skipped,
+        }
+        with open(os.path.join(self.directory, meta_file), 'w') as f:
+            json.dump(meta, f, indent=2)
+            f.write('\n')
+        return meta
+
+
+def ingest(source, directory, byte_rate=default_byte_rate, chunk=chunk_size, force=False):
+    writer = CaptureWriter(directory, byte_rate, force)
+    size = os.path.getsize(source)
+    data = np.memmap(source, dtype=np.uint8, mode='r') if size else np.zeros(0, dtype=np.uint8)
+    for start in range(0, size, chunk):
+        offsets, lengths, dropped = scan_frames(data, start, min(start + chunk, size))
+        dump_offsets = offsets[lengths == frame_size]
+        message_offsets = offsets[lengths == message_size]
+        dump_frames, dump_valid = gather_frames(data, dump_offsets, frame_size)
+        message_frames, message_valid = gather_frames(data, message_offsets, message_size)
+        writer.skipped += dropped + len(offsets) - int(dump_valid.sum()) - int(message_valid.sum())
+
+        dump_offsets, dump_frames = dump_offsets[dump_valid], dump_frames[dump_valid]
+        writer.add_dumps(dump_offsets, dump_frames)
+        dump_banks = dump_frames[:, 3] if len(dump_frames) else np.zeros(0, dtype=np.uint8)
+        writer.add_messages(message_offsets[message_valid], message_frames[message_valid], dump_offsets, dump_banks)
+    del data
+    return writer.close(source, size)
+
+
+# Read side of the store, every column is memory-mapped on first use
+class CaptureStore:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, meta_file), 'r') as f:
+            self.meta = json.load(f)
+
+    def column(self, table, name, dtype):
+        count = self.meta[table]
+        if not count:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(column_path(os.path.join(self.directory, table), name, dtype), dtype=dtype, mode='r', shape=(count,))
+
+    def dump_column(self, name):
+        if isinstance(name, int):
+            return self.column('dumps', f'{name:03d}', value_dtype)
+        return self.column('dumps', name, dump_columns[name])
+
+    def message_column(self, name):
+        return self.column('messages', name, message_columns[name])
+
+    # Values of an address over the session as (time, bank, value, from_dump) arrays in capture order.
+    # Dumps only read the column of the address, messages are found with a scan of the address column.
+    # changes_only keeps the first row and each row whose value differs from the row before.
+    def history(self, sysex_address, changes_only=True):
+        if not 0 <= sysex_address < parameter_size:
+            raise ValueError(f'address {sysex_address} is outside the dump (0-{parameter_size - 1})')
+        rows = np.flatnonzero(self.message_column('address') == sysex_address)
+        offsets = np.concatenate([self.dump_column('offset'), self.message_column('offset')[rows]])
+        order = np.argsort(offsets, kind='stable')
+        times = np.concatenate([self.dump_column('time'), self.message_column('time')[rows]])[order]
+        banks = np.concatenate([self.dump_column('bank'), self.message_column('bank')[rows]])[order]
+        values = np.concatenate([self.dump_column(sysex_address), self.message_column('value')[rows]])[order]
+        from_dump = (order < self.meta['dumps'])
+        if changes_only and len(values):
+            changed = np.concatenate([[True], values[1:] != values[:-1]])
+            times, banks, values, from_dump = times[changed], banks[changed], values[changed], from_dump[changed]
+        return times, banks, values, from_dump
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.capture', description='Ingest and query captured SysEx dump logs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = commands.add_parser('ingest', help='scan a raw capture into a columnar store')
+    ingest_parser.add_argument('capture', help='raw MIDI bytes, e.g. a .syx file')
+    ingest_parser.add_argument('store', help='directory of the store, an earlier store there is replaced')
+    ingest_parser.add_argument('--force', action='store_true', help='replace the store path even if it is not a capture store')
+    ingest_parser.add_argument('--byte-rate', type=float, default=default_byte_rate, help='capture bytes per second, for the timestamps')
+    ingest_parser.add_argument('--chunk-size', type=int, default=chunk_size, help='bytes scanned at a time')
+    query = commands.add_parser('query', help='how an address changed over the capture')
+    query.add_argument('store')
+    query.add_argument('address', type=int)
+    query.add_argument('--all', action='store_true', help='print every row, not only the changes')
+    query.add_argument('--parameters', default='parameters.json')
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        start = time.perf_counter()
+        try:
+            meta = ingest(args.capture, args.store, args.byte_rate, args.chunk_size, args.force)
+        except StoreExistsError as error:
+            print(error, file=sys.stderr)
+            return 1
+        elapsed = time.perf_counter() - start
+        print(
+            f"Ingested {meta['dumps']} dumps and {meta['messages']} messages ({meta['skipped']} frames skipped) "
+            f"from {meta['size'] / 1e6:.1f} MB in {elapsed:.2f} s ({meta['size'] / 1e6 / elapsed if elapsed else 0:.0f} MB/s)"
+        )
+        return 0
+
+    store = CaptureStore(args.store)
+    param = next(
+        (param for _, param in ParameterModel(args.parameters).iter_parameters() if param['sysex_adress'] == args.address), None
+    )
+    multiplier = 1
+    if param is not None:
+        multiplier = ParameterModel.float_multiplier(param)
+        print(f"{param['name']} (address {args.address})")
+    times, banks, values, from_dump = store.history(args.address, changes_only=not args.all)
+    for when, bank, value, dumped in zip(times, banks, values, from_dump):
+        bank = '-' if bank == no_bank else chr(ord('a') + int(bank))
+        print(f"{when:>12.3f} s  bank {bank}  {'dump' if dumped else 'message':<7}  {int(value):>5}  {value / multiplier:g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
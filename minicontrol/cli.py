@@ -0,0 +1,184 @@
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import BuildCache
+from .model import ParameterModel
+from .profiling import Profiler, stage, write_report
+from .validate import ValidationError, check_model, format_errors, validate_model
+
+
+# Each target only imports the generator it needs, so a header rebuild never loads the page templates
+# The page is pointed at the slices manifest of --slices-dir
+def build_html_target(model, cache, args):
+    from .cache import content_hash
+    from .page import html_cache_key, iter_html, slices_manifest_path
+    manifest = slices_manifest_path(args.slices_dir)
+    return cache.build('index.html', content_hash(html_cache_key(model), manifest), lambda: iter_html(model, manifest=manifest))
+
+
+def build_header_target(model, cache, args):
+    from .header import build_sysex_handler, dispatch_report, header_cache_key
+    built = cache.build(
+        'sysex_handler.h',
+        header_cache_key(model, args.dispatch, args.curves),
+        lambda: build_sysex_handler(model, args.dispatch, args.curves)
+    )
+    if args.dispatch == 'table':
+        print('Dispatch comparison (estimate):')
+        for line in dispatch_report(model):
+            print(f'  {line}')
+    return built
+
+
+def build_parameter_index_target(model, cache, args):
+    from .param_index import build_parameter_index, parameter_index_cache_key
+    return cache.build('parameters.index.js', parameter_index_cache_key(model), lambda: build_parameter_index(model))
+
+
+def build_name_map_target(model, cache, args):
+    from .name_map import name_map_cache_key, render_name_map
+    return cache.build(model.name_map_path, name_map_cache_key(model), lambda: render_name_map(model))
+
+
+# Production bundle, always rebuilt since it is not part of the tracked outputs
+def build_dist_target(model, cache, args):
+    from .bundle import build_dist, format_report
+    for line in format_report(build_dist(model, args.dist_dir)):
+        print(line)
+    return True
+
+
+# Page, address index and header cut for each firmware version
+def build_slices_target(model, cache, args):
+    from .slices import build_slices, format_report
+    for line in format_report(build_slices(model, cache, args.slices_dir, args.dispatch, args.curves)):
+        print(line)
+    return True
+
+
+targets = {
+    'html': [('index.html', build_html_target)],
+    'header': [('sysex_handler.h', build_header_target)],
+    'name-map': [('sysex_name_map.json', build_name_map_target)],
+    'index': [('parameters.index.js', build_parameter_index_target)],
+    # What generate.py produces, the name map is derived in memory and feeds the page
+    'build': [
+        ('sysex_name_map.json', build_name_map_target),
+        ('index.html', build_html_target),
+        ('parameters.index.js', build_parameter_index_target),
+        ('sysex_handler.h', build_header_target)
+    ],
+    'dist': [('dist', build_dist_target)],
+    'slices': [('firmware slices', build_slices_target)],
+}
+
+
+# Full check, including stale entries of the page's name-based order
+def validate(model):
+    from .page import parameter_name_order
+    errors, warnings = validate_model(model, parameter_name_order)
+    for line in format_errors(warnings):
+        print(f'warning: {line}')
+    for line in format_errors(errors):
+        print(f'error: {line}')
+    print(f'{model.parameters_path}: {len(errors)} error(s), {len(warnings)} warning(s)')
+    return 1 if errors else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol', description='Generate the minicontrol web UI and firmware header.')
+    parser.add_argument('target', nargs='?', default='build', choices=sorted([*targets, 'validate']), help='output(s) to generate (default: build)')
+    parser.add_argument('--parameters', default='parameters.json', help='parameter definition file')
+    parser.add_argument('--name-map', default='sysex_name_map.json', help='sysex name map file')
+    parser.add_argument('--read-name-map', action='store_true', help='read the name map from --name-map instead of deriving it from the parameters')
+    parser.add_argument('--dispatch', default='switch', choices=['switch', 'table'], help='apply_audio_parameter dispatch form in sysex_handler.h (default: switch)')
+    parser.add_argument('--curves', action='store_true', help='read float and non-linear parameters from curve lookup tables in sysex_handler.h (the page still shows linear slider values)')
+    parser.add_argument('--dist-dir', default='dist', help='output directory of the dist target (default: dist)')
+    parser.add_argument('--slices-dir', default='firmware', help='output directory of the slices target (default: firmware)')
+    parser.add_argument('--jobs', type=int, default=4, help='outputs built at the same time (default: 4)')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the inputs are unchanged')
+    parser.add_argument('--watch', action='store_true', help='keep running and rebuild whenever an input changes')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='with --watch, serve the page on localhost:PORT, open it with ?watch to reload on rebuilds')
+    parser.add_argument('--profile', metavar='REPORT', help='write per-stage times and allocation counts to this JSON file')
+    parser.add_argument('--profile-memory', action='store_true', help='with --profile, trace allocated and peak bytes per stage (tracemalloc)')
+    parser.add_argument('--profile-calls', action='store_true', help='with --profile, add the slowest functions from a cProfile capture')
+    parser.add_argument('--profile-depth', '--max-depth', type=int, metavar='N', help='with --profile, only record stages nested up to N deep (default: all)')
+    return parser.parse_args(argv)
+
+
+# Validate and build the target, shared by a single run and each rebuild of --watch.
+# The model is parsed once, the outputs are then built concurrently from it.
+def run(model, cache, args):
+    # Without a report only the top-level stages of the summary line are timed
+    profiler = Profiler(args.profile_memory, args.profile_calls, max_depth=args.profile_depth if args.profile else 1)
+    with profiler:
+        status, results = build(model, cache, args, profiler)
+    if status:
+        return status
+
+    generated = [output for output, built in results if built]
+    skipped = [output for output, built in results if not built]
+    if generated:
+        print(f"Generated {' and '.join(generated)}")
+    if skipped:
+        print(f"Up to date: {' and '.join(skipped)}")
+    print('Stage times: ' + ', '.join(profiler.summary()) + f', total {profiler.elapsed * 1000:.1f} ms')
+    if args.profile:
+        parameter_count = sum(1 for _ in model.iter_parameters())
+        write_report(args.profile, profiler.report(
+            target=args.target, parameters=args.parameters, parameter_count=parameter_count,
+            jobs=1 if profiler.exclusive else args.jobs, generated=generated, skipped=skipped
+        ))
+        print(f'Profile written to {args.profile}')
+    return 0
+
+
+def build(model, cache, args, profiler):
+    with stage('load json'):
+        model.parameters
+    with stage('name_to_sysex'):
+        model.name_to_sysex
+
+    # A broken definition must fail here, not in the firmware compile
+    try:
+        with stage('validate'):
+            check_model(model)
+    except ValidationError as error:
+        print(f'{args.parameters}: {error}', file=sys.stderr)
+        for line in format_errors(error.errors):
+            print(f'  {line}', file=sys.stderr)
+        return 1, []
+
+    with stage('name map'):
+        model.sysex_name_map
+
+    def build_output(output, build):
+        with stage(output):
+            return output, build(model, cache, args)
+
+    outputs = targets[args.target]
+    jobs = max(1, min(args.jobs, len(outputs)))
+    # tracemalloc and cProfile only follow this thread
+    if jobs == 1 or profiler.exclusive:
+        results = [build_output(*target) for target in outputs]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda target: build_output(*target), outputs))
+    with stage('save cache'):
+        cache.save()
+    return 0, results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    model = ParameterModel(args.parameters, args.name_map, derive_name_map=not args.read_name_map)
+    cache = BuildCache(force=args.force)
+
+    if args.target == 'validate':
+        return validate(model)
+    status = run(model, cache, args)
+    if args.watch:
+        from .watch import watch
+        return watch(model, cache, args)
+    return status
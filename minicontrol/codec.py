@@ -0,0 +1,92 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# Layout of the parameter dump sent by the minichord, see MiniChordController.processCurrentData
+parameter_size = 256
+firmware_adress = 7
+bank_adress = 1
+base_adress_rythm = 220
+rhythm_steps = 16
+rhythm_voices = 7
+float_multiplier = 100.0
+
+# Bytes after the 0xF0 start byte, trailing 0xF7 included (the length processCurrentData checks)
+dump_size = 2 * parameter_size + 1
+# Full SysEx frame as delivered by Web MIDI
+frame_size = dump_size + 1
+
+sysex_start = 0xF0
+sysex_end = 0xF7
+
+# values: (n_dumps, 256) uint16, raw 14-bit value per address (addresses 0 and 1 included as sent)
+# rhythm: (n_dumps, 16, 7) bool, voice bits of addresses 220-235
+# bank: (n_dumps,) uint8, firmware: (n_dumps,) float64
+Dumps = namedtuple('Dumps', ['values', 'rhythm', 'bank', 'firmware'])
+
+
+# View a bytes-like object as an (n, width) uint8 array without copying
+def as_frames(data, width):
+    buffer = np.frombuffer(memoryview(data).cast('B'), dtype=np.uint8)
+    if buffer.size % width:
+        raise ValueError(f'buffer length {buffer.size} is not a multiple of {width}')
+    return buffer.reshape(-1, width)
+
+
+def rhythm_bits(values):
+    steps = values[:, base_adress_rythm:base_adress_rythm + rhythm_steps]
+    return ((steps[:, :, None] >> np.arange(rhythm_voices, dtype=np.uint16)) & 1).astype(bool)
+
+
+def rhythm_values(rhythm):
+    rhythm = np.asarray(rhythm, dtype=bool)
+    return (rhythm.astype(np.uint16) << np.arange(rhythm_voices, dtype=np.uint16)).sum(axis=-1, dtype=np.uint16)
+
+
+# Decode back-to-back dumps, with their 0xF0 start byte if framed, otherwise as processCurrentData sees them
+def decode_dumps(data, framed=True):
+    frames = as_frames(data, frame_size if framed else dump_size)
+    if framed and not (frames[:, 0] == sysex_start).all():
+        raise ValueError('dump does not start with 0xF0')
+    if not (frames[:, -1] == sysex_end).all():
+        raise ValueError('dump does not end with 0xF7')
+    pairs = frames[:, 1 if framed else 0:-1].reshape(-1, parameter_size, 2)
+    values = pairs[:, :, 0].astype(np.uint16) | (pairs[:, :, 1].astype(np.uint16) << 7)
+    return Dumps(
+        values=values,
+        rhythm=rhythm_bits(values),
+        bank=pairs[:, bank_adress, 0].copy(),
+        firmware=values[:, firmware_adress] / float_multiplier
+    )
+
+
+def decode_dump(data, framed=True):
+    dumps = decode_dumps(data, framed)
+    return Dumps(dumps.values[0], dumps.rhythm[0], int(dumps.bank[0]), float(dumps.firmware[0]))
+
+
+# Encode (n_dumps, 256) values into back-to-back dumps, optionally overriding the rhythm and bank addresses
+def encode_dumps(values, rhythm=None, bank=None, framed=True):
+    values = np.array(values, dtype=np.int64, ndmin=2)
+    if values.shape[1] != parameter_size:
+        raise ValueError(f'expected {parameter_size} values per dump, got {values.shape[1]}')
+    if rhythm is not None:
+        values[:, base_adress_rythm:base_adress_rythm + rhythm_steps] = rhythm_values(rhythm).reshape(-1, rhythm_steps)
+    if bank is not None:
+        values[:, bank_adress] = bank
+    if (values < 0).any() or (values >= 1 << 14).any():
+        raise ValueError('values must fit in two 7-bit bytes (0-16383)')
+
+    offset = 1 if framed else 0
+    frames = np.empty((values.shape[0], frame_size if framed else dump_size), dtype=np.uint8)
+    if framed:
+        frames[:, 0] = sysex_start
+    frames[:, offset:-1:2] = values & 0x7F
+    frames[:, offset + 1:-1:2] = values >> 7
+    frames[:, -1] = sysex_end
+    return frames.tobytes()
+
+
+def encode_dump(values, rhythm=None, bank=None, framed=True):
+    return encode_dumps(values, None if rhythm is None else [rhythm], bank, framed)
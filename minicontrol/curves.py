@@ -0,0 +1,118 @@
+import argparse
+import math
+import struct
+import sys
+
+from .model import ParameterModel
+
+
+# Response curves of the parameters, shared by the lookup tables emitted in sysex_handler.h and the
+# offline preview. A curve maps the device value received over SysEx to the value the firmware applies.
+# The exponential curve is defined here only, it is not the firmware's own mapping. index.js keeps
+# sending and showing the linear device value of the slider, so with `--curves` the page shows the
+# slider position while the firmware applies apply_curve of it (the same only at both ends of the range).
+# Run from the repository root: python -m minicontrol.curves 137
+
+curve_types = ('linear', 'exponential')
+# Ratio between the slopes at both ends of an exponential range, about 60 dB
+exponential_base = 1000.0
+# Table entries per line in sysex_handler.h
+entries_per_line = 8
+
+
+# Device values covered by a parameter
+def device_range(param):
+    multiplier = ParameterModel.float_multiplier(param)
+    return round(param.get('min_value', 0) * multiplier), round(param.get('max_value', 1) * multiplier)
+
+
+# Parameters whose method reads a table: floats (replacing value/100.0) and non-linear curves.
+# Returns what the table depends on, parameters sharing it share one table.
+def curve_key(param):
+    curve = param.get('curve', 'linear')
+    if curve not in curve_types:
+        curve = 'linear'
+    if curve == 'linear' and param.get('data_type') != 'float':
+        return None
+    low, high = device_range(param)
+    return curve, low, high, ParameterModel.float_multiplier(param) if param.get('data_type') == 'float' else 1
+
+
+# The multiplier is always part of the name: an int and a float parameter over the same device
+# range hold different applied values and need tables of their own
+def table_name(key):
+    curve, low, high, multiplier = key
+    return f'sysex_curve_{curve}_{low}_{high}_x{multiplier:g}'.replace('.', '_')
+
+
+# Value applied by the firmware for a device value, the same for both curves at the ends of the range
+def apply_curve(key, value):
+    curve, low, high, multiplier = key
+    if curve == 'linear':
+        return value / multiplier
+    position = (min(max(value, low), high) - low) / (high - low) if high > low else 0.0
+    scaled = (math.pow(exponential_base, position) - 1) / (exponential_base - 1)
+    return (low + (high - low) * scaled) / multiplier
+
+
+# Table indexed by device value from 0 to the top of the range, the firmware clamps the index
+def curve_table(key):
+    curve, low, high, multiplier = key
+    return [apply_curve(key, value) for value in range(high + 1)]
+
+
+# Shortest text giving back the same 32-bit float, so the table holds exactly float(apply_curve(...))
+def c_float(value):
+    value = struct.unpack('f', struct.pack('f', value))[0]
+    text = f'{value:.9g}'
+    if '.' not in text and 'e' not in text and 'inf' not in text:
+        text += '.0'
+    return text + 'f'
+
+
+# Tables of every curve used by the model, as (name, key, values) in name order
+def curve_tables(model):
+    keys = {curve_key(param) for _, param in model.iter_parameters() if param.get('method')}
+    keys.discard(None)
+    return sorted(((table_name(key), key, curve_table(key)) for key in keys), key=lambda table: table[0])
+
+
+def render_curve_table(name, key, values):
+    lines = [
+        '    ' + ', '.join(c_float(value) for value in values[start:start + entries_per_line]) + ','
+        for start in range(0, len(values), entries_per_line)
+    ]
+    curve, low, high, multiplier = key
+    return '\n'.join([
+        f'// {curve} curve over device values {low}-{high}',
+        f'static const float {name}[{len(values)}] PROGMEM = {{',
+        *lines,
+        '};',
+    ])
+
+
+# Preview the applied values of one parameter at a few device values
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.curves', description='Preview the response curve of a parameter.')
+    parser.add_argument('address', type=int, help='sysex address of the parameter')
+    parser.add_argument('--steps', type=int, default=10, help='points to print across the range')
+    parser.add_argument('--parameters', default='parameters.json')
+    args = parser.parse_args(argv)
+
+    model = ParameterModel(args.parameters)
+    param = next((param for _, param in model.iter_parameters() if param['sysex_adress'] == args.address), None)
+    if param is None:
+        print(f'No parameter at address {args.address}', file=sys.stderr)
+        return 1
+    key = curve_key(param)
+    low, high = device_range(param)
+    print(f"{param['name']} ({param.get('curve', 'linear')}, {param.get('data_type')})")
+    for step in range(args.steps + 1):
+        value = round(low + (high - low) * step / args.steps)
+        applied = value if key is None else apply_curve(key, value)
+        print(f'{value:>8} -> {applied:.6g}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
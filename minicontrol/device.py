@@ -0,0 +1,167 @@
+from .codec import decode_dump, encode_dump, firmware_adress, parameter_size
+from .model import ParameterModel
+
+
+bank_count = 12
+default_firmware = 0.09
+# Master tuning is stored outside the presets and survives bank changes
+master_tuning_adress = 255
+
+# Commands sent as address 0, value = command + 128 * bank (SysEx [0, 0, command, bank])
+command_dump = 0
+command_reset_memory = 1
+command_save = 2
+command_reset_bank = 3
+
+
+def frame(payload):
+    return bytes([0xF0, *payload, 0xF7])
+
+
+# One direction of a MIDI link: serialises messages at a given bandwidth and adds a fixed latency
+class LinkChannel:
+    def __init__(self, bandwidth=None, latency=0.0):
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.free_at = 0.0
+        self.messages = 0
+        self.bytes = 0
+
+    # Returns when a message handed to the link at time now arrives at the other end
+    def transmit(self, size, now):
+        start = max(now, self.free_at)
+        self.free_at = start + (size / self.bandwidth if self.bandwidth else 0.0)
+        self.messages += 1
+        self.bytes += size
+        return self.free_at + self.latency
+
+
+# Stand-in minichord speaking the protocol of minichordcontroller.js, on a virtual clock so
+# timings are reproducible regardless of the machine running it
+class VirtualMinichord:
+    def __init__(self, model=None, firmware=default_firmware, bandwidth=None, latency=0.0, processing_time=0.0):
+        self.model = model or ParameterModel()
+        self.firmware = firmware
+        self.processing_time = processing_time
+        self.uplink = LinkChannel(bandwidth, latency)
+        self.downlink = LinkChannel(bandwidth, latency)
+        self.busy_until = 0.0
+
+        self.ranges = {}
+        self.defaults = [0] * parameter_size
+        for group_name, param in self.model.iter_parameters():
+            multiplier = ParameterModel.float_multiplier(param)
+            sysex_address = param['sysex_adress']
+            self.defaults[sysex_address] = ParameterModel.scaled_default(param)
+            self.ranges[sysex_address] = (
+                round(param.get('min_value', 0) * multiplier),
+                round(param.get('max_value', 0x3FFF) * multiplier)
+            )
+        self.master_tuning = self.defaults[master_tuning_adress]
+        self.banks = [list(self.defaults) for _ in range(bank_count)]
+        self.active_bank = 0
+        self.current = list(self.defaults)
+
+    def apply(self, sysex_address, value):
+        if sysex_address == firmware_adress or sysex_address >= parameter_size:
+            return
+        if sysex_address in self.ranges:
+            low, high = self.ranges[sysex_address]
+            value = min(max(value, low), high)
+        if sysex_address == master_tuning_adress:
+            self.master_tuning = value
+        self.current[sysex_address] = value
+
+    # 513-byte dump after the 0xF0, as checked by processCurrentData, sent as a full frame
+    def dump(self):
+        values = list(self.current)
+        values[0] = 0
+        values[1] = self.active_bank
+        values[firmware_adress] = round(self.firmware * 100)
+        values[master_tuning_adress] = self.master_tuning
+        return encode_dump(values)
+
+    def handle_command(self, command, bank):
+        if not 0 <= bank < bank_count:
+            return []
+        if command == command_dump:
+            if bank != self.active_bank:
+                self.active_bank = bank
+                self.current = list(self.banks[bank])
+            return [self.dump()]
+        if command == command_save:
+            self.banks[bank] = list(self.current)
+            self.active_bank = bank
+            return [self.dump()]
+        if command == command_reset_bank:
+            self.banks[bank] = list(self.defaults)
+            self.active_bank = bank
+            self.current = list(self.defaults)
+            return [self.dump()]
+        if command == command_reset_memory:
+            self.banks = [list(self.defaults) for _ in range(bank_count)]
+            self.current = list(self.banks[self.active_bank])
+            return [self.dump()]
+        return []
+
+    # Process one host message, returns the reply frames
+    def handle(self, message):
+        message = bytes(message)
+        if len(message) != 6 or message[0] != 0xF0 or message[-1] != 0xF7 or any(b >= 0x80 for b in message[1:-1]):
+            raise ValueError(f'malformed parameter message {message.hex()}')
+        lo_addr, hi_addr, lo_val, hi_val = message[1:-1]
+        sysex_address = lo_addr + 128 * hi_addr
+        if sysex_address == 0:
+            return self.handle_command(lo_val, hi_val)
+        self.apply(sysex_address, lo_val + 128 * hi_val)
+        return []
+
+    # Send a message at virtual time now, returns [(arrival time at the host, reply frame)]
+    def send(self, message, now):
+        arrival = self.uplink.transmit(len(message), now)
+        self.busy_until = max(arrival, self.busy_until) + self.processing_time
+        return [(self.downlink.transmit(len(reply), self.busy_until), reply) for reply in self.handle(message)]
+
+
+# Host side, the Python counterpart of MiniChordController driving a VirtualMinichord
+class VirtualController:
+    def __init__(self, device):
+        self.device = device
+        self.clock = 0.0
+        self.replies = []
+
+    def send_sysex(self, payload):
+        if any(b >= 0xF0 and b != 0xF7 for b in payload):
+            raise ValueError(f'invalid SysEx payload {payload}')
+        message = frame(payload)
+        self.replies.extend(self.device.send(message, self.clock))
+        # The host can queue the next message once this one is on the wire
+        self.clock = max(self.clock, self.device.uplink.free_at)
+
+    def send_parameter(self, address, value):
+        value = round(value)
+        self.send_sysex([address % 128, address // 128, value % 128, value // 128])
+
+    # Wait for the next dump, returns it decoded
+    def wait_dump(self):
+        if not self.replies:
+            raise TimeoutError('device sent no dump')
+        arrival, reply = self.replies.pop(0)
+        self.clock = max(self.clock, arrival)
+        return decode_dump(reply)
+
+    def request_dump(self, bank=0):
+        self.send_sysex([0, 0, command_dump, bank])
+        return self.wait_dump()
+
+    def save_current_settings(self, bank):
+        self.send_sysex([0, 0, command_save, bank])
+        return self.wait_dump()
+
+    def reset_current_bank(self):
+        self.send_sysex([0, 0, command_reset_bank, self.device.active_bank])
+        return self.wait_dump()
+
+    def reset_memory(self):
+        self.send_sysex([0, 0, command_reset_memory, 0])
+        return self.wait_dump()
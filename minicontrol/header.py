@@ -0,0 +1,248 @@
+import math
+
+from .cache import content_hash, generator_sources, project_parameters
+from .curves import curve_key, curve_tables, render_curve_table, table_name
+from .profiling import stage
+
+
+# Parameter fields read by the header, anything else (e.g. a tooltip) is ignored by the build cache
+header_fields = (
+    'sysex_adress', 'method', 'deferred_effect', 'data_type', 'iterate', 'curve', 'min_value', 'max_value', 'float_multiplier'
+)
+
+# Size of the SysEx address space dispatched by apply_audio_parameter
+address_space = 256
+
+# Ways apply_audio_parameter can dispatch on the address
+dispatch_modes = ('switch', 'table')
+
+# Define sysex_handler_template with escaped braces
+sysex_handler_template = '''#ifndef SYSEX_HANDLER_H
+#define SYSEX_HANDLER_H
+
+#include <stdint.h>
+
+// Set while apply_audio_parameters_batch runs, deferred side effects are skipped until the end
+static bool sysex_batch_active = false;
+{curve_tables}
+void apply_audio_parameter(int adress, int value) {{
+    switch(adress) {{
+{switch_cases}
+        default:
+            break;
+    }}
+}}
+{batch}
+#endif // SYSEX_HANDLER_H
+'''
+
+# Table form: one handler per address and a dense 256-entry function pointer table
+sysex_handler_table_template = '''#ifndef SYSEX_HANDLER_H
+#define SYSEX_HANDLER_H
+
+#include <stdint.h>
+
+// Set while apply_audio_parameters_batch runs, deferred side effects are skipped until the end
+static bool sysex_batch_active = false;
+{curve_tables}
+typedef void (*sysex_handler_t)(int value);
+
+void apply_audio_parameter(int adress, int value);
+
+static void sysex_handler_none(int value) {{
+    (void)value;
+}}
+{handlers}
+
+static const sysex_handler_t sysex_handlers[{address_space}] = {{
+{table_entries}
+}};
+
+void apply_audio_parameter(int adress, int value) {{
+    if ((unsigned int)adress < {address_space}) {{
+        sysex_handlers[adress](value);
+    }}
+}}
+{batch}
+#endif // SYSEX_HANDLER_H
+'''
+
+# Lookup tables replacing the scaling of float values and the non-linear curves, kept in flash
+curve_tables_template = '''
+#ifndef PROGMEM
+#define PROGMEM
+#endif
+
+// Read a curve table, clamping the value to the table
+#define SYSEX_CURVE(table, value) \\
+    ((table)[(value) < 0 ? 0 : ((value) >= (int)(sizeof(table) / sizeof((table)[0])) ? (int)(sizeof(table) / sizeof((table)[0])) - 1 : (value))])
+
+{tables}
+'''
+
+# Batch entry point: assign every dirty address, then run each distinct deferred effect once
+batch_template = '''
+#define SYSEX_DIRTY(mask, adress) ((mask)[(adress) >> 5] & (1UL << ((adress) & 31)))
+
+// values and dirty_mask are indexed by address, dirty_mask holds {mask_words} words of 32 bits
+void apply_audio_parameters_batch(const int *values, const uint32_t *dirty_mask) {{
+    sysex_batch_active = true;
+    for (int word = 0; word < {mask_words}; word++) {{
+        uint32_t bits = dirty_mask[word];
+        while (bits) {{
+            int adress = (word << 5) + __builtin_ctz(bits);
+            bits &= bits - 1;
+            apply_audio_parameter(adress, values[adress]);
+        }}
+    }}
+    sysex_batch_active = false;
+{deferred_effects}
+}}
+'''
+
+
+# Statements run for each address, as (sysex_address, lines) sorted by address.
+# With curves, float and non-linear parameters read their value from a curve table.
+def handler_bodies(model, curves=False):
+    handlers = []
+    for group_name, param_list in model.groups():
+        for param in param_list:
+            sysex_address = param['sysex_adress']
+            method = param.get('method', '')
+            if not method:
+                continue
+            key = curve_key(param) if curves else None
+            if key:
+                method = method.replace('value', f'SYSEX_CURVE({table_name(key)}, value)')
+            # Apply scaling for float parameters
+            elif param.get('data_type') == 'float':
+                method = method.replace('value', 'value/100.0')
+            # Ensure method ends with semicolon
+            method = method.rstrip(';') + ';'
+            # Handle iteration if specified
+            iterate = param.get('iterate', 1)
+            if iterate > 1:
+                lines = [f'for (int i=0;i<{iterate};i++){{', f'    {method}', '}']
+            else:
+                lines = [method]
+            # Side effects shared with other addresses wait for the end of a batch
+            effect = deferred_effect(param)
+            if effect:
+                lines += ['if (!sysex_batch_active) {', f'    {effect}', '}']
+            handlers.append((sysex_address, lines))
+
+    # Sort by sysex_address for readability
+    handlers.sort(key=lambda handler: handler[0])
+    return handlers
+
+
+def deferred_effect(param):
+    effect = param.get('deferred_effect', '').strip()
+    if not effect:
+        return ''
+    return effect.rstrip(';') + ';'
+
+
+# Distinct deferred effects with the addresses triggering them, in address order
+def deferred_effects(model):
+    effects = {}
+    for group_name, param in sorted(model.iter_parameters(), key=lambda item: item[1]['sysex_adress']):
+        effect = deferred_effect(param)
+        if effect and param.get('method'):
+            effects.setdefault(effect, []).append(param['sysex_adress'])
+    return list(effects.items())
+
+
+def render_batch(model):
+    blocks = []
+    for effect, addresses in deferred_effects(model):
+        condition = ' || '.join(f'SYSEX_DIRTY(dirty_mask, {sysex_address})' for sysex_address in addresses)
+        blocks.append(f'''    if ({condition}) {{
+        {effect}
+    }}''')
+    return batch_template.format(mask_words=address_space // 32, deferred_effects='\n'.join(blocks))
+
+
+def indent_lines(lines, depth):
+    return ''.join(f'\n{" " * depth}{line}' for line in lines)
+
+
+def render_curve_tables(model):
+    tables = '\n\n'.join(render_curve_table(name, key, values) for name, key, values in curve_tables(model))
+    return curve_tables_template.format(tables=tables)
+
+
+def render_switch(handlers, batch, tables=''):
+    switch_cases = []
+    for sysex_address, lines in handlers:
+        switch_cases.append(f'''
+        case {sysex_address}:{indent_lines(lines, 12)}
+            break;''')
+    return sysex_handler_template.format(switch_cases=''.join(switch_cases), batch=batch, curve_tables=tables)
+
+
+def render_table(handlers, batch, tables=''):
+    functions = []
+    entries = ['sysex_handler_none'] * address_space
+    for sysex_address, lines in handlers:
+        functions.append(f'''
+static void sysex_handler_{sysex_address}(int value) {{{indent_lines(lines, 4)}
+}}''')
+        entries[sysex_address] = f'sysex_handler_{sysex_address}'
+    return sysex_handler_table_template.format(
+        handlers='\n'.join(functions),
+        address_space=address_space,
+        table_entries='\n'.join(f'    {entry}, // {address}' for address, entry in enumerate(entries)),
+        batch=batch,
+        curve_tables=tables
+    )
+
+
+# Generate the full sysex_handler.h header
+def build_sysex_handler(model, dispatch='switch', curves=False):
+    with stage('handler bodies'):
+        handlers = handler_bodies(model, curves)
+    with stage('batch'):
+        batch = render_batch(model)
+    with stage('curve tables'):
+        tables = render_curve_tables(model) if curves else ''
+    with stage(f'render {dispatch}'):
+        if dispatch == 'table':
+            return render_table(handlers, batch, tables)
+        return render_switch(handlers, batch, tables)
+
+
+# Rough flash/latency estimate of both dispatch forms on a 32-bit Cortex-M (Thumb-2, GCC -O2).
+# Figures are indicative only, measure on the board before committing to one form.
+def dispatch_report(model):
+    addresses = [sysex_address for sysex_address, lines in handler_bodies(model)]
+    case_count = len(addresses)
+    case_range = addresses[-1] - addresses[0] + 1 if addresses else 0
+    density = case_count / case_range if case_range else 0.0
+
+    # GCC lowers a switch to a TBB/TBH jump table when dense enough, otherwise to a compare tree
+    if density >= 0.4:
+        switch_layout = 'jump table'
+        switch_bytes = 2 * case_range + 12
+        switch_cycles = '~8'
+    else:
+        switch_layout = 'compare tree'
+        switch_bytes = 8 * case_count
+        switch_cycles = f'~{3 * max(1, math.ceil(math.log2(case_count + 1)))} worst case'
+
+    # Table: one pointer per address plus a prologue/epilogue per out-of-line handler
+    table_bytes = 4 * address_space + 4 * case_count + 12
+    table_cycles = '~10'
+
+    return [
+        f'{case_count} handlers over addresses {addresses[0]}-{addresses[-1]} (density {density:.0%})' if addresses else 'no handlers',
+        f'switch: {switch_layout}, ~{switch_bytes} bytes of dispatch code/data, {switch_cycles} cycles per call',
+        f'table:  {address_space}-entry pointer table, ~{table_bytes} bytes of dispatch code/data, {table_cycles} cycles per call (constant)',
+    ]
+
+
+# Cache key: the parameter fields, template and dispatch form the header is built from
+def header_cache_key(model, dispatch='switch', curves=False):
+    template = sysex_handler_table_template if dispatch == 'table' else sysex_handler_template
+    tables = (curve_tables_template, [(name, key) for name, key, _ in curve_tables(model)]) if curves else None
+    return content_hash(generator_sources(), dispatch, template, batch_template, tables, project_parameters(model, header_fields))
@@ -0,0 +1,218 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from .model import ParameterModel
+from .preset import (
+    binary_format, decode_binary_text, decode_legacy, encode_binary_text, encode_legacy, firmware_adress, js_round,
+    parameter_size, unset_value
+)
+
+
+# Bulk migration of stored presets to the current firmware, driven by preset_migrations.json.
+# Each rule upgrades presets older than its version:
+#   {"version": 0.1, "move": {"120": 121}, "scale": {"143": 10}, "reset": [130]}
+# move copies values to their new address (all moves of a rule at once), scale multiplies a value,
+# e.g. after a float_multiplier change, and reset puts an address back to its default. Rules run
+# in version order.
+# Run from the repository root: python -m minicontrol.migrate shared_presets.json migrated.json
+rules_file = 'preset_migrations.json'
+
+# Presets handed to a worker at once with --jobs
+batch_size = 512
+# Bytes read at a time from a shared_presets.json-shaped library
+read_size = 1 << 16
+
+
+def load_rules(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        rules = json.load(f).get('migrations', [])
+    return sorted(rules, key=lambda rule: rule['version'])
+
+
+class PresetMigrator:
+    def __init__(self, model, rules, target=None, assume_firmware=None):
+        self.defaults = {}
+        self.introduced = {}
+        for _, param in model.iter_parameters():
+            sysex_address = param['sysex_adress']
+            if not 0 <= sysex_address < parameter_size or sysex_address == firmware_adress:
+                continue
+            self.defaults.setdefault(sysex_address, ParameterModel.scaled_default(param))
+            self.introduced.setdefault(sysex_address, param.get('introduction_version', 0.01))
+        self.target = target if target is not None else max(self.introduced.values(), default=0.0)
+        self.rules = [rule for rule in rules if rule['version'] <= self.target]
+        self.assume_firmware = assume_firmware
+
+    # Presets exported by the page do not record the firmware (address 7 is 0), the version rules
+    # and new-address defaults only apply when it is known or assumed
+    def firmware(self, values):
+        raw = values[firmware_adress]
+        if raw in (0, unset_value):
+            return self.assume_firmware
+        return raw / 100.0
+
+    def migrate(self, values):
+        values = list(values[:parameter_size]) + [unset_value] * (parameter_size - len(values))
+        firmware = self.firmware(values)
+        if firmware is not None:
+            for rule in self.rules:
+                if rule['version'] > firmware:
+                    self.apply_rule(values, rule)
+            # Addresses the source firmware did not have get their default, any other unset address
+            # (e.g. the master tuning, left out of presets on purpose) stays unset
+            for sysex_address, default in self.defaults.items():
+                if self.introduced[sysex_address] > firmware:
+                    values[sysex_address] = default
+        # A preset of unknown firmware skipped the version rules, stamping it would hide that from
+        # a later migration
+        values[firmware_adress] = js_round(self.target * 100) if firmware is not None else 0
+        return values
+
+    def apply_rule(self, values, rule):
+        moved = {int(source): values[int(source)] for source in rule.get('move', {})}
+        for source, destination in rule.get('move', {}).items():
+            values[int(destination)] = moved[int(source)]
+        for sysex_address, factor in rule.get('scale', {}).items():
+            sysex_address = int(sysex_address)
+            if values[sysex_address] != unset_value:
+                values[sysex_address] = min(max(js_round(values[sysex_address] * factor), 0), unset_value - 1)
+        for sysex_address in rule.get('reset', []):
+            values[int(sysex_address)] = self.defaults.get(int(sysex_address), unset_value)
+
+    # Migrate a preset record, keeping its format unless output_format is given
+    def migrate_record(self, preset, output_format=None):
+        code = preset['value']
+        binary = preset.get('format') == binary_format
+        values = decode_binary_text(code)[0] if binary else decode_legacy(code)
+        values = self.migrate(values)
+        migrated = {key: value for key, value in preset.items() if key != 'format'}
+        if (output_format or (binary_format if binary else 'legacy')) == binary_format:
+            migrated['value'] = encode_binary_text(values)
+            migrated['format'] = binary_format
+        else:
+            migrated['value'] = encode_legacy(values)
+        return migrated
+
+
+# Preset records of a JSONL file, one object per line
+def read_jsonl(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+# Preset records of a shared_presets.json-shaped library, decoded one at a time from buffered reads
+def read_library(f, key='shared_presets'):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = -1
+    while position < 0:
+        chunk = f.read(read_size)
+        if not chunk:
+            return
+        buffer += chunk
+        position = buffer.find(f'"{key}"')
+    buffer = buffer[position + len(key) + 2:]
+    opened = False
+    while True:
+        stripped = buffer.lstrip().lstrip(':' if not opened else ',').lstrip()
+        if not opened and stripped.startswith('['):
+            opened = True
+            buffer = stripped[1:]
+            continue
+        if opened and stripped.startswith(']'):
+            return
+        try:
+            preset, end = decoder.raw_decode(stripped)
+        except ValueError:
+            chunk = f.read(read_size)
+            if not chunk:
+                raise ValueError(f'unterminated "{key}" array')
+            buffer = stripped + chunk
+            continue
+        yield preset
+        buffer = stripped[end:]
+
+
+def write_jsonl(f, presets):
+    for preset in presets:
+        f.write(json.dumps(preset, ensure_ascii=False) + '\n')
+        yield preset
+
+
+def write_library(f, presets, key='shared_presets'):
+    f.write(f'{{\n    "{key}": [')
+    for i, preset in enumerate(presets):
+        item = json.dumps(preset, indent=4, ensure_ascii=False).replace('\n', '\n        ')
+        f.write(f'{"," if i else ""}\n        {item}')
+        yield preset
+    f.write('\n    ]\n}\n')
+
+
+_migrator = None
+
+
+def _init_worker(migrator, output_format):
+    global _migrator
+    _migrator = (migrator, output_format)
+
+
+def _migrate_batch(batch):
+    migrator, output_format = _migrator
+    return [migrator.migrate_record(preset, output_format) for preset in batch]
+
+
+# Migrated records in input order. With jobs > 1, batches are spread over a process pool and only
+# jobs batches are in flight at a time, so memory stays bounded whatever the collection size.
+def migrate_stream(presets, migrator, output_format=None, jobs=1):
+    if jobs <= 1:
+        for preset in presets:
+            yield migrator.migrate_record(preset, output_format)
+        return
+    batches = iter(lambda: list(itertools.islice(presets, batch_size)), [])
+    with Pool(jobs, initializer=_init_worker, initargs=(migrator, output_format)) as pool:
+        while True:
+            window = list(itertools.islice(batches, jobs))
+            if not window:
+                break
+            for batch in pool.map(_migrate_batch, window):
+                yield from batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.migrate', description='Migrate stored presets to the current firmware.')
+    parser.add_argument('source', help='shared_presets.json-shaped library, or JSONL with one preset object per line')
+    parser.add_argument('output', help='migrated presets, in the same layout as the source')
+    parser.add_argument('--rules', default=rules_file, help=f'migration rules (default: {rules_file})')
+    parser.add_argument('--parameters', default='parameters.json')
+    parser.add_argument('--target', type=float, help='firmware version to migrate to (default: newest introduction_version)')
+    parser.add_argument('--assume-firmware', type=float, help='firmware of presets that do not record one')
+    parser.add_argument('--format', choices=['binary', 'legacy'], help='preset encoding to write (default: keep each preset\'s)')
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes (default: 1)')
+    args = parser.parse_args(argv)
+
+    migrator = PresetMigrator(ParameterModel(args.parameters), load_rules(args.rules), args.target, args.assume_firmware)
+    output_format = {'binary': binary_format, 'legacy': 'legacy', None: None}[args.format]
+    jsonl = args.source.endswith('.jsonl')
+
+    start = time.perf_counter()
+    count = 0
+    with open(args.source, 'r') as source, open(args.output, 'w') as output:
+        presets = read_jsonl(source) if jsonl else read_library(source)
+        migrated = migrate_stream(presets, migrator, output_format, args.jobs)
+        for _ in (write_jsonl if jsonl else write_library)(output, migrated):
+            count += 1
+    elapsed = time.perf_counter() - start
+    print(f'Migrated {count} presets to firmware {migrator.target} in {elapsed:.2f} s ({count / elapsed if elapsed else 0:.0f} presets/s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
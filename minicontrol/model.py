@@ -0,0 +1,92 @@
+import json
+import os
+from functools import cached_property
+
+from .preset import js_round
+
+
+# Parameter model shared by all generators, every file is only read on first use
+class ParameterModel:
+    def __init__(self, parameters_path='parameters.json', name_map_path='sysex_name_map.json', derive_name_map=False):
+        self.parameters_path = parameters_path
+        self.name_map_path = name_map_path
+        # Build the name map from the parameters instead of reading sysex_name_map.json
+        self.derive_name_map = derive_name_map
+        # Set on models restricted to the parameters a firmware version supports
+        self.firmware_version = None
+
+    # Load source JSON
+    @cached_property
+    def parameters(self):
+        with open(self.parameters_path, 'r') as f:
+            return json.load(f)
+
+    # Load sysex name map, fallback to empty dict if file not found
+    @cached_property
+    def sysex_name_map(self):
+        if self.derive_name_map:
+            from .name_map import build_name_map
+            return build_name_map(self)
+        if not os.path.exists(self.name_map_path):
+            return {}
+        with open(self.name_map_path, 'r') as f:
+            return json.load(f)
+
+    # Create a mapping of parameter names to sysex_adress for each group
+    @cached_property
+    def name_to_sysex(self):
+        return {
+            group_name: {param['name']: param['sysex_adress'] for param in params}
+            for group_name, params in self.groups()
+        }
+
+    # Parameter groups, skipping the legacy embedded name map
+    def groups(self):
+        for group_name, params in self.parameters.items():
+            if group_name == 'sysex_name_map':
+                continue
+            yield group_name, params
+
+    def iter_parameters(self):
+        for group_name, params in self.groups():
+            for param in params:
+                yield group_name, param
+
+    # Factor from a parameter value to the value sent to the device, same as getFloatMultiplier in index.js
+    @staticmethod
+    def float_multiplier(param):
+        return param.get('float_multiplier', 100.0 if param.get('data_type') == 'float' else 1)
+
+    # Default of a parameter as the device holds it, rounded like the page's Math.round
+    @staticmethod
+    def scaled_default(param):
+        return js_round(param.get('default_value', 0) * ParameterModel.float_multiplier(param))
+
+    # Forget what was read from a file that changed on disk, it is parsed again on next use
+    def invalidate(self, path):
+        path = os.path.abspath(path)
+        if path == os.path.abspath(self.parameters_path):
+            for name in ('parameters', 'name_to_sysex'):
+                self.__dict__.pop(name, None)
+            if self.derive_name_map:
+                self.__dict__.pop('sysex_name_map', None)
+        if path == os.path.abspath(self.name_map_path) and not self.derive_name_map:
+            self.__dict__.pop('sysex_name_map', None)
+
+    # Firmware versions that introduced at least one parameter, oldest first
+    def introduction_versions(self):
+        return sorted({param.get('introduction_version', 0.01) for _, param in self.iter_parameters()})
+
+    # Model restricted to the parameters introduced up to this firmware version
+    def sliced(self, firmware_version):
+        sliced = ParameterModel(self.parameters_path, self.name_map_path, self.derive_name_map)
+        sliced.firmware_version = firmware_version
+        sliced.parameters = {
+            group_name: params if group_name == 'sysex_name_map' else [
+                param for param in params if param.get('introduction_version', 0.01) <= firmware_version
+            ]
+            for group_name, params in self.parameters.items()
+        }
+        addresses = {str(param['sysex_adress']) for _, param in sliced.iter_parameters()}
+        sliced.sysex_name_map = {key: label for key, label in self.sysex_name_map.items() if key in addresses}
+        return sliced
@@ -0,0 +1,47 @@
+import json
+
+from .cache import content_hash, generator_sources, project_parameters
+
+
+# Parameter fields read by the name map
+name_map_fields = ('name', 'group', 'sysex_adress')
+
+
+# Build the address -> readable label map used for the select options, sorted by label
+def build_name_map(model):
+    sysex_name_map = {}
+
+    # Loop through all top-level parameter groups
+    for group_name, params in model.parameters.items():
+        if group_name == 'hidden':
+            continue
+        readable_group = group_name.replace('_parameter', '')
+        for param in params:
+            sysex = param.get('sysex_adress')
+            name = param.get('name')
+            group = param.get('group')
+            if (
+                isinstance(sysex, int) and
+                20 <= sysex <= 219 and
+                name and name.strip()
+            ):
+                # Use group if available; fallback to sysex address
+                if group and group.lower() != 'hidden':
+                    label = f"{readable_group}: {group.lower()}: {name}"
+                else:
+                    label = f"{readable_group}: {name} ({sysex})"
+                sysex_name_map[str(sysex)] = label
+
+    # Sort sysex_name_map by value (label) alphabetically
+    return dict(sorted(sysex_name_map.items(), key=lambda x: x[1].lower()))
+
+
+# Serialised form written to sysex_name_map.json
+def render_name_map(model):
+    sysex_name_map = model.sysex_name_map if model.derive_name_map else build_name_map(model)
+    return json.dumps(sysex_name_map, indent=2)
+
+
+# Cache key: the parameter fields the name map is built from
+def name_map_cache_key(model):
+    return content_hash(generator_sources(), project_parameters(model, name_map_fields))
@@ -0,0 +1,589 @@
+import json
+import os
+
+from .cache import content_hash, generator_sources, project_parameters
+from .model import ParameterModel
+from .profiling import iterate, stage
+
+
+# Define SVG file reference (replace with your actual SVG file path)
+svg_file = 'minichord_layout_web.svg'
+
+# Parameter fields read by the page, anything else is ignored by the build cache
+html_fields = (
+    'name', 'group', 'sysex_adress', 'ui_type', 'tooltip', 'data_type', 'min_value', 'max_value',
+    'step', 'default_value', 'float_multiplier', 'introduction_version', 'special_handling',
+    'dependent_addresses', 'rhythm_step', 'options', 'option_addresses'
+)
+
+# Define desired order of parameter groups
+group_order = [
+    'global_parameter',
+    'chord_parameter',
+    'harp_parameter',
+    'chord_potentiometer',
+    'harp_potentiometer',
+    'modulation_potentiometer',
+    'sharp_button_parameter',
+    'rhythm_parameter'
+]
+
+# Define subgroup order for each group
+subgroup_order = {
+    'global_parameter': ['General', 'Effects'],
+    'chord_parameter': ['General', 'Oscillator', 'Envelope', 'Low pass filter', 'Tremolo', 'Vibrato', 'Delay', 'Reverb', 'Crunch', 'Output filter'],
+    'harp_parameter': ['General', 'Oscillator', 'Transient', 'Envelope', 'Low pass filter', 'Tremolo', 'Vibrato', 'Delay', 'Reverb', 'Crunch', 'Output filter'],
+    'chord_potentiometer': ['Potentiometer'],
+    'harp_potentiometer': ['Potentiometer'],
+    'modulation_potentiometer': ['Potentiometer'],
+    'sharp_button_parameter': ['General'],
+    'rhythm_parameter': ['Rhythm']
+}
+
+# Define parameter order by name within each subgroup
+parameter_name_order = {
+    'rhythm_parameter': {
+        'Rhythm': [
+            'default_bpm',
+            'cycle length',
+            'measure update',
+            'shuffle value',
+            'note pushed duration',
+            'rythm pattern'  # Covers SysEx 220–235 (grid)
+        ]
+    },
+    'global_parameter': {
+        'General': ['bank color', 'led attenuation', 'transpose','sharp function'],
+        'Effects': ['pan', 'reverb size', 'reverb high damping', 'reverb low damping', 'reverb low pass', 'reverb diffusion']
+    },
+    'chord_parameter': {
+        'General': [
+            'octave change',
+            'chord frame shift',
+            'key selection',
+            'barry harris mode',
+            'retrigger chords',
+            'chord shuffling',
+            'slash level',
+            'inter-note delay',
+            'random note delay'
+        ],
+        'Delay': [
+            'delay length',
+            'delay filter frequency',
+            'delay filter resonance',
+            'delay lowpass',
+            'delay bandpass',
+            'delay highpass',
+            'dry mix',
+            'delay mix'
+        ],
+        'Reverb': ['reverb level'],
+        'Crunch': ['crunch level', 'crunch type'],
+        'Oscillator': [
+            'waveform 1',
+            'amplitude 1',
+            'frequency multiplier 1',
+            'waveform 2',
+            'amplitude 2',
+            'frequency multiplier 2',
+            'waveform 3',
+            'amplitude 3',
+            'frequency multiplier 3',
+            'noise',
+            'first note',
+            'second note',
+            'third note',
+            'fourth note'
+        ],
+        'Envelope': ['attack', 'hold', 'decay', 'sustain', 'release', 'retrigger release'],
+        'Low pass filter': [
+            'base frequency',
+            'keytrack value',
+            'resonance',
+            'attack',
+            'hold',
+            'decay',
+            'sustain',
+            'release',
+            'retrigger release',
+            'LFO waveform',
+            'LFO frequency',
+            'LFO amplitude',
+            'filter sensitivity'
+        ],
+        'Tremolo': ['waveform', 'frequency', 'keytrack value', 'amplitude'],
+        'Vibrato': ['waveform', 'frequency', 'keytrack value', 'amplitude']
+    },
+    'harp_parameter': {
+        'General': [
+            'string mode',
+            'string tuning',
+            'octave change',
+            'harp frame shift',
+            'key selection',
+            'barry harris mode',
+            'retrigger harp',
+            'harp shuffling'
+        ],
+        'Delay': [
+            'delay length',
+            'delay filter frequency',
+            'delay filter resonance',
+            'delay lowpass',
+            'delay bandpass',
+            'delay highpass',
+            'dry mix',
+            'delay mix'
+        ],
+        'Reverb': ['reverb level'],
+        'Crunch': ['crunch level', 'crunch type'],
+        'Oscillator': ['waveform', 'frequency multiplier', 'amplitude', 'noise'],
+        'Envelope': ['attack', 'decay', 'sustain', 'release', 'retrigger release'],
+        'Low pass filter': [
+            'base frequency',
+            'keytrack value',
+            'resonance',
+            'attack',
+            'hold',
+            'decay',
+            'sustain',
+            'release',
+            'retrigger release',
+            'filter sensitivity'
+        ],
+        'Transient': ['waveform', 'amplitude', 'note level', 'attack', 'hold', 'decay'],
+        'Tremolo': ['waveform', 'frequency', 'amplitude'],
+        'Vibrato': [
+            'waveform',
+            'frequency',
+            'amplitude',
+            'attack',
+            'hold',
+            'decay',
+            'sustain',
+            'release',
+            'retrigger release',
+            'pitch bend',
+            'attack bend',
+            'hold bend',
+            'decay bend',
+            'retrigger release bend',
+            'intensity'
+        ],
+        'Output filter': [
+            'frequency',
+            'resonance',
+            'lowpass',
+            'bandpass',
+            'highpass',
+            'LFO waveform',
+            'LFO frequency',
+            'LFO amplitude',
+            'filter LFO sensitivity',
+            'output amplifier'
+        ]
+    },
+    'chord_potentiometer': {
+        'Potentiometer': ['chord alternate control', 'chord alternate range']
+    },
+    'harp_potentiometer': {
+        'Potentiometer': ['harp alternate control', 'harp alternate percent range']
+    },
+    'modulation_potentiometer': {
+        'Potentiometer': [
+            'mod main control',
+            'mod main percent range',
+            'mod alternate control',
+            'mod alternate percent range'
+        ]
+    }
+}
+
+
+# Option lists of the selects filled from the sysex name map. Each distinct list is emitted
+# once as a <template> and the selects reference it, index.js copies it in on load.
+class SharedOptions:
+    def __init__(self, sysex_name_map):
+        # Sort the name map once for every select
+        self.sorted_name_map = sorted(sysex_name_map.items(), key=lambda x: x[1].lower())
+        self.fragments = {}
+
+    # Template id holding the options for these addresses (all of them if None)
+    def reference(self, option_addresses=None):
+        key = None if option_addresses is None else frozenset(str(address) for address in option_addresses)
+        if key not in self.fragments:
+            options_html = ''.join([
+                f'<option value="{option_key}">{value}</option>'
+                for option_key, value in self.sorted_name_map
+                if key is None or option_key in key
+            ])
+            self.fragments[key] = (f'select-options-{len(self.fragments)}', options_html)
+        return self.fragments[key][0]
+
+    def templates_html(self):
+        return ''.join([
+            f'\n      <template id="{template_id}">{options_html}</template>'
+            for template_id, options_html in self.fragments.values()
+        ])
+
+# Generate HTML for parameter controls
+def generate_param_html(param, shared_options):
+    html = []
+    sysex_address = param['sysex_adress']
+    name = param['name']
+    ui_type = param.get('ui_type', 'hidden')
+    tooltip = param.get('tooltip', name)
+    data_type = param.get('data_type', 'int')
+    min_value = param.get('min_value', 0)
+    max_value = param.get('max_value', 1)
+    step = param.get('step', 0.01 if data_type == 'float' else 1)
+    default_value = param.get('default_value', 0)
+    float_multiplier = ParameterModel.float_multiplier(param)
+    introduction_version = param.get('introduction_version', 0.01)  # Default to 0.01
+
+    attrs = [
+        f'data-sysex-address="{sysex_address}"',
+        f'data-ui-type="{ui_type}"',
+        f'data-data-type="{data_type}"',
+        f'data-float-multiplier="{float_multiplier}"',
+        f'title="{tooltip}"',
+        f'version="{introduction_version}"'  # Add version attribute
+    ]
+    if 'special_handling' in param:
+        attrs.append(f'data-special-handling="{param["special_handling"]}"')
+    if 'dependent_addresses' in param:
+        attrs.append(f'data-dependent-addresses="{json.dumps(param["dependent_addresses"])}"')
+    if 'rhythm_step' in param:
+        attrs.append(f'data-rhythm-step="{param["rhythm_step"]}"')
+
+    if ui_type == 'slider' or ui_type == 'discrete_slider':
+        display_value = (default_value / float_multiplier) if data_type == 'float' else default_value
+        display_value_str = f"{display_value:.2f}" if data_type == 'float' else str(display_value)
+        slider_value = default_value * float_multiplier if data_type == 'float' else default_value
+        html.append(f'''
+            <div style="display: flex; align-items: center; margin: 8px 0;">
+                <label for="param-{sysex_address}" style="width: 150px; font-weight: bold;">{name}</label>
+                <input type="range" id="param-{sysex_address}" name="{name}" class="inactive"
+                       min="{min_value * float_multiplier}" max="{max_value * float_multiplier}" 
+                       step="{0.01 * float_multiplier if data_type == 'float' else 1}" 
+                       value="{slider_value}"
+                       {"data-discrete='true'" if ui_type == 'discrete_slider' else ''}
+                       {' '.join(attrs)}
+                       style="width: 150px; margin: 0 8px;">
+                <input type="number" id="value-{sysex_address}" class="inactive"
+                       value="{display_value_str}"
+                       min="{min_value}" max="{max_value}" step="{0.01 if data_type == 'float' else 1}"
+                       style="background-color: hsl(var(--primary-color-hue, 0), 10%, 95%); width: 50px; text-align: right; border: none; padding: 2px;">
+            </div>
+        ''')
+    elif ui_type == 'select':
+        if 'options' in param:
+            options_html = ''.join([
+                f'<option value="{opt["value"]}">{opt["label"]}</option>'
+                for opt in param.get('options', [])
+            ])
+        else:
+            options_html = ''
+            attrs.append(f'data-options="{shared_options.reference(param.get("option_addresses"))}"')
+        html.append(f'''
+            <div style="display: flex; align-items: center; margin: 8px 0;">
+                <label for="param-{sysex_address}" style="width: 150px; font-weight: bold;">{name}</label>
+                <select id="param-{sysex_address}" name="{name}" class="inactive" {' '.join(attrs)}
+                        style="width: 150px; padding: 5px; margin: 0 8px;">
+                    {options_html}
+                </select>
+            </div>
+        ''')
+    elif ui_type == 'switch':
+        html.append(f'''
+            <div style="display: flex; align-items: center; margin: 8px 0;">
+                <label for="param-{sysex_address}" style="width: 150px; font-weight: bold;">{name}</label>
+                <input type="checkbox" id="param-{sysex_address}" name="{name}" class="inactive"
+                       {'checked' if default_value else ''} {' '.join(attrs)}
+                       style="margin: 0 8px;">
+            </div>
+        ''')
+    return '\n'.join(html)
+
+# Generate rhythm grid HTML
+def generate_rhythm_grid_html(parameters):
+    rhythm_params = [p for p in parameters.get('rhythm_parameter', []) if 220 <= p['sysex_adress'] <= 235]
+    if not rhythm_params:
+        return ''
+    html = ['<div style="display: grid; grid-template-columns: repeat(16, 15px); gap: 5px; margin: 10px 0;">']
+    rhythm_version = rhythm_params[0].get('introduction_version', 0.01) if rhythm_params else 0.01
+    for step in range(16):
+        html.append(f'<div style="display: flex; flex-direction: column; align-items: center;">')
+        for voice in range(7):
+            sysex_address = 220 + step
+            html.append(f'''
+                <input type="checkbox" id="rhythm-checkbox-{step}-{voice}" class="inactive"
+                       data-sysex-address="{sysex_address}" data-rhythm-step="{step}"
+                       data-voice="{voice}" version="{rhythm_version}" style="margin: 2px;">
+            ''')
+        html.append('</div>')
+    html.append('</div>')
+    return '\n'.join(html)
+
+# Group parameters by subgroup, keeping their order within each subgroup
+def group_by_subgroup(params):
+    grouped_params = {}
+    for param in params:
+        param_group = param['group']
+        if param_group == 'hidden':
+            continue
+        grouped_params.setdefault(param_group, []).append(param)
+    return grouped_params
+
+# Rank of each sysex_adress within a subgroup, from the name-based order.
+# Addresses without a rank sort after the ranked ones, by address.
+def subgroup_rank(model, group_name, param_group):
+    name_to_sysex = model.name_to_sysex.get(group_name, {})
+    rank = {}
+    ranked = 0
+    for name in parameter_name_order.get(group_name, {}).get(param_group, []):
+        if name in name_to_sysex:
+            rank.setdefault(name_to_sysex[name], ranked)
+            ranked += 1
+    return rank, ranked
+
+# Generate the subgroup headers and controls of a group, one fragment at a time
+def iter_subgroups_html(model, group_name, grouped_params, shared_options):
+    # Use defined subgroup order or fallback to sorted
+    ordered_subgroups = subgroup_order.get(group_name, sorted(grouped_params.keys()))
+    for param_group in ordered_subgroups:
+        if param_group not in grouped_params:
+            continue
+        # Sort parameters by defined order or fallback to sysex_adress
+        rank, ranked = subgroup_rank(model, group_name, param_group)
+        sorted_params = sorted(
+            grouped_params[param_group],
+            key=lambda p: rank.get(p['sysex_adress'], ranked + p['sysex_adress'])
+        )
+        yield f'<h3 style="margin: 30px 0 10px; font-size: 1.5em;">{param_group}</h3>'
+        for param in sorted_params:
+            with stage('controls', item=f"{group_name}: {param['name']}"):
+                html = generate_param_html(param, shared_options)
+            yield html
+
+def has_subgroups(group_name, grouped_params):
+    return any(param_group in grouped_params for param_group in subgroup_order.get(group_name, grouped_params))
+
+# Generate HTML for parameter controls with group headers
+def iter_details_html(model, group_name, params, shared_options):
+    grouped_params = group_by_subgroup(params)
+    if not has_subgroups(group_name, grouped_params):
+        return
+
+    display_name = group_name.replace('_parameter', '').replace('_', ' ').title() + ' Parameters'
+    yield f'''
+        <details style="width: fit-content; margin: 20px 0; padding: 8px; border: none; border-radius: 5px;">
+            <summary style="width: fit-content; font-size: 1.6em; font-weight: bold; cursor: pointer;">{display_name}</summary>
+            <div style="padding: 10px;">
+                '''
+    yield from iter_subgroups_html(model, group_name, grouped_params, shared_options)
+    yield '''
+            </div>
+        </details>
+    '''
+
+# Generate the rhythm section: its regular parameters followed by the pattern grid
+def iter_rhythm_html(model, group_name, params, shared_options):
+    rhythm_params = [p for p in params if 220 <= p['sysex_adress'] <= 235]
+    other_rhythm_params = [p for p in params if p['sysex_adress'] < 220 or p['sysex_adress'] > 235]
+    if not rhythm_params and not other_rhythm_params:
+        return
+    yield '''
+                <details style="width: fit-content; margin: 20px 0; padding: 8px; border: none; border-radius: 5px;">
+                    <summary style="width: fit-content; font-size: 1.6em; font-weight: bold; cursor: pointer;">Rhythm Parameters</summary>
+                    <div style="padding: 10px;">
+                        '''
+    if other_rhythm_params:
+        yield from iter_subgroups_html(model, group_name, group_by_subgroup(other_rhythm_params), shared_options)
+    if rhythm_params:
+        yield '<h3 style="margin: 30px 0 10px; font-size: 1.5em;">Rhythm Pattern</h3>'
+        with stage('rhythm grid'):
+            html = generate_rhythm_grid_html(model.parameters)
+        yield html
+    yield '''
+                    </div>
+                </details>
+            '''
+
+# Define HTML template
+html_template = '''<!DOCTYPE html>
+<html lang="en" data-theme="light">
+<head>
+{base}  <link href="index.css" rel="stylesheet" />
+  <meta charset="UTF-8" name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+  <title>Minichord UI</title>
+</head>
+<body>
+  <div id="container" style="max-width: 100vw; margin: 0 auto;">
+    <div class="status-header">
+      <div class="title-container">
+        <h1>minicontrol</h1>
+        <span id="notification-bubble">
+          <span id="dot">●</span>
+          <span id="connection-text"></span>
+        </span>
+      </div>
+    </div>
+    <div id="header">
+      <div class="controls-container">
+        <div class="section">
+          <h5 style="margin: 0; font-size: 1.1em;">saving:</h5>
+        </div>
+        <div class="controls">
+          <div class="button_div">
+            <div class="select_container">
+              <span style="margin-right: 5px;">target bank:</span>
+              <select id="bank_number_selection" class="inactive" version="0.01">
+                <option value="0">1</option>
+                <option value="1">2</option>
+                <option value="2">3</option>
+                <option value="3">4</option>
+                <option value="4">5</option>
+                <option value="5">6</option>
+                <option value="6">7</option>
+                <option value="7">8</option>
+                <option value="8">9</option>
+                <option value="9">10</option>
+                <option value="10">11</option>
+                <option value="11">12</option>
+              </select>
+            </div>
+          </div>
+          <div class="button_div">
+            <button id="save-to-bank-btn" class="inactive" version="0.01">save to bank</button>
+          </div>
+        </div>
+        <div class="section">
+          <h5 style="margin: 0; font-size: 1.1em;">sharing:</h5>
+        </div>
+        <div class="controls">
+          <div class="button_div">
+            <button id="export-settings-btn" class="inactive" version="0.01">export settings</button>
+          </div>
+          <div class="button_div">
+            <button id="load-settings-btn" class="inactive" version="0.01">load settings</button>
+          </div>
+        </div>
+        <div class="section">
+          <h5 style="margin: 0; font-size: 1.1em;">resetting:</h5>
+        </div>
+        <div class="controls">
+          <div class="button_div">
+            <button id="reset-bank-btn" class="inactive" version="0.01">reset bank</button>
+          </div>
+          <div class="button_div">
+            <button id="reset-all-banks-btn" class="inactive" version="0.01">reset all banks</button>
+          </div>
+        </div>
+        <div class="section">
+          <h5 style="margin: 0; font-size: 1.1em;">randomising:</h5>
+        </div>
+        <div class="controls">
+          <div class="button_div">
+            <button id="randomise_btn" class="inactive" version="0.01">randomise</button>
+          </div>
+        </div>
+        <div class="section">
+          <h5 style="margin: 0; font-size: 1.1em;">theme:</h5>
+        </div>
+        <div class="controls">
+          <div class="button_div">
+            <button id="toggle-theme-btn">Toggle Dark Mode</button>
+          </div>
+        </div>
+      </div>
+      <div class="svg-container">
+        <img src="{svg_file}" alt="Minichord Logo">
+      </div>
+    </div>
+    <details>
+      <summary style="width: fit-content; font-size: 1.1em; font-weight: bold; cursor: pointer;">Connection instruction</summary>
+      <ul style="padding-left: 20px;">
+        <li>provide the system authorization for MIDI control</li>
+        <li>use a recent version of Chrome</li>
+        <li>connect the minichord with a USB cable and make sure it is on.</li>
+      </ul>
+      <div tabindex="1" id="information_zone">
+        <strong id="information_text"></strong>
+      </div>
+    </div>
+    <div id="instruction_zone" style="margin: 2px 0;">
+      For instruction on how to use this tool, please refer to the 
+      <a href="../user_manual/#custom-presets">minichord documentation.</a><br>
+      To test and load user-submitted presets, visit the 
+      <a href="https://minichord.com/minicontrol/minishop.html">minishop.</a>
+    </div>
+    <div id="parameters">
+      {parameter_sections}{shared_options}
+    </div>
+  </div>
+  <script src="minichordcontroller.js"></script>
+  <script src="{parameter_index}"></script>
+  <script src="index.js"></script>
+</body>
+</html>
+'''
+
+# Manifest of the firmware slices, index.js looks for it here unless the page names another
+slices_manifest = 'firmware/slices.json'
+
+def slices_manifest_path(directory):
+    return '/'.join([directory.replace(os.sep, '/'), 'slices.json'])
+
+# Generate the full index.html page as a stream of fragments, so memory use does not grow with
+# the parameter count and the first bytes can be served before the rest is generated
+# Firmware slices live in a subdirectory and set a base href back to the shared scripts
+def iter_html(model, base_href=None, parameter_index='parameters.index.js', manifest=slices_manifest):
+    with stage('template'):
+        page_head, page_tail = html_template.split('{parameter_sections}{shared_options}')
+        base = f'  <base href="{base_href}" />\n' if base_href else ''
+        if manifest != slices_manifest:
+            base += f'  <meta name="firmware-slices" content="{manifest}" />\n'
+        head = page_head.format(base=base, svg_file=svg_file)
+    yield head
+
+    parameters = model.parameters
+    shared_options = SharedOptions(model.sysex_name_map)
+    # Generate parameter sections in specified order
+    for group_name in group_order:
+        if group_name not in parameters or group_name == 'sysex_name_map' or group_name == 'hidden':
+            continue
+        params = parameters[group_name]
+        if group_name == 'rhythm_parameter':
+            yield from iterate('rhythm section', iter_rhythm_html(model, group_name, params, shared_options))
+        else:
+            yield from iterate(f'details {group_name}', iter_details_html(model, group_name, params, shared_options))
+
+    # Shared option lists are only known once every select has been generated
+    with stage('shared options'):
+        templates = shared_options.templates_html()
+    yield templates
+    with stage('template'):
+        tail = page_tail.format(parameter_index=parameter_index)
+    yield tail
+
+def build_html(model, base_href=None, parameter_index='parameters.index.js', manifest=slices_manifest):
+    return ''.join(iter_html(model, base_href, parameter_index, manifest))
+
+# Stream the page to a text file-like object, a binary one or a socket
+def write_html(model, out):
+    if hasattr(out, 'sendall'):
+        for fragment in iter_html(model):
+            out.sendall(fragment.encode('utf-8'))
+        return
+    binary = 'b' in getattr(out, 'mode', '') or not hasattr(out, 'encoding')
+    for fragment in iter_html(model):
+        out.write(fragment.encode('utf-8') if binary else fragment)
+
+# Cache key: the parameter fields, templates and settings the page is built from
+def html_cache_key(model):
+    return content_hash(
+        generator_sources(), html_template, svg_file, group_order, subgroup_order,
+        parameter_name_order, model.sysex_name_map, project_parameters(model, html_fields)
+    )
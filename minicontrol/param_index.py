@@ -0,0 +1,72 @@
+import json
+
+from .cache import content_hash, generator_sources, project_parameters
+from .transfer import applied_address_pattern
+
+
+# Parameter fields read by the address index
+index_fields = (
+    'name', 'group', 'sysex_adress', 'data_type', 'ui_type', 'min_value', 'max_value', 'default_value',
+    'float_multiplier', 'method', 'deferred_effect', 'dependent_addresses'
+)
+
+address_space = 256
+
+parameter_index_template = '''// Generated by minicontrol from parameters.json, do not edit.
+// One slot per SysEx address: the parameter definition, its top-level section, float multiplier,
+// scaled default and the addresses it re-applies, or null when the address is unused.
+const PARAMETER_INDEX = [
+{slots}
+];
+'''
+
+
+# Address-indexed slots as read by index.js, the first definition of an address wins
+def build_index_slots(model):
+    slots = [None] * address_space
+    for group_name, param in model.iter_parameters():
+        sysex_address = param['sysex_adress']
+        if not 0 <= sysex_address < address_space or slots[sysex_address] is not None:
+            continue
+        data_type = param.get('data_type', 'int')
+        float_multiplier = model.float_multiplier(param)
+        default_value = param.get('default_value', 0)
+        dependents = set(param.get('dependent_addresses', []))
+        dependents.update(int(a) for a in applied_address_pattern.findall(param.get('method', '')))
+        dependents.discard(sysex_address)
+        slot = {
+            'sysex_adress': sysex_address,
+            'name': param['name'],
+            'section': group_name,
+            'group': param.get('group'),
+            'data_type': data_type,
+            'ui_type': param.get('ui_type', 'hidden'),
+            'min_value': param.get('min_value', 0),
+            'max_value': param.get('max_value', 1),
+            'default_value': default_value,
+            'float_multiplier': float_multiplier,
+            'scaled_default': default_value * float_multiplier if data_type == 'float' else default_value,
+            'dependents': sorted(dependents),
+        }
+        if param.get('deferred_effect'):
+            slot['deferred_effect'] = param['deferred_effect'].strip()
+        slots[sysex_address] = slot
+    return slots
+
+
+def build_parameter_index(model):
+    slots = build_index_slots(model)
+    parameter_index = parameter_index_template.format(slots=',\n'.join(
+        f'  {json.dumps(slot, separators=(",", ":"), ensure_ascii=False)}' for slot in slots
+    ))
+    # Firmware slices tell index.js which version they were cut for
+    if model.firmware_version is not None:
+        parameter_index += f'const FIRMWARE_SLICE = {json.dumps(model.firmware_version)};\n'
+    return parameter_index
+
+
+# Cache key: the parameter fields and template the index is built from
+def parameter_index_cache_key(model):
+    return content_hash(
+        generator_sources(), parameter_index_template, model.firmware_version, project_parameters(model, index_fields)
+    )
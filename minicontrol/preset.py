@@ -0,0 +1,157 @@
+import argparse
+import base64
+import binascii
+import json
+import math
+import re
+import struct
+import sys
+from array import array
+
+
+# Binary preset layout (little-endian):
+#   magic 'MCPR' | format version (u8) | firmware (u16, raw address 7 value) | bank (u8) | count (u16)
+#   followed by count u16 values indexed by SysEx address
+preset_magic = b'MCPR'
+preset_format_version = 1
+header_struct = struct.Struct('<4sBHBH')
+
+parameter_size = 256
+firmware_adress = 7
+# Bank byte of presets not tied to a bank
+no_bank = 0xFF
+# Stored for addresses the legacy string left empty (NaN once parsed by index.js)
+unset_value = 0xFFFF
+
+legacy_format = 'legacy'
+binary_format = 'binary-v1'
+
+# Longest prefix parseFloat reads after the leading whitespace, the rest of the field is ignored
+js_float_prefix = re.compile(r'[+-]?(?:Infinity|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)')
+js_whitespace = ' \t\n\v\f\r'
+
+
+# Same as Math.round in index.js
+def js_round(value):
+    return math.floor(value + 0.5)
+
+
+# Same as parseFloat in index.js, NaN when the field does not start with a number
+def js_parse_float(field):
+    match = js_float_prefix.match(field.lstrip(js_whitespace))
+    return float(match.group().replace('Infinity', 'inf')) if match else math.nan
+
+
+# Parse a legacy preset code, the base64 of ';'-joined decimals, as leniently as atob/parseFloat do.
+# Values the device cannot hold, infinite or outside 0-0xFFFF once rounded, are a ValueError.
+def decode_legacy(code):
+    code = ''.join(code.split())
+    text = base64.b64decode(code + '=' * (-len(code) % 4)).decode('ascii')
+    values = []
+    for position, field in enumerate(text.split(';')):
+        value = js_parse_float(field)
+        if math.isnan(value):
+            values.append(unset_value)
+            continue
+        if math.isinf(value) or not 0 <= js_round(value) <= unset_value:
+            raise ValueError(f'legacy preset value {field!r} at address {position} is out of range')
+        values.append(js_round(value))
+    return values
+
+
+def encode_legacy(values):
+    text = ';'.join('' if value == unset_value else str(value) for value in values)
+    return base64.b64encode(text.encode('ascii')).decode('ascii')
+
+
+def encode_binary(values, firmware=None, bank=None):
+    values = array('H', values)
+    if firmware is None:
+        firmware = values[firmware_adress] if len(values) > firmware_adress else 0
+    header = header_struct.pack(
+        preset_magic, preset_format_version, firmware, no_bank if bank is None else bank, len(values)
+    )
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return header + values.tobytes()
+
+
+# Returns (values, firmware, bank), bank is None for presets not tied to a bank
+def decode_binary(data):
+    data = memoryview(data)
+    if len(data) < header_struct.size:
+        raise ValueError('preset is shorter than its header')
+    magic, version, firmware, bank, count = header_struct.unpack_from(data)
+    if magic != preset_magic:
+        raise ValueError('not a binary preset')
+    if version != preset_format_version:
+        raise ValueError(f'unsupported preset format version {version}')
+    end = header_struct.size + 2 * count
+    if len(data) < end:
+        raise ValueError(f'preset holds {(len(data) - header_struct.size) // 2} values, header says {count}')
+    values = array('H')
+    values.frombytes(data[header_struct.size:end])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tolist(), firmware, None if bank == no_bank else bank
+
+
+# Text form of a binary preset, to store in JSON or share like the legacy codes
+def encode_binary_text(values, firmware=None, bank=None):
+    return base64.b64encode(encode_binary(values, firmware, bank)).decode('ascii')
+
+
+def decode_binary_text(code):
+    return decode_binary(base64.b64decode(code))
+
+
+def legacy_to_binary(code):
+    return encode_binary_text(decode_legacy(code))
+
+
+def binary_to_legacy(code):
+    values, firmware, bank = decode_binary_text(code)
+    return encode_legacy(values)
+
+
+# Decode a preset code in either format into its values
+def decode_preset(code):
+    try:
+        return decode_binary_text(code)[0]
+    except (ValueError, binascii.Error):
+        return decode_legacy(code)
+
+
+# Convert every preset of a shared_presets.json-shaped library, legacy presets carry no 'format' key
+def convert_library(library, target=binary_format):
+    presets = []
+    for preset in library.get('shared_presets', []):
+        values = decode_preset(preset['value'])
+        converted = {key: value for key, value in preset.items() if key != 'format'}
+        if target == binary_format:
+            converted['value'] = encode_binary_text(values)
+            converted['format'] = binary_format
+        else:
+            converted['value'] = encode_legacy(values)
+        presets.append(converted)
+    return {**library, 'shared_presets': presets}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.preset', description='Convert a preset library between the legacy and binary formats.')
+    parser.add_argument('target', choices=['binary', 'legacy'], help='format to convert to')
+    parser.add_argument('source', help='shared_presets.json-shaped library')
+    parser.add_argument('output', help='converted library')
+    args = parser.parse_args(argv)
+
+    with open(args.source, 'r') as f:
+        library = json.load(f)
+    converted = convert_library(library, binary_format if args.target == 'binary' else legacy_format)
+    with open(args.output, 'w') as f:
+        json.dump(converted, f, indent=4)
+    print(f"Converted {len(converted['shared_presets'])} presets to {args.target} in {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+# Build instrumentation. The generators mark their stages with `with stage(name):` and stream
+# fragments through iterate(name, fragments); both do nothing unless a Profiler is active.
+# Stages nest: a stage entered inside another is reported as 'outer/inner', times are inclusive.
+# Compare two reports: python -m minicontrol.profiling before.json after.json
+
+report_version = 1
+# Items (parameters, groups) listed per stage, slowest first
+slowest_items = 10
+# Functions listed from the cProfile capture, by cumulative time
+profiled_functions = 25
+
+_active = None
+_done = object()
+
+
+def stage(name, item=None):
+    if _active is None or not _active.records():
+        return nullcontext()
+    return _active.stage(name, item)
+
+
+# Time only the work done inside the iterable, not what the consumer does with each fragment
+def iterate(name, iterable, item=None):
+    if _active is None or not _active.records():
+        return iterable
+    return _active.iterate(name, iterable, item)
+
+
+class Profiler:
+    # Top-level stages count the change in allocated memory blocks, a walk of the heap too slow for
+    # stages run per parameter. trace_memory adds, for every stage and with tracemalloc,
+    # the bytes a stage left allocated (summed over its calls) and its highest peak above the memory
+    # in use when it started. profile_calls captures a cProfile of the whole build. Both only see
+    # the thread that started the profiler, so the outputs are built one after the other while they
+    # are on (see exclusive). With max_depth, deeper stages are not recorded and cost nothing.
+    def __init__(self, trace_memory=False, profile_calls=False, max_depth=None):
+        self.trace_memory = trace_memory
+        self.profile_calls = profile_calls
+        self.max_depth = max_depth
+        self.stages = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.calls = None
+        self.started = self.elapsed = None
+
+    @property
+    def exclusive(self):
+        return self.trace_memory or self.profile_calls
+
+    def start(self):
+        global _active
+        _active = self
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile_calls:
+            self.calls = cProfile.Profile()
+            self.calls.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        global _active
+        self.elapsed = time.perf_counter() - self.started
+        if self.calls is not None:
+            self.calls.disable()
+        if self.trace_memory:
+            tracemalloc.stop()
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def records(self):
+        return self.max_depth is None or len(self.local.__dict__.get('stack', ())) < self.max_depth
+
+    def stats(self, path):
+        with self.lock:
+            return self.stages.setdefault(path, {
+                'calls': 0, 'seconds': 0.0, 'blocks': 0, 'allocated_bytes': 0, 'peak_bytes': 0, 'items': {}
+            })
+
+    @contextmanager
+    def stage(self, name, item=None, count=True):
+        stack = self.local.__dict__.setdefault('stack', [])
+        path = '/'.join([frame[0] for frame in stack] + [name])
+        # [name, highest traced memory seen by nested stages, whose peak resets hide it from us]
+        frame = [name, 0]
+        stack.append(frame)
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if len(stack) > 1:
+                stack[-2][1] = max(stack[-2][1], peak)
+            tracemalloc.reset_peak()
+        top_level = len(stack) == 1
+        blocks = sys.getallocatedblocks() if top_level else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks if top_level else 0
+            stack.pop()
+            stats = self.stats(path)
+            with self.lock:
+                stats['calls'] += count
+                stats['seconds'] += elapsed
+                stats['blocks'] += blocks
+                if item is not None:
+                    stats['items'][item] = stats['items'].get(item, 0.0) + elapsed
+            if self.trace_memory:
+                now, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame[1])
+                stats['allocated_bytes'] += now - current
+                stats['peak_bytes'] = max(stats['peak_bytes'], peak - current)
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak)
+
+    def iterate(self, name, iterable, item=None):
+        iterator = iter(iterable)
+        first = True
+        while True:
+            with self.stage(name, item, count=first):
+                fragment = next(iterator, _done)
+            first = False
+            if fragment is _done:
+                return
+            yield fragment
+
+    def report(self, **context):
+        stages = []
+        for path, stats in self.stages.items():
+            entry = {'stage': path, **{key: value for key, value in stats.items() if key != 'items'}}
+            entry['seconds'] = round(entry['seconds'], 6)
+            if '/' in path:
+                del entry['blocks']
+            if not self.trace_memory:
+                del entry['allocated_bytes'], entry['peak_bytes']
+            if stats['items']:
+                slowest = sorted(stats['items'].items(), key=lambda item: -item[1])[:slowest_items]
+                entry['slowest'] = [{'item': item, 'seconds': round(seconds, 6)} for item, seconds in slowest]
+            stages.append(entry)
+        report = {
+            'version': report_version,
+            'python': platform.python_version(),
+            **context,
+            'total_seconds': round(self.elapsed, 6) if self.elapsed is not None else None,
+            'stages': stages,
+        }
+        if self.calls is not None:
+            report['functions'] = function_stats(self.calls)
+        return report
+
+    # Top-level stages as 'name 12.3 ms', for the one-line summary of a build
+    def summary(self):
+        return [
+            f"{path} {stats['seconds'] * 1000:.1f} ms"
+            for path, stats in self.stages.items() if '/' not in path
+        ]
+
+
+def function_stats(calls):
+    stats = pstats.Stats(calls)
+    rows = []
+    for (filename, line, function), (primitive, total, own, cumulative, callers) in stats.stats.items():
+        rows.append({
+            'function': f'{filename}:{line}({function})',
+            'calls': total,
+            'own_seconds': round(own, 6),
+            'cumulative_seconds': round(cumulative, 6),
+        })
+    rows.sort(key=lambda row: -row['cumulative_seconds'])
+    return rows[:profiled_functions]
+
+
+def write_report(path, report):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+
+
+# Stage by stage change between two reports, slowest regressions first
+def compare_reports(before, after):
+    old = {entry['stage']: entry for entry in before['stages']}
+    rows = []
+    for entry in after['stages']:
+        previous = old.get(entry['stage'])
+        seconds = previous['seconds'] if previous else 0.0
+        rows.append((entry['stage'], seconds, entry['seconds']))
+    rows.sort(key=lambda row: row[1] - row[2])
+    lines = [f"{'stage':<48} {'before ms':>10} {'after ms':>10} {'change':>8}"]
+    for path, seconds, new_seconds in rows:
+        change = f'{(new_seconds / seconds - 1) * 100:+.0f}%' if seconds else 'new'
+        lines.append(f'{path:<48} {seconds * 1000:>10.2f} {new_seconds * 1000:>10.2f} {change:>8}')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.profiling', description='Compare two build profile reports.')
+    parser.add_argument('before', help='report written by python -m minicontrol --profile')
+    parser.add_argument('after')
+    args = parser.parse_args(argv)
+    with open(args.before, 'r') as f:
+        before = json.load(f)
+    with open(args.after, 'r') as f:
+        after = json.load(f)
+    for line in compare_reports(before, after):
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+import abc
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from .codec import decode_dump, dump_size
+from .device import VirtualMinichord, bank_count, command_dump, command_save, frame
+from .model import ParameterModel
+from .preset import decode_preset, unset_value
+from .transfer import TransferOrder, encode_message, finish_message, plan_transfer
+
+
+# A MIDI link to one device. Messages are complete SysEx frames (0xF0 ... 0xF7).
+class Transport(abc.ABC):
+    name = 'device'
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abc.abstractmethod
+    async def send(self, message):
+        pass
+
+    # Next frame from the device, raises asyncio.TimeoutError after timeout seconds
+    @abc.abstractmethod
+    async def receive(self, timeout):
+        pass
+
+    # Drop frames left over from an earlier attempt
+    def flush(self):
+        pass
+
+
+# In-process transport to a VirtualMinichord, with optional latency and message loss for testing
+class LoopbackTransport(Transport):
+    def __init__(self, device=None, name='loopback', latency=0.0, loss_rate=0.0, seed=None):
+        self.device = device or VirtualMinichord()
+        self.name = name
+        self.latency = latency
+        self.loss_rate = loss_rate
+        self.random = random.Random(seed)
+        self.replies = None
+
+    async def open(self):
+        self.replies = asyncio.Queue()
+
+    async def send(self, message):
+        # A lost message never reaches the device, like a dropped USB MIDI packet
+        if self.loss_rate and self.random.random() < self.loss_rate:
+            return
+        replies = self.device.handle(message)
+        if replies and self.latency:
+            await asyncio.sleep(self.latency)
+        for reply in replies:
+            self.replies.put_nowait(reply)
+
+    async def receive(self, timeout):
+        return await asyncio.wait_for(self.replies.get(), timeout)
+
+    def flush(self):
+        while not self.replies.empty():
+            self.replies.get_nowait()
+
+
+# Hardware transport through mido (pip install mido python-rtmidi), opened by port name
+class MidoTransport(Transport):
+    def __init__(self, port_name):
+        self.name = port_name
+        self.input = self.output = None
+        self.replies = None
+
+    async def open(self):
+        import mido
+        loop = asyncio.get_running_loop()
+        self.replies = asyncio.Queue()
+
+        # Called from the MIDI backend thread
+        def received(message):
+            if message.type == 'sysex':
+                loop.call_soon_threadsafe(self.replies.put_nowait, frame(message.data))
+
+        self.output = mido.open_output(self.name)
+        self.input = mido.open_input(self.name, callback=received)
+
+    async def close(self):
+        for port in (self.input, self.output):
+            if port is not None:
+                port.close()
+
+    async def send(self, message):
+        import mido
+        self.output.send(mido.Message('sysex', data=bytes(message[1:-1])))
+
+    async def receive(self, timeout):
+        return await asyncio.wait_for(self.replies.get(), timeout)
+
+    def flush(self):
+        while not self.replies.empty():
+            self.replies.get_nowait()
+
+
+class DeviceMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.banks_saved = 0
+        self.banks_failed = 0
+        self.retries = 0
+        self.messages = 0
+        self.bytes = 0
+        self.bank_latencies = []
+        self.elapsed = 0.0
+        self.errors = []
+
+    def summary(self):
+        latencies = sorted(self.bank_latencies)
+        return {
+            'device': self.name,
+            'banks_saved': self.banks_saved,
+            'banks_failed': self.banks_failed,
+            'retries': self.retries,
+            'messages': self.messages,
+            'bytes': self.bytes,
+            'elapsed_s': round(self.elapsed, 4),
+            'banks_per_s': round(self.banks_saved / self.elapsed, 2) if self.elapsed else None,
+            'bank_latency_mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+            'bank_latency_p95_ms': round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2) if latencies else None,
+            'bank_latency_max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+            'errors': self.errors,
+        }
+
+
+class ProvisioningError(Exception):
+    pass
+
+
+class Provisioner:
+    def __init__(self, model, banks, concurrency=8, retries=3, timeout=2.0):
+        if len(banks) != bank_count:
+            raise ValueError(f'expected {bank_count} bank presets, got {len(banks)}')
+        self.order = TransferOrder(model)
+        self.model = model
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.ranges = {}
+        for _, param in model.iter_parameters():
+            multiplier = ParameterModel.float_multiplier(param)
+            if 'min_value' in param and 'max_value' in param:
+                self.ranges[param['sysex_adress']] = (round(param['min_value'] * multiplier), round(param['max_value'] * multiplier))
+        self.banks = [self.clamp(values) for values in banks]
+
+    # The page cannot send values outside a control's range, neither do we
+    def clamp(self, values):
+        values = list(values)
+        for sysex_address, (low, high) in self.ranges.items():
+            if sysex_address < len(values) and values[sysex_address] != unset_value:
+                values[sysex_address] = min(max(values[sysex_address], low), high)
+        return values
+
+    async def send(self, transport, metrics, message):
+        await transport.send(message)
+        metrics.messages += 1
+        metrics.bytes += len(message)
+
+    async def command(self, transport, metrics, command, bank):
+        await self.send(transport, metrics, frame([0, 0, command, bank]))
+        while True:
+            reply = await transport.receive(self.timeout)
+            if len(reply) == dump_size + 1:
+                dump = decode_dump(reply)
+                if dump.bank == bank:
+                    return dump
+
+    # Addresses whose saved value differs from the preset, what processCurrentData warns about after a save
+    def mismatches(self, dump, target):
+        return [
+            sysex_address for sysex_address in self.order.addresses
+            if sysex_address < len(target) and target[sysex_address] != unset_value
+            and int(dump.values[sysex_address]) != target[sysex_address]
+        ]
+
+    async def provision_bank(self, transport, metrics, bank, target):
+        current = await self.command(transport, metrics, command_dump, bank)
+        for attempt in range(self.retries + 1):
+            plan = plan_transfer(current.values.tolist(), target, self.model, self.order)
+            # The plan ends with a dump request of bank 0 to refresh the page, the save replaces it
+            for sysex_address, value in plan.messages:
+                if (sysex_address, value) != finish_message:
+                    await self.send(transport, metrics, encode_message(sysex_address, value))
+            current = await self.command(transport, metrics, command_save, bank)
+            mismatched = self.mismatches(current, target)
+            if not mismatched:
+                return
+            if attempt < self.retries:
+                metrics.retries += 1
+        raise ProvisioningError(f'bank {bank}: {len(mismatched)} addresses differ after save, e.g. {mismatched[:5]}')
+
+    async def provision_device(self, transport, semaphore):
+        metrics = DeviceMetrics(transport.name)
+        async with semaphore:
+            start = time.perf_counter()
+            await transport.open()
+            try:
+                for bank, target in enumerate(self.banks):
+                    bank_start = time.perf_counter()
+                    for attempt in range(self.retries + 1):
+                        try:
+                            await self.provision_bank(transport, metrics, bank, target)
+                            metrics.banks_saved += 1
+                            # Failed banks stay out of the latencies, they only describe saves
+                            metrics.bank_latencies.append(time.perf_counter() - bank_start)
+                            break
+                        except asyncio.TimeoutError:
+                            # Lost command or dump, start the bank over
+                            transport.flush()
+                            if attempt == self.retries:
+                                metrics.banks_failed += 1
+                                metrics.errors.append(f'bank {bank}: no dump after {self.retries + 1} attempts')
+                            else:
+                                metrics.retries += 1
+                        except ProvisioningError as error:
+                            metrics.banks_failed += 1
+                            metrics.errors.append(str(error))
+                            break
+            finally:
+                await transport.close()
+                metrics.elapsed = time.perf_counter() - start
+        return metrics
+
+    # Provision every device, at most concurrency at a time, returns their metrics in order
+    async def run(self, transports):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self.provision_device(transport, semaphore) for transport in transports))
+
+
+# The 12 bank presets from a shared_presets.json-shaped library, cycling if it holds fewer
+def library_banks(library):
+    presets = [decode_preset(preset['value']) for preset in library.get('shared_presets', [])]
+    if not presets:
+        raise ValueError('library holds no presets')
+    return [presets[bank % len(presets)] for bank in range(bank_count)]
+
+
+# Loads a preset into each of the 12 banks of many minichords at once, the way the page does for one:
+# send the changed parameters, save the bank and check the dump the device answers with.
+# Run from the repository root: python -m minicontrol.provision --loopback 24
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.provision', description='Load presets into all banks of many minichords at once.')
+    parser.add_argument('--library', default='shared_presets.json', help='presets for banks a-l, cycled if fewer than 12')
+    parser.add_argument('--port', action='append', default=[], help='MIDI port of a device (mido), repeat for each device')
+    parser.add_argument('--loopback', type=int, default=0, help='number of virtual devices to provision instead')
+    parser.add_argument('--latency', type=float, default=0.002, help='loopback reply latency in seconds')
+    parser.add_argument('--loss-rate', type=float, default=0.0, help='fraction of loopback messages dropped')
+    parser.add_argument('--concurrency', type=int, default=8, help='devices provisioned at the same time')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=2.0, help='seconds to wait for a dump')
+    parser.add_argument('--parameters', default='parameters.json')
+    parser.add_argument('--json', action='store_true', help='print the metrics as JSON')
+    args = parser.parse_args(argv)
+
+    model = ParameterModel(args.parameters)
+    with open(args.library, 'r') as f:
+        banks = library_banks(json.load(f))
+    transports = [MidoTransport(port) for port in args.port]
+    transports += [
+        LoopbackTransport(VirtualMinichord(model), f'loopback-{i}', args.latency, args.loss_rate, seed=i)
+        for i in range(args.loopback)
+    ]
+    if not transports:
+        parser.error('give at least one --port or --loopback N')
+
+    provisioner = Provisioner(model, banks, args.concurrency, args.retries, args.timeout)
+    start = time.perf_counter()
+    results = asyncio.run(provisioner.run(transports))
+    elapsed = time.perf_counter() - start
+
+    summaries = [metrics.summary() for metrics in results]
+    if args.json:
+        print(json.dumps({'elapsed_s': round(elapsed, 4), 'devices': summaries}, indent=2))
+    else:
+        print(f"{'device':<16} {'saved':>5} {'failed':>6} {'retries':>7} {'messages':>8} {'banks/s':>8} {'mean ms':>8} {'p95 ms':>8}")
+        for summary in summaries:
+            print(
+                f"{summary['device']:<16} {summary['banks_saved']:>5} {summary['banks_failed']:>6} {summary['retries']:>7} "
+                f"{summary['messages']:>8} {summary['banks_per_s'] or 0:>8.1f} {summary['bank_latency_mean_ms'] or 0:>8.1f} "
+                f"{summary['bank_latency_p95_ms'] or 0:>8.1f}"
+            )
+            for error in summary['errors']:
+                print(f'  {error}')
+        saved = sum(summary['banks_saved'] for summary in summaries)
+        print(f'{saved} banks on {len(summaries)} devices in {elapsed:.2f} s')
+    return 1 if any(summary['banks_failed'] for summary in summaries) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
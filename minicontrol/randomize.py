@@ -0,0 +1,162 @@
+import argparse
+import base64
+import json
+import sys
+
+import numpy as np
+
+from .model import ParameterModel
+from .preset import (
+    binary_format, decode_preset, header_struct, no_bank, parameter_size, preset_format_version, preset_magic, unset_value
+)
+
+
+# Offline counterpart of generateRandomPreset in index.js, sampling many presets at once.
+# Run from the repository root: python -m minicontrol.randomize 100000 random_presets.json --seed 1
+
+# Groups generateRandomPreset draws from, the potentiometers and hidden values are left unset
+random_groups = ('global_parameter', 'harp_parameter', 'chord_parameter', 'rhythm_parameter')
+# Addresses generateRandomPreset keeps at their default
+fixed_addresses = (32, 33, 34, 41, 97, 197)
+first_random_address = 19
+# Standard deviation of the samples as a fraction of the parameter range
+weirdness_factor = 0.10
+
+
+# Per-address arrays of the random parameters, indexed like the preset values
+class ParameterRanges:
+    def __init__(self, model):
+        parameters = model.parameters
+        selected = {}
+        for group_name in random_groups:
+            for param in parameters.get(group_name, []):
+                selected[param['sysex_adress']] = param
+
+        self.addresses = np.array(sorted(selected), dtype=np.intp)
+        params = [selected[address] for address in self.addresses]
+        # Switches have no range in parameters.json, the page treats them as 0/1
+        self.low = np.array([param.get('min_value', 0) for param in params], dtype=np.float64)
+        self.high = np.array([param.get('max_value', 1) for param in params], dtype=np.float64)
+        self.default = np.array([param.get('default_value', 0) for param in params], dtype=np.float64)
+        self.is_float = np.array([param.get('data_type') == 'float' for param in params], dtype=bool)
+        self.multiplier = np.array([ParameterModel.float_multiplier(param) for param in params], dtype=np.float64)
+        self.exponential = np.array([param.get('curve') == 'exponential' for param in params], dtype=bool)
+        self.fixed = (self.addresses < first_random_address) | np.isin(self.addresses, fixed_addresses)
+
+    # Centres taken from library presets (device values) instead of the defaults, one row per preset
+    def centres(self, library_values):
+        values = np.asarray(library_values, dtype=np.float64)[:, self.addresses]
+        centres = np.where(self.is_float, values / self.multiplier, values)
+        return np.where(values == unset_value, self.default, centres)
+
+
+# Math.round of index.js
+def js_round(values):
+    return np.floor(values + 0.5)
+
+
+# Rows sampled per block, so the float temporaries stay small whatever the batch size
+block_size = 16384
+
+
+# Sample n presets as (n, 256) device values, unset_value where generateRandomPreset sends nothing.
+# With library_values each preset is centred on a library preset picked at random, as the page does.
+# curve_aware samples exponential parameters on a log scale, so low settings are not crushed to the minimum.
+def sample_presets(ranges, n, seed=None, library_values=None, curve_aware=False):
+    rng = np.random.default_rng(seed)
+    centres = None
+    if library_values is not None and len(library_values):
+        centres = ranges.centres(library_values)[:, ~ranges.fixed]
+
+    random = ~ranges.fixed
+    low = ranges.low[random]
+    high = ranges.high[random]
+    span = high - low
+    sigma = span * weirdness_factor
+    exponential = ranges.exponential[random] if curve_aware else np.zeros(random.sum(), dtype=bool)
+    log_sigma = np.log1p(span[exponential]) * weirdness_factor
+    # The page rounds floats to two decimals before scaling them to the device value
+    decimals = np.where(ranges.is_float[random], 100.0, 1.0)
+    device_multiplier = np.where(ranges.is_float[random], ranges.multiplier[random], 1.0)
+
+    values = np.full((n, parameter_size), unset_value, dtype=np.uint16)
+    fixed_values = js_round(np.where(ranges.is_float, ranges.default * ranges.multiplier, ranges.default))[ranges.fixed]
+    values[:, ranges.addresses[ranges.fixed]] = fixed_values.astype(np.uint16)
+    random_addresses = ranges.addresses[random]
+
+    for start in range(0, n, block_size):
+        rows = min(block_size, n - start)
+        if centres is None:
+            centre = ranges.default[random]
+        else:
+            centre = centres[rng.integers(len(centres), size=rows)]
+        noise = rng.standard_normal((rows, len(random_addresses)))
+        sampled = noise * sigma + centre
+        if exponential.any():
+            offset = np.log1p(np.clip(np.broadcast_to(centre, sampled.shape)[:, exponential] - low[exponential], 0, None))
+            sampled[:, exponential] = low[exponential] + np.expm1(offset + noise[:, exponential] * log_sigma)
+        np.clip(sampled, low, high, out=sampled)
+        sampled = js_round(sampled * decimals) / decimals
+        values[start:start + rows, random_addresses] = js_round(sampled * device_multiplier).astype(np.uint16)
+    return values
+
+
+# Binary presets of every row at once, one record of header + little-endian u16 values per row
+def encode_binary_batch(values, firmware=0, bank=None):
+    values = np.ascontiguousarray(values, dtype='<u2')
+    header = header_struct.pack(
+        preset_magic, preset_format_version, firmware, no_bank if bank is None else bank, values.shape[1]
+    )
+    records = np.empty((len(values), header_struct.size + 2 * values.shape[1]), dtype=np.uint8)
+    records[:, :header_struct.size] = np.frombuffer(header, dtype=np.uint8)
+    records[:, header_struct.size:] = values.view(np.uint8)
+    return records
+
+
+def random_library(records, author='minicontrol.randomize'):
+    width = len(str(len(records)))
+    return {'shared_presets': [
+        {
+            'name': f'random {i + 1:0{width}d}',
+            'author': author,
+            'value': base64.b64encode(record).decode('ascii'),
+            'format': binary_format,
+        }
+        for i, record in enumerate(records)
+    ]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.randomize', description='Generate random presets the way the randomise button does.')
+    parser.add_argument('count', type=int, help='number of presets')
+    parser.add_argument('output', help='shared_presets.json-shaped library, or raw binary records with --raw')
+    parser.add_argument('--seed', type=int, help='random seed, for reproducible batches')
+    parser.add_argument('--library', help='centre each preset on a random preset of this library instead of the defaults')
+    parser.add_argument('--curve-aware', action='store_true', help='sample exponential parameters on a log scale')
+    parser.add_argument('--firmware', type=float, default=0.0, help='firmware version stored in the preset header')
+    parser.add_argument('--raw', action='store_true', help='write the concatenated binary presets instead of JSON')
+    parser.add_argument('--parameters', default='parameters.json')
+    args = parser.parse_args(argv)
+
+    ranges = ParameterRanges(ParameterModel(args.parameters))
+    library_values = None
+    if args.library:
+        with open(args.library, 'r') as f:
+            library = json.load(f)
+        library_values = [decode_preset(preset['value'])[:parameter_size] for preset in library.get('shared_presets', [])]
+        library_values = [values + [unset_value] * (parameter_size - len(values)) for values in library_values]
+
+    values = sample_presets(ranges, args.count, args.seed, library_values, args.curve_aware)
+    records = encode_binary_batch(values, firmware=round(args.firmware * 100))
+    if args.raw:
+        with open(args.output, 'wb') as f:
+            f.write(records.tobytes())
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(random_library(records), f, indent=4)
+    print(f'Wrote {args.count} random presets to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
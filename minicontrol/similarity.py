@@ -0,0 +1,243 @@
+import argparse
+import json
+import math
+import sys
+
+import numpy as np
+
+from .codec import base_adress_rythm, parameter_size, rhythm_steps, rhythm_voices
+from .model import ParameterModel
+from .preset import decode_preset, unset_value
+
+
+# Groups left out of the features, hidden holds the alternate potentiometer values and the
+# firmware revision, which the page does not show
+ignored_groups = ('hidden',)
+
+
+# Per-address scaling of device values to [0, 1], from min_value/max_value/data_type/curve
+class FeatureSpace:
+    def __init__(self, model):
+        scalar = {}
+        rhythm = []
+        defaults = np.zeros(parameter_size, dtype=np.float64)
+        for group_name, param in model.iter_parameters():
+            sysex_address = param['sysex_adress']
+            if not 0 <= sysex_address < parameter_size:
+                continue
+            multiplier = ParameterModel.float_multiplier(param)
+            defaults[sysex_address] = ParameterModel.scaled_default(param)
+            if group_name in ignored_groups:
+                continue
+            if base_adress_rythm <= sysex_address < base_adress_rythm + rhythm_steps:
+                rhythm.append(sysex_address)
+                continue
+            low = param.get('min_value', 0) * multiplier
+            high = param.get('max_value', 1) * multiplier
+            scalar[sysex_address] = (low, high, param.get('curve') == 'exponential')
+
+        self.addresses = np.array(sorted(scalar), dtype=np.intp)
+        self.low = np.array([scalar[a][0] for a in self.addresses], dtype=np.float64)
+        self.span = np.array([max(scalar[a][1] - scalar[a][0], 1e-9) for a in self.addresses], dtype=np.float64)
+        self.exponential = np.array([scalar[a][2] for a in self.addresses], dtype=bool)
+        self.rhythm_addresses = np.array(sorted(rhythm), dtype=np.intp)
+        self.defaults = defaults
+        self.dimension = len(self.addresses) + rhythm_voices * len(self.rhythm_addresses)
+
+    # (n, 256) device values -> (n, dimension) float32 features
+    def transform(self, values):
+        values = np.array(values, dtype=np.float64, ndmin=2)
+        unset = values == unset_value
+        if unset.any():
+            values = np.where(unset, self.defaults, values)
+
+        scaled = np.clip((values[:, self.addresses] - self.low) / self.span, 0.0, 1.0)
+        # Exponential parameters are compared on a log scale, closer to how they are heard
+        log_span = np.log1p(self.span[self.exponential])
+        scaled[:, self.exponential] = np.log1p(scaled[:, self.exponential] * self.span[self.exponential]) / log_span
+
+        steps = values[:, self.rhythm_addresses].astype(np.int64)
+        bits = (steps[:, :, None] >> np.arange(rhythm_voices)) & 1
+        return np.hstack([scaled, bits.reshape(len(values), -1)]).astype(np.float32)
+
+
+def squared_distances(queries, points):
+    distances = (
+        (queries * queries).sum(axis=1)[:, None]
+        + (points * points).sum(axis=1)[None, :]
+        - 2.0 * queries @ points.T
+    )
+    return np.maximum(distances, 0.0)
+
+
+def kmeans(features, n_lists, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    centroids = features[rng.choice(len(features), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = squared_distances(features, centroids).argmin(axis=1)
+        counts = np.bincount(assignments, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, features)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids, squared_distances(features, centroids).argmin(axis=1)
+
+
+# Inverted-file nearest-neighbour index: presets are bucketed around k-means centroids and a
+# query only scans the buckets closest to it. Distances are RMS differences of the features.
+class PresetIndex:
+    # Below this many presets a flat scan is as fast as the buckets
+    flat_threshold = 2048
+
+    def __init__(self, features, names, authors, centroids=None, assignments=None):
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.names = list(names)
+        self.authors = list(authors)
+        self.centroids = centroids
+        self.assignments = assignments
+        self.lists = None
+        if centroids is not None:
+            order = np.argsort(assignments, kind='stable')
+            bounds = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+            self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(centroids))]
+
+    @classmethod
+    def build(cls, features, names, authors, n_lists=None):
+        features = np.asarray(features, dtype=np.float32)
+        if len(features) < cls.flat_threshold:
+            return cls(features, names, authors)
+        n_lists = n_lists or int(math.sqrt(len(features)))
+        centroids, assignments = kmeans(features, n_lists)
+        return cls(features, names, authors, centroids, assignments)
+
+    @classmethod
+    def from_library(cls, library, model, n_lists=None):
+        presets = library.get('shared_presets', [])
+        space = FeatureSpace(model)
+        # Presets saved by older firmware are shorter, the missing addresses count as unset
+        values = np.full((len(presets), parameter_size), unset_value, dtype=np.float64)
+        for row, preset in zip(values, presets):
+            decoded = decode_preset(preset['value'])[:parameter_size]
+            row[:len(decoded)] = decoded
+        features = space.transform(values) if len(values) else np.zeros((0, space.dimension), dtype=np.float32)
+        return cls.build(
+            features,
+            [preset.get('name', '') for preset in presets],
+            [preset.get('author', '') for preset in presets],
+            n_lists
+        )
+
+    def save(self, path):
+        arrays = {
+            'features': self.features,
+            'names': np.array(self.names, dtype=str),
+            'authors': np.array(self.authors, dtype=str),
+        }
+        if self.centroids is not None:
+            arrays['centroids'] = self.centroids
+            arrays['assignments'] = self.assignments
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data['features'],
+                data['names'].tolist(),
+                data['authors'].tolist(),
+                data['centroids'] if 'centroids' in data else None,
+                data['assignments'] if 'assignments' in data else None
+            )
+
+    def candidates(self, feature, n_probe):
+        if self.lists is None:
+            return np.arange(len(self.features))
+        closest = squared_distances(feature[None, :], self.centroids)[0].argsort()[:n_probe]
+        return np.concatenate([self.lists[i] for i in closest])
+
+    # Top-k presets closest to a feature vector, as (position, rms distance)
+    def query(self, feature, k=5, n_probe=8, exclude=None):
+        feature = np.asarray(feature, dtype=np.float32)
+        candidates = self.candidates(feature, n_probe)
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        distances = squared_distances(feature[None, :], self.features[candidates])[0]
+        top = np.argsort(distances)[:k]
+        scale = max(self.features.shape[1], 1)
+        return [(int(candidates[i]), math.sqrt(distances[i] / scale)) for i in top]
+
+    def similar(self, position, k=5, n_probe=8):
+        return self.query(self.features[position], k, n_probe, exclude=position)
+
+    # Pairs of presets closer than threshold (rms), exact duplicates have distance 0
+    def duplicates(self, threshold=0.0, n_probe=2):
+        pairs = []
+        # Exact duplicates are found by hashing the feature rows
+        first_seen = {}
+        for position, row in enumerate(self.features):
+            key = row.tobytes()
+            if key in first_seen:
+                pairs.append((first_seen[key], position, 0.0))
+            else:
+                first_seen[key] = position
+        if threshold <= 0:
+            return pairs
+
+        exact = {(a, b) for a, b, distance in pairs}
+        limit = threshold * threshold * max(self.features.shape[1], 1)
+        for position in range(len(self.features)):
+            candidates = self.candidates(self.features[position], n_probe)
+            candidates = candidates[candidates > position]
+            if not len(candidates):
+                continue
+            distances = squared_distances(self.features[position][None, :], self.features[candidates])[0]
+            for i in np.flatnonzero(distances <= limit):
+                other = int(candidates[i])
+                if (position, other) not in exact:
+                    pairs.append((position, other, math.sqrt(distances[i] / self.features.shape[1])))
+        return pairs
+
+    def find(self, name):
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise KeyError(f'no preset named {name!r}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.similarity', description='Similar-preset search over a preset library.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='build a persistent index from a preset library')
+    build.add_argument('library', nargs='?', default='shared_presets.json')
+    build.add_argument('-o', '--output', default='shared_presets.index.npz')
+    build.add_argument('--parameters', default='parameters.json')
+    build.add_argument('--lists', type=int, help='number of k-means buckets (default: sqrt of the preset count)')
+    similar = commands.add_parser('similar', help='presets closest to a named preset')
+    similar.add_argument('name')
+    similar.add_argument('-k', type=int, default=5)
+    similar.add_argument('--index', default='shared_presets.index.npz')
+    duplicates = commands.add_parser('duplicates', help='exact and near duplicate presets')
+    duplicates.add_argument('--threshold', type=float, default=0.0, help='rms feature distance counted as a duplicate')
+    duplicates.add_argument('--index', default='shared_presets.index.npz')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        with open(args.library, 'r') as f:
+            library = json.load(f)
+        index = PresetIndex.from_library(library, ParameterModel(args.parameters), args.lists)
+        index.save(args.output)
+        print(f'Indexed {len(index.names)} presets into {args.output}')
+        return 0
+
+    index = PresetIndex.load(args.index)
+    if args.command == 'similar':
+        for position, distance in index.similar(index.find(args.name), args.k):
+            print(f'{distance:.4f}  {index.names[position]} by {index.authors[position]}')
+    else:
+        for a, b, distance in index.duplicates(args.threshold):
+            print(f'{distance:.4f}  {index.names[a]} by {index.authors[a]} / {index.names[b]} by {index.authors[b]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import json
+import os
+
+from .cache import content_hash
+from .header import build_sysex_handler, header_cache_key
+from .page import html_cache_key, iter_html, slices_manifest_path
+from .param_index import build_parameter_index, parameter_index_cache_key
+
+
+# Per-firmware outputs, one directory per introduction_version, and slices.json listing their pages
+# relative to the manifest
+slices_dir = 'firmware'
+manifest_file = 'slices.json'
+
+
+def slice_directory(directory, firmware_version):
+    return os.path.join(directory, str(firmware_version))
+
+
+# Build the page, address index and header of every firmware version, the page of a slice only
+# holds the controls that version supports so index.js no longer filters the DOM on connect
+def build_slices(model, cache, directory=slices_dir, dispatch='switch', curves=False):
+    report = []
+    manifest = []
+    manifest_path = slices_manifest_path(directory)
+    for firmware_version in model.introduction_versions():
+        sliced = model.sliced(firmware_version)
+        slice_dir = slice_directory(directory, firmware_version)
+        os.makedirs(slice_dir, exist_ok=True)
+        # Shared scripts and styles are resolved against the base href, the slice's own index is not
+        base_href = os.path.relpath('.', slice_dir).replace(os.sep, '/') + '/'
+        parameter_index = '/'.join([directory.replace(os.sep, '/'), str(firmware_version), 'parameters.index.js'])
+
+        outputs = [
+            (
+                'index.html',
+                content_hash(html_cache_key(sliced), base_href, parameter_index, manifest_path),
+                lambda: iter_html(sliced, base_href, parameter_index, manifest_path)
+            ),
+            ('parameters.index.js', parameter_index_cache_key(sliced), lambda: build_parameter_index(sliced)),
+            (
+                'sysex_handler.h',
+                header_cache_key(sliced, dispatch, curves),
+                lambda: build_sysex_handler(sliced, dispatch, curves)
+            ),
+        ]
+        sizes = {}
+        for name, key, render in outputs:
+            output = os.path.join(slice_dir, name)
+            cache.build(output, key, render)
+            sizes[name] = os.path.getsize(output)
+
+        parameter_count = sum(1 for _ in sliced.iter_parameters())
+        manifest.append({'firmware': firmware_version, 'page': f'{firmware_version}/index.html'})
+        report.append((firmware_version, parameter_count, sizes))
+
+    with open(os.path.join(directory, manifest_file), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return report
+
+
+def format_report(report):
+    lines = [f"{'firmware':>8}  {'parameters':>10}  {'index.html':>10}  {'index.js':>10}  {'header':>10}"]
+    for firmware_version, parameter_count, sizes in report:
+        lines.append(
+            f"{firmware_version:>8}  {parameter_count:>10}  {sizes['index.html']:>10}  "
+            f"{sizes['parameters.index.js']:>10}  {sizes['sysex_handler.h']:>10}"
+        )
+    return lines
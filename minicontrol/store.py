@@ -0,0 +1,340 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+from .model import ParameterModel
+from .preset import (
+    binary_format, decode_binary_text, decode_legacy, encode_binary_text, encode_legacy, no_bank,
+    parameter_size, unset_value
+)
+
+
+# Content-addressed preset store. Each distinct preset is kept once, under the hash of its values,
+# as a bitmask of the addresses where it differs from the defaults of parameters.json or from a
+# chosen base preset, followed by the values at those addresses. Library entries (name, author,
+# description...) point at these objects.
+# Run from the repository root:
+#   python -m minicontrol.store build shared_presets.json
+#   python -m minicontrol.store find --author Ben
+#   python -m minicontrol.store export exported_presets.json
+
+store_file = 'shared_presets.store.npz'
+hash_prefix = b'minicontrol-preset\0'
+# Base of objects stored against the defaults
+no_base = -1
+# Library keys kept in their own columns, anything else (description...) is kept as JSON
+entry_keys = ('name', 'author', 'value', 'format')
+
+
+# Device values of the defaults, what a reset bank holds
+def model_defaults(model):
+    defaults = np.zeros(parameter_size, dtype=np.uint16)
+    for _, param in model.iter_parameters():
+        sysex_address = param['sysex_adress']
+        if 0 <= sysex_address < parameter_size:
+            defaults[sysex_address] = ParameterModel.scaled_default(param)
+    return defaults
+
+
+# Canonical hash of a preset: its values as little-endian u16, whatever format they came in
+def preset_hash(values):
+    values = np.ascontiguousarray(values, dtype='<u2')
+    return hashlib.sha256(hash_prefix + struct.pack('<H', len(values)) + values.tobytes()).hexdigest()
+
+
+# Values and entry columns of a library record
+def decode_record(preset):
+    code = preset['value']
+    extra = {key: value for key, value in preset.items() if key not in entry_keys}
+    entry = {
+        'name': preset.get('name', ''),
+        'author': preset.get('author', ''),
+        'extra': json.dumps(extra, ensure_ascii=False),
+        'binary': preset.get('format') == binary_format,
+        'firmware': 0,
+        'bank': no_bank,
+        # index.js accepts unpadded base64, keep the codes as they were written
+        'unpadded': '=' not in code,
+    }
+    if entry['binary']:
+        values, entry['firmware'], bank = decode_binary_text(code)
+        entry['bank'] = no_bank if bank is None else bank
+    else:
+        values = decode_legacy(code)
+    return values, entry
+
+
+# Positions in the delta values of the objects, one run per object (offsets[i]:offsets[i + 1])
+def delta_positions(offsets, objects):
+    starts = offsets[objects]
+    counts = offsets[objects + 1] - starts
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+
+
+def store_width(lengths):
+    return max(parameter_size, int(lengths.max()) if len(lengths) else 0)
+
+
+class PresetStore:
+    entry_columns = ('name', 'author', 'extra', 'binary', 'firmware', 'bank', 'unpadded', 'object')
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.defaults = arrays['defaults']
+        self.hashes = arrays['hashes']
+        self.lengths = arrays['lengths']
+        self.bases = arrays['bases']
+        self.offsets = arrays['offsets']
+        self.masks = arrays['masks']
+        self.values = arrays['values']
+        self.entries = {column: arrays[column] for column in self.entry_columns}
+
+    # Store a library. Each preset is stored against the defaults or against whichever of the
+    # base presets (given by name) leaves the fewest differing addresses. Bases are themselves
+    # stored against the defaults, so any preset materializes in at most two steps.
+    @classmethod
+    def build(cls, presets, defaults, base_names=()):
+        width = parameter_size
+        decoded = [decode_record(preset) for preset in presets]
+        for values, _ in decoded:
+            width = max(width, len(values))
+        reference = np.full(width, unset_value, dtype=np.uint16)
+        reference[:len(defaults)] = defaults
+
+        object_ids = {}
+        rows = []
+        lengths = []
+        entries = {column: [] for column in cls.entry_columns}
+        for values, entry in decoded:
+            key = preset_hash(values)
+            if key not in object_ids:
+                object_ids[key] = len(rows)
+                row = reference.copy()
+                row[:len(values)] = values
+                rows.append(row)
+                lengths.append(len(values))
+            entry['object'] = object_ids[key]
+            for column in cls.entry_columns:
+                entries[column].append(entry[column])
+        matrix = np.array(rows, dtype=np.uint16).reshape(len(rows), width)
+
+        names = entries['name']
+        base_objects = []
+        for name in base_names:
+            if name not in names:
+                raise ValueError(f'no preset named {name!r} to use as a base')
+            base_objects.append(entries['object'][names.index(name)])
+        base_objects = np.array(sorted(set(base_objects)), dtype=np.int32)
+
+        bases = np.full(len(matrix), no_base, dtype=np.int32)
+        if len(base_objects):
+            fewest = (matrix != reference).sum(axis=1)
+            for base in base_objects:
+                changed = (matrix != matrix[base]).sum(axis=1)
+                better = changed < fewest
+                better[base_objects] = False
+                bases[better] = base
+                fewest = np.minimum(fewest, changed)
+
+        references = np.where((bases == no_base)[:, None], reference, matrix[np.maximum(bases, 0)])
+        changed = matrix != references
+        offsets = np.zeros(len(matrix) + 1, dtype=np.int64)
+        np.cumsum(changed.sum(axis=1), out=offsets[1:])
+
+        arrays = {
+            'defaults': np.asarray(defaults, dtype=np.uint16),
+            'hashes': np.array(list(object_ids), dtype='U64'),
+            'lengths': np.array(lengths, dtype=np.uint16),
+            'bases': bases,
+            'offsets': offsets,
+            'masks': np.packbits(changed, axis=1),
+            'values': matrix[changed],
+            'name': np.array(entries['name'], dtype=str),
+            'author': np.array(entries['author'], dtype=str),
+            'extra': np.array(entries['extra'], dtype=str),
+            'binary': np.array(entries['binary'], dtype=bool),
+            'firmware': np.array(entries['firmware'], dtype=np.uint16),
+            'bank': np.array(entries['bank'], dtype=np.uint8),
+            'unpadded': np.array(entries['unpadded'], dtype=bool),
+            'object': np.array(entries['object'], dtype=np.int32),
+        }
+        # Case-insensitive name and author indexes, looked up with a binary search
+        for column in ('name', 'author'):
+            keys = np.char.lower(arrays[column]) if len(presets) else arrays[column]
+            order = np.argsort(keys, kind='stable').astype(np.int32)
+            arrays[f'{column}_order'] = order
+            arrays[f'{column}_keys'] = keys[order]
+        return cls(arrays)
+
+    @classmethod
+    def from_library(cls, library, model, base_names=()):
+        return cls.build(library.get('shared_presets', []), model_defaults(model), base_names)
+
+    def save(self, path):
+        np.savez_compressed(path, **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def __len__(self):
+        return len(self.entries['object'])
+
+    # Entry positions whose name and/or author match, ignoring case
+    def find(self, name=None, author=None):
+        matches = None
+        for column, value in (('name', name), ('author', author)):
+            if value is None:
+                continue
+            keys = self.arrays[f'{column}_keys']
+            key = value.lower()
+            found = self.arrays[f'{column}_order'][np.searchsorted(keys, key):np.searchsorted(keys, key, side='right')]
+            matches = found if matches is None else np.intersect1d(matches, found)
+        if matches is None:
+            return np.arange(len(self))
+        return np.sort(matches)
+
+    # Entry positions of the preset objects whose hash starts with prefix
+    def find_hash(self, prefix):
+        objects = np.flatnonzero(np.char.startswith(self.hashes, prefix.lower()))
+        return np.flatnonzero(np.isin(self.entries['object'], objects))
+
+    # The mask rows are unpacked in the order the values were taken, row by row
+    def apply_deltas(self, rows, objects):
+        changed = np.unpackbits(self.masks[objects], axis=1, count=rows.shape[1]).astype(bool)
+        rows[changed] = self.values[delta_positions(self.offsets, objects)]
+
+    # (len(objects), width) values of the objects, past their length the defaults then unset_value
+    def materialize(self, objects=None):
+        objects = np.arange(len(self.hashes)) if objects is None else np.asarray(objects, dtype=np.intp)
+        reference = np.full(store_width(self.lengths), unset_value, dtype=np.uint16)
+        reference[:len(self.defaults)] = self.defaults
+        rows = np.tile(reference, (len(objects), 1))
+        based = np.flatnonzero(self.bases[objects] != no_base)
+        if len(based):
+            base_rows = rows[based]
+            self.apply_deltas(base_rows, self.bases[objects[based]])
+            rows[based] = base_rows
+        self.apply_deltas(rows, objects)
+        return rows
+
+    # Library records of the entries, values encoded as each was stored unless output_format is given
+    def records(self, entries=None, output_format=None):
+        entries = np.arange(len(self)) if entries is None else np.asarray(entries, dtype=np.intp)
+        objects = self.entries['object'][entries]
+        unique, inverse = np.unique(objects, return_inverse=True)
+        rows = self.materialize(unique)
+        records = []
+        for entry, object_id, row_index in zip(entries, objects, inverse):
+            values = rows[row_index][:self.lengths[object_id]].tolist()
+            stored_binary = bool(self.entries['binary'][entry])
+            binary = stored_binary if output_format is None else output_format == binary_format
+            if binary:
+                # Presets stored from legacy codes take the firmware from address 7, like encode_binary
+                firmware = int(self.entries['firmware'][entry]) if stored_binary else None
+                bank = int(self.entries['bank'][entry])
+                code = encode_binary_text(values, firmware, None if bank == no_bank else bank)
+            else:
+                code = encode_legacy(values)
+                if self.entries['unpadded'][entry]:
+                    code = code.rstrip('=')
+            record = {'name': str(self.entries['name'][entry]), 'author': str(self.entries['author'][entry]), 'value': code}
+            record.update(json.loads(str(self.entries['extra'][entry])))
+            if binary:
+                record['format'] = binary_format
+            records.append(record)
+        return records
+
+    def library(self, output_format=None):
+        return {'shared_presets': self.records(output_format=output_format)}
+
+    def report(self):
+        deltas = np.diff(self.offsets)
+        return {
+            'presets': len(self),
+            'objects': len(self.hashes),
+            'duplicates': len(self) - len(self.hashes),
+            'stored_against_base': int((self.bases != no_base).sum()),
+            'delta_entries': int(deltas.sum()),
+            'mean_changed_addresses': round(float(deltas.mean()), 1) if len(deltas) else 0.0,
+            # Mask and changed values of each distinct preset, against every value of every preset
+            'delta_bytes': self.masks.nbytes + self.values.nbytes,
+            'full_bytes': len(self) * store_width(self.lengths) * 2,
+        }
+
+
+def format_report(report, library_bytes=None, store_bytes=None):
+    lines = [
+        f"{report['presets']} presets, {report['objects']} distinct ({report['duplicates']} duplicates), "
+        f"{report['stored_against_base']} stored against a base preset",
+        f"{report['delta_entries']} changed addresses, {report['mean_changed_addresses']} per distinct preset",
+        f"values: {report['full_bytes']} bytes in full, {report['delta_bytes']} bytes as deltas "
+        f"({(1 - report['delta_bytes'] / report['full_bytes']) * 100 if report['full_bytes'] else 0:.0f}% saved)",
+    ]
+    if library_bytes is not None:
+        lines.append(
+            f'files: {library_bytes} bytes of library, {store_bytes} bytes of store '
+            f'({(1 - store_bytes / library_bytes) * 100 if library_bytes else 0:.0f}% saved)'
+        )
+    elif store_bytes is not None:
+        lines.append(f'file: {store_bytes} bytes of store')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.store', description='Deduplicated, delta-encoded preset store.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='store a shared_presets.json-shaped library')
+    build.add_argument('library', nargs='?', default='shared_presets.json')
+    build.add_argument('-o', '--output', default=store_file)
+    build.add_argument('--base', action='append', default=[], help='name of a preset others may be stored against, repeatable')
+    build.add_argument('--parameters', default='parameters.json')
+    find = commands.add_parser('find', help='list presets by name and/or author')
+    find.add_argument('--name')
+    find.add_argument('--author')
+    find.add_argument('--hash', help='prefix of a preset hash')
+    find.add_argument('--store', default=store_file)
+    export = commands.add_parser('export', help='write the presets back as a shared_presets.json that index.js loads')
+    export.add_argument('output')
+    export.add_argument('--format', choices=['binary', 'legacy'], help='preset encoding to write (default: keep each preset\'s)')
+    export.add_argument('--store', default=store_file)
+    report = commands.add_parser('report', help='storage used by the store')
+    report.add_argument('--store', default=store_file)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        with open(args.library, 'r') as f:
+            library = json.load(f)
+        store = PresetStore.from_library(library, ParameterModel(args.parameters), args.base)
+        store.save(args.output)
+        print(f'Stored {len(store)} presets into {args.output}')
+        for line in format_report(store.report(), os.path.getsize(args.library), os.path.getsize(args.output)):
+            print(f'  {line}')
+        return 0
+
+    store = PresetStore.load(args.store)
+    if args.command == 'find':
+        entries = store.find(args.name, args.author)
+        if args.hash:
+            entries = np.intersect1d(entries, store.find_hash(args.hash))
+        for entry in entries:
+            print(f"{store.hashes[store.entries['object'][entry]][:12]}  {store.entries['name'][entry]} by {store.entries['author'][entry]}")
+    elif args.command == 'export':
+        output_format = {'binary': binary_format, 'legacy': 'legacy', None: None}[args.format]
+        with open(args.output, 'w') as f:
+            json.dump(store.library(output_format), f, indent=4, ensure_ascii=False)
+        print(f'Exported {len(store)} presets to {args.output}')
+    else:
+        for line in format_report(store.report(), store_bytes=os.path.getsize(args.store)):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import argparse
+import re
+import sys
+from collections import namedtuple
+
+from .model import ParameterModel
+from .preset import decode_preset, firmware_adress, unset_value
+
+
+# One parameter message is F0 loAddr hiAddr loVal hiVal F7
+message_size = 6
+# index.js ends every preset load with sendParameter(0, 0)
+finish_message = (0, 0)
+
+# Addresses re-applied by a method, e.g. pan re-applies the chord and harp output levels
+applied_address_pattern = re.compile(r'apply_audio_parameter\(\s*(\d+)')
+
+# messages: [(address, value)] in sending order, finish message included
+TransferPlan = namedtuple('TransferPlan', [
+    'messages', 'changed', 'unchanged', 'full_messages', 'messages_saved', 'bytes_sent', 'bytes_saved'
+])
+
+
+# Ordering information shared by the Python planner and the web UI
+class TransferOrder:
+    def __init__(self, model):
+        self.addresses = []
+        self.effects = {}
+        self.dependents = {}
+        for group_name, param in model.iter_parameters():
+            sysex_address = param['sysex_adress']
+            # Addresses 0-1 are commands and the firmware revision is read-only
+            if sysex_address < 2 or sysex_address == firmware_adress:
+                continue
+            self.addresses.append(sysex_address)
+            if param.get('deferred_effect'):
+                self.effects[sysex_address] = param['deferred_effect'].strip()
+            dependents = set(param.get('dependent_addresses', []))
+            dependents.update(int(a) for a in applied_address_pattern.findall(param.get('method', '')))
+            dependents.discard(sysex_address)
+            if dependents:
+                self.dependents[sysex_address] = sorted(dependents)
+        self.addresses.sort()
+        self.dependent_of = {dependent for dependents in self.dependents.values() for dependent in dependents}
+        # Deferred effects are grouped so addresses sharing one side effect are sent back to back
+        self.effect_rank = {effect: rank for rank, effect in enumerate(dict.fromkeys(self.effects[a] for a in sorted(self.effects)))}
+
+    # Independent addresses first, then those re-applying others, then the re-applied ones,
+    # and the addresses with shared LED/potentiometer/timer side effects last
+    def sort_key(self, sysex_address):
+        if sysex_address in self.effects:
+            return (3, self.effect_rank[self.effects[sysex_address]], sysex_address)
+        if sysex_address in self.dependent_of:
+            return (2, 0, sysex_address)
+        if sysex_address in self.dependents:
+            return (1, 0, sysex_address)
+        return (0, 0, sysex_address)
+
+
+def round_value(value):
+    return int(value + 0.5)
+
+
+# Messages needed to bring a device holding current (its dump values) to target (a preset)
+def plan_transfer(current, target, model, order=None):
+    order = order or TransferOrder(model)
+    changed = []
+    unchanged = 0
+    full_messages = 0
+    for sysex_address in order.addresses:
+        if sysex_address >= len(target) or target[sysex_address] == unset_value:
+            continue
+        full_messages += 1
+        value = round_value(target[sysex_address])
+        if sysex_address < len(current) and current[sysex_address] == value:
+            unchanged += 1
+            continue
+        changed.append((sysex_address, value))
+
+    changed.sort(key=lambda message: order.sort_key(message[0]))
+    messages = changed + [finish_message] if changed else []
+    full_messages += 1
+    return TransferPlan(
+        messages=messages,
+        changed=len(changed),
+        unchanged=unchanged,
+        full_messages=full_messages,
+        messages_saved=full_messages - len(messages),
+        bytes_sent=message_size * len(messages),
+        bytes_saved=message_size * (full_messages - len(messages))
+    )
+
+
+def encode_message(sysex_address, value):
+    return bytes([0xF0, sysex_address % 128, sysex_address // 128, value % 128, value // 128, 0xF7])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minicontrol.transfer', description='Plan the SysEx messages needed to load a preset onto a device.')
+    parser.add_argument('dump', help='raw parameter dump of the device (one SysEx frame)')
+    parser.add_argument('preset', help='preset code, legacy or binary')
+    parser.add_argument('--parameters', default='parameters.json')
+    args = parser.parse_args(argv)
+
+    from .codec import decode_dump
+    with open(args.dump, 'rb') as f:
+        current = decode_dump(f.read()).values.tolist()
+    plan = plan_transfer(current, decode_preset(args.preset), ParameterModel(args.parameters))
+    for sysex_address, value in plan.messages:
+        print(f'{sysex_address:3d} <- {value}')
+    print(f'{len(plan.messages)} messages ({plan.bytes_sent} bytes) instead of {plan.full_messages} '
+          f'({message_size * plan.full_messages} bytes), saved {plan.messages_saved} messages / {plan.bytes_saved} bytes')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
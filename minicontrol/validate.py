@@ -0,0 +1,136 @@
+from .header import address_space
+from .model import ParameterModel
+from .transfer import applied_address_pattern
+
+
+# Largest value two 7-bit SysEx bytes can carry
+max_encoded_value = 2**14 - 1
+
+required_fields = ('name', 'group', 'sysex_adress', 'data_type', 'default_value', 'ui_type')
+data_types = ('int', 'float')
+
+
+class ValidationError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f'{len(errors)} error(s) in the parameter definitions')
+
+
+def json_path(*parts):
+    return '$' + ''.join(f'[{part}]' if isinstance(part, int) else f'.{part}' for part in parts)
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_address(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# Check parameters.json in a single pass over the parameters, references are resolved
+# against the address and name sets collected on the way. Returns (errors, warnings),
+# each a list of (json path, message).
+def validate_model(model, name_order=None):
+    errors = []
+    warnings = []
+    first_path = {}
+    names = set()
+    references = []
+
+    for group_name, params in model.groups():
+        if not isinstance(params, list):
+            errors.append((json_path(group_name), 'parameter group must be a list'))
+            continue
+        for i, param in enumerate(params):
+            path = (group_name, i)
+            if not isinstance(param, dict):
+                errors.append((json_path(*path), f'parameter must be an object, not {param!r}'))
+                continue
+            missing = [field for field in required_fields if field not in param]
+            for field in missing:
+                errors.append((json_path(*path, field), 'missing required field'))
+            if 'sysex_adress' in missing:
+                continue
+
+            sysex_address = param['sysex_adress']
+            if not is_address(sysex_address) or not 0 <= sysex_address < address_space:
+                errors.append((json_path(*path, 'sysex_adress'), f'address {sysex_address!r} outside 0-{address_space - 1}'))
+            elif sysex_address in first_path:
+                errors.append((
+                    json_path(*path, 'sysex_adress'),
+                    f'duplicate address {sysex_address}, already used by {json_path(*first_path[sysex_address])}'
+                ))
+            else:
+                first_path[sysex_address] = path
+            for field in ('name', 'group', 'method'):
+                if field in param and not isinstance(param[field], str):
+                    errors.append((json_path(*path, field), f'{param[field]!r} is not a string'))
+            if isinstance(param.get('name'), str) and isinstance(param.get('group', ''), str):
+                names.add((group_name, param.get('group'), param.get('name')))
+
+            if param.get('data_type', 'int') not in data_types:
+                errors.append((json_path(*path, 'data_type'), f'unknown data type {param["data_type"]!r}'))
+                continue
+            # Values travel as a 14-bit unsigned integer once scaled
+            multiplier = ParameterModel.float_multiplier(param)
+            if not is_number(multiplier):
+                errors.append((json_path(*path, 'float_multiplier'), f'{multiplier!r} is not a number'))
+                multiplier = 1
+            for field in ('min_value', 'max_value'):
+                if field not in param:
+                    continue
+                if not is_number(param[field]):
+                    errors.append((json_path(*path, field), f'{param[field]!r} is not a number'))
+                elif not 0 <= param[field] * multiplier <= max_encoded_value:
+                    errors.append((
+                        json_path(*path, field),
+                        f'{param[field]} * {multiplier} does not fit the 14-bit SysEx value (0-{max_encoded_value})'
+                    ))
+            for field in ('options', 'dependent_addresses'):
+                if not isinstance(param.get(field, []), list):
+                    errors.append((json_path(*path, field), f'{param[field]!r} is not a list'))
+            options = param.get('options', [])
+            for j, option in enumerate(options if isinstance(options, list) else []):
+                if not isinstance(option, dict):
+                    errors.append((json_path(*path, 'options', j), f'option must be an object, not {option!r}'))
+                elif not is_number(option.get('value', 0)):
+                    errors.append((json_path(*path, 'options', j, 'value'), f'{option["value"]!r} is not a number'))
+                elif not 0 <= option.get('value', 0) <= max_encoded_value:
+                    errors.append((json_path(*path, 'options', j, 'value'), f'{option["value"]} does not fit the 14-bit SysEx value'))
+
+            dependent_addresses = param.get('dependent_addresses', [])
+            for j, address in enumerate(dependent_addresses if isinstance(dependent_addresses, list) else []):
+                if is_address(address):
+                    references.append((json_path(*path, 'dependent_addresses', j), address))
+                else:
+                    errors.append((json_path(*path, 'dependent_addresses', j), f'{address!r} is not an address'))
+            method = param.get('method', '')
+            for address in applied_address_pattern.findall(method if isinstance(method, str) else ''):
+                references.append((json_path(*path, 'method'), int(address)))
+
+    for path, address in references:
+        if address not in first_path:
+            errors.append((path, f'references address {address}, which no parameter defines'))
+
+    # Stale entries in the name-based order are skipped by the page, so only warn
+    for group_name, subgroups in (name_order or {}).items():
+        for param_group, ordered_names in subgroups.items():
+            for name in ordered_names:
+                if (group_name, param_group, name) not in names:
+                    warnings.append((
+                        f'parameter_name_order.{group_name}.{param_group}',
+                        f'{name!r} matches no parameter'
+                    ))
+    return errors, warnings
+
+
+# Raise ValidationError before any output is written
+def check_model(model):
+    errors, _ = validate_model(model)
+    if errors:
+        raise ValidationError(errors)
+
+
+def format_errors(errors):
+    return [f'{path}: {message}' for path, message in errors]
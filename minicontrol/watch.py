@@ -0,0 +1,131 @@
+import functools
+import http.server
+import importlib
+import os
+import threading
+import time
+
+from . import bundle, header, name_map, page, param_index, slices
+from .cli import run
+
+
+# Delay between two checks of the watched files
+poll_interval = 0.02
+# A burst of saves is only rebuilt once no file changed for this long
+debounce_delay = 0.03
+
+# Modules holding the templates, in import order so a reload also refreshes the names imported from them
+template_modules = (name_map, header, param_index, page, slices, bundle)
+
+reload_endpoint = '/__build'
+
+
+# Serves the working directory, and the number of the last build on the reload endpoint,
+# index.js polls it when the page is opened with ?watch
+class ReloadServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    build = 0
+
+
+class ReloadHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != reload_endpoint:
+            return super().do_GET()
+        body = str(self.server.build).encode('ascii')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port):
+    server = ReloadServer(('localhost', port), functools.partial(ReloadHandler, directory=os.getcwd()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f'Serving on http://localhost:{port}/index.html?watch')
+    return server
+
+
+def watched_files(model):
+    # A derived name map is an output, not an input
+    inputs = [model.parameters_path, page.svg_file] if model.derive_name_map else [model.parameters_path, model.name_map_path, page.svg_file]
+    return inputs + [module.__file__ for module in template_modules]
+
+
+# Watched files the build writes itself
+def build_outputs(model, paths):
+    return [path for path in paths if path == model.name_map_path]
+
+
+# Modification time of each file, None while it is missing (e.g. mid-save)
+def snapshot(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+# Drop only what the changed files invalidate, the rest of the model stays parsed
+def apply_changes(model, changed):
+    template_files = {module.__file__ for module in template_modules}
+    if template_files.intersection(changed):
+        for module in template_modules:
+            importlib.reload(module)
+    for path in changed:
+        model.invalidate(path)
+
+
+def watch(model, cache, args):
+    # --force only applies to the first build
+    cache.force = False
+    server = start_server(args.serve) if args.serve else None
+    paths = watched_files(model)
+    seen = snapshot(paths)
+    print(f'Watching {len(paths)} files, press Ctrl+C to stop')
+    try:
+        while True:
+            time.sleep(poll_interval)
+            current = snapshot(paths)
+            if current == seen:
+                continue
+            while True:
+                time.sleep(debounce_delay)
+                settled = snapshot(paths)
+                if settled == current:
+                    break
+                current = settled
+            changed = [path for path in paths if current[path] != seen[path]]
+            seen = current
+
+            start = time.perf_counter()
+            try:
+                apply_changes(model, changed)
+                status = run(model, cache, args)
+            except Exception as error:
+                # Typically a half-written parameters.json or a mistyped field, the next save triggers
+                # a new build
+                print(f'Build failed: {type(error).__name__}: {error}')
+                status = 1
+            elapsed = time.perf_counter() - start
+            # Outputs written by the build itself (the name map) are not edits, any input saved
+            # while the build ran still differs from seen and is rebuilt on the next poll
+            seen.update(snapshot(build_outputs(model, paths)))
+            changes = ', '.join(os.path.relpath(path) for path in changed)
+            if status:
+                print(f'Build failed after changes to {changes}, waiting for the next save')
+                continue
+            print(f'Rebuilt in {elapsed * 1000:.0f} ms after changes to {changes}')
+            if server:
+                server.build += 1
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if server:
+            server.shutdown()
@@ -0,0 +1,261 @@
+// Generated by minicontrol from parameters.json, do not edit.
+// One slot per SysEx address: the parameter definition, its top-level section, float multiplier,
+// scaled default and the addresses it re-applies, or null when the address is unused.
+const PARAMETER_INDEX = [
+  null,
+  null,
+  {"sysex_adress":2,"name":"global gain","section":"harp_parameter","group":"hidden","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":3,"name":"global gain","section":"chord_parameter","group":"hidden","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":4,"name":"chord alternate value","section":"hidden","group":"hidden","data_type":"int","ui_type":"slider","min_value":0,"max_value":1024,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[],"deferred_effect":"chord_pot.force_update();"},
+  {"sysex_adress":5,"name":"harp alternate value","section":"hidden","group":"hidden","data_type":"int","ui_type":"slider","min_value":0,"max_value":1024,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[],"deferred_effect":"harp_pot.force_update();"},
+  {"sysex_adress":6,"name":"mod alternate value","section":"hidden","group":"hidden","data_type":"int","ui_type":"slider","min_value":0,"max_value":1024,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[],"deferred_effect":"mod_pot.force_update();"},
+  {"sysex_adress":7,"name":"firmware revision","section":"hidden","group":"hidden","data_type":"float","ui_type":"slider","min_value":0,"max_value":10,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  null,
+  null,
+  {"sysex_adress":10,"name":"chord alternate control","section":"chord_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"select","min_value":40,"max_value":219,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":11,"name":"chord alternate range","section":"chord_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":12,"name":"harp alternate control","section":"harp_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"select","min_value":40,"max_value":219,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":13,"name":"harp alternate percent range","section":"harp_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":14,"name":"mod main control","section":"modulation_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"select","min_value":40,"max_value":219,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":15,"name":"mod main percent range","section":"modulation_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":16,"name":"mod alternate control","section":"modulation_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"select","min_value":40,"max_value":219,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":17,"name":"mod alternate percent range ","section":"modulation_potentiometer","group":"Potentiometer","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  null,
+  null,
+  {"sysex_adress":20,"name":"bank color","section":"global_parameter","group":"General","data_type":"int","ui_type":"slider","min_value":0,"max_value":360,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[],"deferred_effect":"set_led_color(bank_led_hue, 1.0, 1-led_attenuation);"},
+  {"sysex_adress":21,"name":"retrigger chords","section":"chord_parameter","group":"General","data_type":"int","ui_type":"switch","min_value":0,"max_value":1,"default_value":false,"float_multiplier":1,"scaled_default":false,"dependents":[]},
+  {"sysex_adress":22,"name":"change held strings","section":"harp_parameter","group":"General","data_type":"int","ui_type":"switch","min_value":0,"max_value":1,"default_value":false,"float_multiplier":1,"scaled_default":false,"dependents":[]},
+  {"sysex_adress":23,"name":"slash level","section":"chord_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":2,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":24,"name":"reverb size","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":25,"name":"reverb high damping","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":26,"name":"reverb low damping","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":27,"name":"reverb low pass","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":28,"name":"reverb diffusion","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":29,"name":"pan","section":"global_parameter","group":"Effects","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":1,"float_multiplier":100.0,"scaled_default":100.0,"dependents":[85,184]},
+  {"sysex_adress":30,"name":"transpose","section":"global_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":31,"name":"sharp function","section":"global_parameter","group":"General","data_type":"int","ui_type":"select","min_value":0,"max_value":1,"default_value":false,"float_multiplier":1,"scaled_default":false,"dependents":[]},
+  {"sysex_adress":32,"name":"led attenuation","section":"global_parameter","group":"General","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[],"deferred_effect":"set_led_color(bank_led_hue, 1.0, 1-led_attenuation);"},
+  {"sysex_adress":33,"name":"barry harris mode","section":"chord_parameter","group":"General","data_type":"int","ui_type":"switch","min_value":0,"max_value":1,"default_value":false,"float_multiplier":1,"scaled_default":false,"dependents":[]},
+  {"sysex_adress":34,"name":"chord frame shift","section":"chord_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":6,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":35,"name":"key selection","section":"chord_parameter","group":"General","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":36,"name":"scalar harp mode","section":"harp_parameter","group":"General","data_type":"int","ui_type":"select","min_value":0,"max_value":8,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  null,
+  null,
+  null,
+  {"sysex_adress":40,"name":"harp shuffling","section":"harp_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":6,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":41,"name":"amplitude","section":"harp_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":42,"name":"waveform","section":"harp_parameter","group":"Oscillator","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":43,"name":"attack","section":"harp_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":44,"name":"hold","section":"harp_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":45,"name":"decay","section":"harp_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":46,"name":"sustain","section":"harp_parameter","group":"Envelope","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":47,"name":"release","section":"harp_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":48,"name":"retrigger release","section":"harp_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":10,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":49,"name":"base frequency","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":2000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":50,"name":"keytrack value","section":"harp_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":3,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":51,"name":"resonance","section":"harp_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":52,"name":"attack","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":53,"name":"hold","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":54,"name":"decay","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":55,"name":"sustain","section":"harp_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":56,"name":"release","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":57,"name":"retrigger release","section":"harp_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":58,"name":"filter sensitivity","section":"harp_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":59,"name":"waveform","section":"harp_parameter","group":"Tremolo","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":60,"name":"frequency","section":"harp_parameter","group":"Tremolo","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":61,"name":"amplitude","section":"harp_parameter","group":"Tremolo","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":62,"name":"waveform","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":63,"name":"frequency","section":"harp_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":64,"name":"amplitude","section":"harp_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":65,"name":"attack","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":66,"name":"hold","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":67,"name":"decay","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":68,"name":"sustain","section":"harp_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":69,"name":"release","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":70,"name":"retrigger release","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":71,"name":"pitch bend","section":"harp_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":2,"default_value":1,"float_multiplier":100.0,"scaled_default":100.0,"dependents":[]},
+  {"sysex_adress":72,"name":"attack bend","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":73,"name":"hold bend","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":74,"name":"decay bend","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":75,"name":"retrigger release bend","section":"harp_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":76,"name":"intensity","section":"harp_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":5,"float_multiplier":100.0,"scaled_default":500.0,"dependents":[]},
+  {"sysex_adress":77,"name":"delay length","section":"harp_parameter","group":"Delay","data_type":"int","ui_type":"slider","min_value":0,"max_value":600,"default_value":1,"float_multiplier":1,"scaled_default":1,"dependents":[]},
+  {"sysex_adress":78,"name":"delay filter frequency","section":"harp_parameter","group":"Delay","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":79,"name":"delay filter resonance","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":80,"name":"delay lowpass","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":81,"name":"delay bandpass","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":82,"name":"delay highpass","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":83,"name":"dry mix","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":84,"name":"delay mix","section":"harp_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":85,"name":"reverb level","section":"harp_parameter","group":"Reverb","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":86,"name":"crunch level","section":"harp_parameter","group":"Crunch","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":87,"name":"crunch type","section":"harp_parameter","group":"Crunch","data_type":"int","ui_type":"select","min_value":0,"max_value":2,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":88,"name":"frequency","section":"harp_parameter","group":"Output filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":89,"name":"resonance","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":90,"name":"lowpass","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":91,"name":"bandpass","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":92,"name":"highpass","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":93,"name":"LFO waveform","section":"harp_parameter","group":"Output filter","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":94,"name":"LFO frequency","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":95,"name":"LFO amplitude","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":96,"name":"filter LFO sensitivity","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":97,"name":"output amplifier","section":"harp_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":2,"default_value":1,"float_multiplier":100.0,"scaled_default":100.0,"dependents":[]},
+  {"sysex_adress":98,"name":"chromatic mode","section":"harp_parameter","group":"General","data_type":"int","ui_type":"switch","min_value":0,"max_value":1,"default_value":false,"float_multiplier":1,"scaled_default":false,"dependents":[]},
+  {"sysex_adress":99,"name":"octave change","section":"harp_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":4,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":100,"name":"waveform","section":"harp_parameter","group":"Transient","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":101,"name":"amplitude","section":"harp_parameter","group":"Transient","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":102,"name":"attack","section":"harp_parameter","group":"Transient","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":103,"name":"hold","section":"harp_parameter","group":"Transient","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":104,"name":"decay","section":"harp_parameter","group":"Transient","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":105,"name":"note level","section":"harp_parameter","group":"Transient","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":24,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  {"sysex_adress":120,"name":"chord shuffling","section":"chord_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":5,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":121,"name":"amplitude 1","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":122,"name":"waveform 1","section":"chord_parameter","group":"Oscillator","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":123,"name":"frequency multiplier 1","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0.5,"max_value":2,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":124,"name":"amplitude 2","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":125,"name":"waveform 2","section":"chord_parameter","group":"Oscillator","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":126,"name":"frequency multiplier 2","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0.5,"max_value":2,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":127,"name":"amplitude 3","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":128,"name":"waveform 3","section":"chord_parameter","group":"Oscillator","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":129,"name":"frequency multiplier 3","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0.5,"max_value":2,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":130,"name":"noise","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":131,"name":"first note","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":132,"name":"second note","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":133,"name":"third note","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":134,"name":"fourth note","section":"chord_parameter","group":"Oscillator","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":135,"name":"inter-note delay","section":"chord_parameter","group":"General","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":10,"float_multiplier":1,"scaled_default":10,"dependents":[]},
+  {"sysex_adress":136,"name":"random note delay","section":"chord_parameter","group":"General","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":10,"float_multiplier":1,"scaled_default":10,"dependents":[]},
+  {"sysex_adress":137,"name":"attack","section":"chord_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":138,"name":"hold","section":"chord_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":139,"name":"decay","section":"chord_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":140,"name":"sustain","section":"chord_parameter","group":"Envelope","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":141,"name":"release","section":"chord_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":142,"name":"retrigger release","section":"chord_parameter","group":"Envelope","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":143,"name":"base frequency","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":144,"name":"keytrack value","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":145,"name":"resonance","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":146,"name":"attack","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":147,"name":"hold","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":148,"name":"decay","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":149,"name":"sustain","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":150,"name":"release","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":151,"name":"retrigger release","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":152,"name":"LFO waveform","section":"chord_parameter","group":"Low pass filter","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":153,"name":"LFO frequency","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":154,"name":"LFO amplitude","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":155,"name":"filter sensitivity","section":"chord_parameter","group":"Low pass filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":156,"name":"waveform","section":"chord_parameter","group":"Tremolo","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":157,"name":"frequency","section":"chord_parameter","group":"Tremolo","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":158,"name":"keytrack value","section":"chord_parameter","group":"Tremolo","data_type":"float","ui_type":"slider","min_value":0,"max_value":5,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":159,"name":"amplitude","section":"chord_parameter","group":"Tremolo","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":160,"name":"waveform","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"select","min_value":0,"max_value":11,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":161,"name":"frequency","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":20,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":162,"name":"keytrack value","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":163,"name":"amplitude","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":164,"name":"attack","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":165,"name":"hold","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":166,"name":"decay","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":167,"name":"sustain","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":168,"name":"release","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":169,"name":"retrigger release","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":170,"name":"pitch bend","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":2,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":171,"name":"attack bend ","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":15,"float_multiplier":1,"scaled_default":15,"dependents":[]},
+  {"sysex_adress":172,"name":"hold bend","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":173,"name":"decay bend","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":1000,"float_multiplier":1,"scaled_default":1000,"dependents":[]},
+  {"sysex_adress":174,"name":"retrigger release bend","section":"chord_parameter","group":"Vibrato","data_type":"int","ui_type":"slider","min_value":0,"max_value":100,"default_value":5,"float_multiplier":1,"scaled_default":5,"dependents":[]},
+  {"sysex_adress":175,"name":"intensity","section":"chord_parameter","group":"Vibrato","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[]},
+  {"sysex_adress":176,"name":"delay length","section":"chord_parameter","group":"Delay","data_type":"int","ui_type":"slider","min_value":0,"max_value":600,"default_value":1,"float_multiplier":1,"scaled_default":1,"dependents":[]},
+  {"sysex_adress":177,"name":"delay filter frequency","section":"chord_parameter","group":"Delay","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":178,"name":"delay filter resonance","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":179,"name":"delay lowpass","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":180,"name":"delay bandpass","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":181,"name":"delay highpass","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":182,"name":"dry mix","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":183,"name":"delay mix","section":"chord_parameter","group":"Delay","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":184,"name":"reverb level","section":"chord_parameter","group":"Reverb","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":185,"name":"crunch level","section":"chord_parameter","group":"Crunch","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":186,"name":"crunch type","section":"chord_parameter","group":"Crunch","data_type":"int","ui_type":"select","min_value":0,"max_value":2,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":187,"name":"default bpm","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"slider","min_value":30,"max_value":300,"default_value":90,"float_multiplier":1,"scaled_default":90,"dependents":[],"deferred_effect":"recalculate_timer();"},
+  {"sysex_adress":188,"name":"cycle length","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"slider","min_value":1,"max_value":16,"default_value":16,"float_multiplier":1,"scaled_default":16,"dependents":[]},
+  {"sysex_adress":189,"name":"measure update","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"discrete_slider","min_value":1,"max_value":8,"default_value":2,"float_multiplier":1,"scaled_default":2,"dependents":[]},
+  {"sysex_adress":190,"name":"shuffle value","section":"rhythm_parameter","group":"Rhythm","data_type":"float","ui_type":"slider","min_value":0.5,"max_value":1.5,"default_value":0,"float_multiplier":100.0,"scaled_default":0.0,"dependents":[],"deferred_effect":"recalculate_timer();"},
+  {"sysex_adress":191,"name":"note pushed duration","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"slider","min_value":20,"max_value":1000,"default_value":30,"float_multiplier":1,"scaled_default":30,"dependents":[]},
+  {"sysex_adress":192,"name":"frequency","section":"chord_parameter","group":"Output filter","data_type":"int","ui_type":"slider","min_value":0,"max_value":5000,"default_value":0.5,"float_multiplier":1,"scaled_default":0.5,"dependents":[]},
+  {"sysex_adress":193,"name":"resonance","section":"chord_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0.7,"max_value":5,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":194,"name":"lowpass","section":"chord_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":195,"name":"bandpass","section":"chord_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":196,"name":"highpass","section":"chord_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":1,"default_value":0.5,"float_multiplier":100.0,"scaled_default":50.0,"dependents":[]},
+  {"sysex_adress":197,"name":"output amplifier","section":"chord_parameter","group":"Output filter","data_type":"float","ui_type":"slider","min_value":0,"max_value":2,"default_value":1,"float_multiplier":100.0,"scaled_default":100.0,"dependents":[]},
+  {"sysex_adress":198,"name":"octave change","section":"chord_parameter","group":"General","data_type":"int","ui_type":"discrete_slider","min_value":0,"max_value":4,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  {"sysex_adress":220,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":221,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":222,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":223,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":224,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":225,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":226,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":227,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":228,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":229,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":230,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":231,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":232,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":233,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":234,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  {"sysex_adress":235,"name":"rythm pattern","section":"rhythm_parameter","group":"Rhythm","data_type":"int","ui_type":"select","min_value":0,"max_value":128,"default_value":0,"float_multiplier":1,"scaled_default":0,"dependents":[]},
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  null,
+  {"sysex_adress":255,"name":"master tuning","section":"global_parameter","group":"General","data_type":"int","ui_type":"select","min_value":432,"max_value":444,"default_value":440,"float_multiplier":1,"scaled_default":440,"dependents":[]}
+];
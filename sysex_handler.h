@@ -1,6 +1,11 @@
 #ifndef SYSEX_HANDLER_H
 #define SYSEX_HANDLER_H
 
+#include <stdint.h>
+
+// Set while apply_audio_parameters_batch runs, deferred side effects are skipped until the end
+static bool sysex_batch_active = false;
+
 void apply_audio_parameter(int adress, int value) {
     switch(adress) {
 
@@ -11,13 +16,22 @@ void apply_audio_parameter(int adress, int value) {
             chords_gain.amplitude(value/100.0,100); chord_attack_velocity=value/100.0*127;
             break;
         case 4:
-            chord_pot.set_alternate_default(value);chord_pot.force_update();
+            chord_pot.set_alternate_default(value);
+            if (!sysex_batch_active) {
+                chord_pot.force_update();
+            }
             break;
         case 5:
-            harp_pot.set_alternate_default(value);harp_pot.force_update();
+            harp_pot.set_alternate_default(value);
+            if (!sysex_batch_active) {
+                harp_pot.force_update();
+            }
             break;
         case 6:
-            mod_pot.set_alternate_default(value);mod_pot.force_update();
+            mod_pot.set_alternate_default(value);
+            if (!sysex_batch_active) {
+                mod_pot.force_update();
+            }
             break;
         case 7:
             current_sysex_parameters[7]=version_ID;
@@ -47,7 +61,10 @@ void apply_audio_parameter(int adress, int value) {
             mod_pot.set_alternate_range(value);
             break;
         case 20:
-            bank_led_hue=value; set_led_color(bank_led_hue, 1.0, 1-led_attenuation);
+            bank_led_hue=value;
+            if (!sysex_batch_active) {
+                set_led_color(bank_led_hue, 1.0, 1-led_attenuation);
+            }
             break;
         case 21:
             retrigger_chord=value;
@@ -83,7 +100,10 @@ void apply_audio_parameter(int adress, int value) {
             flat_button_modifier=value;
             break;
         case 32:
-            led_attenuation=value/100.0; set_led_color(bank_led_hue, 1.0, 1-led_attenuation);
+            led_attenuation=value/100.0;
+            if (!sysex_batch_active) {
+                set_led_color(bank_led_hue, 1.0, 1-led_attenuation);
+            }
             break;
         case 33:
             barry_harris_mode=value;
@@ -620,7 +640,10 @@ void apply_audio_parameter(int adress, int value) {
             ws_sin_param=value;calculate_ws_array(); chord_waveshape.shape(wave_shape,257);
             break;
         case 187:
-            rythm_bpm=value;recalculate_timer();
+            rythm_bpm=value;
+            if (!sysex_batch_active) {
+                recalculate_timer();
+            }
             break;
         case 188:
             rythm_loop_length=value;
@@ -629,7 +652,10 @@ void apply_audio_parameter(int adress, int value) {
             rythm_limit_change_to_every=value;
             break;
         case 190:
-            shuffle=value/100.0;recalculate_timer();
+            shuffle=value/100.0;
+            if (!sysex_batch_active) {
+                recalculate_timer();
+            }
             break;
         case 191:
             note_pushed_duration=value;
@@ -713,4 +739,35 @@ void apply_audio_parameter(int adress, int value) {
     }
 }
 
+#define SYSEX_DIRTY(mask, adress) ((mask)[(adress) >> 5] & (1UL << ((adress) & 31)))
+
+// values and dirty_mask are indexed by address, dirty_mask holds 8 words of 32 bits
+void apply_audio_parameters_batch(const int *values, const uint32_t *dirty_mask) {
+    sysex_batch_active = true;
+    for (int word = 0; word < 8; word++) {
+        uint32_t bits = dirty_mask[word];
+        while (bits) {
+            int adress = (word << 5) + __builtin_ctz(bits);
+            bits &= bits - 1;
+            apply_audio_parameter(adress, values[adress]);
+        }
+    }
+    sysex_batch_active = false;
+    if (SYSEX_DIRTY(dirty_mask, 4)) {
+        chord_pot.force_update();
+    }
+    if (SYSEX_DIRTY(dirty_mask, 5)) {
+        harp_pot.force_update();
+    }
+    if (SYSEX_DIRTY(dirty_mask, 6)) {
+        mod_pot.force_update();
+    }
+    if (SYSEX_DIRTY(dirty_mask, 20) || SYSEX_DIRTY(dirty_mask, 32)) {
+        set_led_color(bank_led_hue, 1.0, 1-led_attenuation);
+    }
+    if (SYSEX_DIRTY(dirty_mask, 187) || SYSEX_DIRTY(dirty_mask, 190)) {
+        recalculate_timer();
+    }
+}
+
 #endif // SYSEX_HANDLER_H
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from minicontrol import cache
+from minicontrol.cache import BuildCache, file_digest, generator_sources
+
+
+def test_outputs_are_written_as_utf8(tmp_path, monkeypatch):
+    # The digest is taken over UTF-8 whatever the locale's default encoding, here one that cannot
+    # encode the fragments at all
+    def ascii_locale_open(file, mode='r', encoding=None, **kwargs):
+        return open(file, mode, encoding=encoding or ('ascii' if 'b' not in mode else None), **kwargs)
+    monkeypatch.setattr(cache, 'open', ascii_locale_open, raising=False)
+    output = str(tmp_path / 'index.html')
+    build_cache = BuildCache(str(tmp_path / 'cache.json'))
+    assert build_cache.build(output, 'key', lambda: iter(['tempo ', '♩ = 120', ' – ok']))
+    with open(output, 'rb') as f:
+        assert f.read().decode('utf-8') == 'tempo ♩ = 120 – ok'
+    assert build_cache.entries[output]['digest'] == file_digest(output)
+    assert not build_cache.build(output, 'key', lambda: 'unused')
+
+
+def test_failed_render_leaves_no_partial_file(tmp_path):
+    output = tmp_path / 'sysex_handler.h'
+    output.write_text('previous')
+    build_cache = BuildCache(str(tmp_path / 'cache.json'))
+
+    def render():
+        yield 'half of the '
+        raise RuntimeError('generator failed')
+
+    with pytest.raises(RuntimeError):
+        build_cache.build(str(output), 'key', render)
+    assert output.read_text() == 'previous'
+    assert os.listdir(tmp_path) == ['sysex_handler.h']
+    assert str(output) not in build_cache.entries
+
+
+def test_outputs_edited_by_hand_are_rebuilt(tmp_path):
+    output = tmp_path / 'parameters.index.js'
+    build_cache = BuildCache(str(tmp_path / 'cache.json'))
+    build_cache.build(str(output), 'key', lambda: 'generated')
+    build_cache.save()
+    output.write_text('edited')
+    reloaded = BuildCache(str(tmp_path / 'cache.json'))
+    assert reloaded.build(str(output), 'key', lambda: 'generated')
+    assert output.read_text() == 'generated'
+
+
+def test_corrupt_cache_means_a_full_rebuild(tmp_path):
+    (tmp_path / 'cache.json').write_text('{not json')
+    assert BuildCache(str(tmp_path / 'cache.json')).entries == {}
+
+
+def test_generator_source_changes_change_the_keys(tmp_path, monkeypatch):
+    (tmp_path / 'page.py').write_text('template = 1\n')
+    (tmp_path / 'notes.txt').write_text('not a source')
+    monkeypatch.setattr(cache, 'package_dir', str(tmp_path))
+    before = generator_sources()
+    (tmp_path / 'notes.txt').write_text('still not a source')
+    assert generator_sources() == before
+    (tmp_path / 'page.py').write_text('template = 22\n')
+    assert generator_sources() != before
+    (tmp_path / 'page.py').write_text('template = 1\n')
+    assert generator_sources() == before
+    (tmp_path / 'header.py').write_text('')
+    assert generator_sources() != before
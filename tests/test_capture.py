@@ -0,0 +1,134 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from minicontrol.capture import CaptureStore, StoreExistsError, default_byte_rate, ingest, main, no_bank
+from minicontrol.codec import encode_dump
+from minicontrol.transfer import encode_message
+
+
+def dump_values(bank, level):
+    values = np.zeros(256, dtype=np.int64)
+    values[1] = bank
+    values[143] = level
+    values[20] = 7
+    return values
+
+
+# A session of dumps and parameter messages with noise, an interrupted frame, a frame holding a
+# byte above 0x7F and a dump cut off by the end of the capture. Returns the bytes and what a
+# correct ingest finds in them.
+def synthetic_capture():
+    parts = []
+    expected = {'dumps': [], 'messages': [], 'skipped': 0}
+
+    def add(data, kind=None, row=None):
+        offset = sum(len(part) for part in parts)
+        parts.append(bytes(data))
+        if kind:
+            expected[kind].append((offset, *row))
+
+    add(b'\x90\x40\x7f')
+    add(encode_message(143, 300), 'messages', (no_bank, 143, 300))
+    add(encode_dump(dump_values(2, 500)), 'dumps', (2, 500))
+    add(encode_message(143, 510), 'messages', (2, 143, 510))
+    add(encode_message(143, 510), 'messages', (2, 143, 510))
+    # Interrupted: a new frame starts before this one is closed
+    add(bytes([0xF0, 0x10, 0x01, 0x02]))
+    expected['skipped'] += 1
+    add(encode_message(20, 9), 'messages', (2, 20, 9))
+    add(encode_dump(dump_values(5, 520)), 'dumps', (5, 520))
+    add(b'\x80\x40\x00' * 50)
+    # A data byte above 0x7F is not SysEx data
+    bad = bytearray(encode_message(143, 1))
+    bad[3] = 0x90
+    add(bad)
+    expected['skipped'] += 1
+    add(encode_message(143, 530), 'messages', (5, 143, 530))
+    add(encode_dump(dump_values(5, 530)), 'dumps', (5, 530))
+    # Cut off by the end of the capture
+    add(encode_dump(dump_values(6, 1))[:300])
+    expected['skipped'] += 1
+    return b''.join(parts), expected
+
+
+@pytest.fixture
+def capture(tmp_path):
+    data, expected = synthetic_capture()
+    path = tmp_path / 'session.syx'
+    path.write_bytes(data)
+    return str(path), expected
+
+
+@pytest.mark.parametrize('chunk', [1 << 24, 700, 97])
+def test_ingest_synthetic_stream(tmp_path, capture, chunk):
+    path, expected = capture
+    meta = ingest(path, str(tmp_path / 'session.store'), chunk=chunk)
+    assert (meta['dumps'], meta['messages'], meta['skipped']) == (3, 5, expected['skipped'])
+
+    store = CaptureStore(str(tmp_path / 'session.store'))
+    assert store.dump_column('offset').tolist() == [offset for offset, _, _ in expected['dumps']]
+    assert store.dump_column('bank').tolist() == [bank for _, bank, _ in expected['dumps']]
+    assert store.dump_column(143).tolist() == [level for _, _, level in expected['dumps']]
+    assert np.allclose(store.dump_column('time'), store.dump_column('offset') / default_byte_rate)
+    rows = [
+        (int(offset), int(bank), int(address), int(value)) for offset, bank, address, value in zip(
+            store.message_column('offset'), store.message_column('bank'),
+            store.message_column('address'), store.message_column('value')
+        )
+    ]
+    assert rows == expected['messages']
+
+
+def test_history_merges_dumps_and_messages(tmp_path, capture):
+    path, _ = capture
+    ingest(path, str(tmp_path / 'session.store'))
+    store = CaptureStore(str(tmp_path / 'session.store'))
+    times, banks, values, from_dump = store.history(143, changes_only=False)
+    assert values.tolist() == [300, 500, 510, 510, 520, 530, 530]
+    assert from_dump.tolist() == [False, True, False, False, True, False, True]
+    assert banks.tolist() == [no_bank, 2, 2, 2, 5, 5, 5]
+    assert (np.diff(times) > 0).all()
+    # Repeated values are only reported once
+    _, _, values, _ = store.history(143)
+    assert values.tolist() == [300, 500, 510, 520, 530]
+    with pytest.raises(ValueError):
+        store.history(256)
+
+
+def test_reingest_replaces_the_store(tmp_path, capture):
+    path, _ = capture
+    directory = str(tmp_path / 'session.store')
+    first = ingest(path, directory)
+    (tmp_path / 'session.store' / 'stale').write_text('left over')
+    second = ingest(path, directory)
+    assert first == second
+    assert not os.path.exists(os.path.join(directory, 'stale'))
+    store = CaptureStore(directory)
+    assert len(store.dump_column('offset')) == 3 and len(store.message_column('offset')) == 5
+    assert os.path.getsize(os.path.join(directory, 'messages', 'offset.i8')) == 5 * 8
+
+
+def test_other_paths_are_not_replaced(tmp_path, capture, capsys):
+    path, _ = capture
+    other = tmp_path / 'notes'
+    other.mkdir()
+    (other / 'keep.txt').write_text('keep')
+    with pytest.raises(StoreExistsError):
+        ingest(path, str(other))
+    assert (other / 'keep.txt').exists()
+    assert main(['ingest', path, str(other)]) == 1
+    assert main(['ingest', path, str(other), '--force']) == 0
+    assert not (other / 'keep.txt').exists()
+    with open(other / 'capture.json', 'r') as f:
+        assert json.load(f)['dumps'] == 3
+
+
+def test_empty_capture(tmp_path):
+    path = tmp_path / 'empty.syx'
+    path.write_bytes(b'')
+    meta = ingest(str(path), str(tmp_path / 'empty.store'))
+    assert (meta['dumps'], meta['messages'], meta['skipped']) == (0, 0, 0)
+    assert CaptureStore(str(tmp_path / 'empty.store')).history(143)[2].tolist() == []
@@ -0,0 +1,112 @@
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from minicontrol.codec import (
+    base_adress_rythm, decode_dump, decode_dumps, dump_size, encode_dump, encode_dumps, frame_size, rhythm_steps,
+    rhythm_voices
+)
+
+
+# Feeds frames to MiniChordController.processCurrentData and prints what it hands to onDataReceived
+node_script = r'''
+const fs = require('fs');
+console.log = console.warn = () => {};
+const MiniChordController = eval(fs.readFileSync('minichordcontroller.js', 'utf8') + ';MiniChordController');
+const controller = new MiniChordController();
+const results = [];
+controller.onDataReceived = (data) => results.push(data);
+for (const frame of JSON.parse(fs.readFileSync(0, 'utf8'))) {
+  controller.processCurrentData({data: Uint8Array.from(frame)});
+}
+process.stdout.write(JSON.stringify(results));
+'''
+
+
+def known_values():
+    values = np.zeros(256, dtype=np.int64)
+    values[2:] = (np.arange(2, 256) * 37) % 16384
+    values[1] = 5
+    values[7] = 9
+    values[base_adress_rythm:base_adress_rythm + rhythm_steps] = np.arange(rhythm_steps) * 8 % 128
+    values[255] = 16383
+    return values
+
+
+def test_frame_layout():
+    values = known_values()
+    frame = encode_dump(values)
+    assert len(frame) == frame_size == 514
+    assert len(frame) - 1 == dump_size == 513
+    assert frame[0] == 0xF0 and frame[-1] == 0xF7
+    data = frame[1:]
+    # Bank byte read by processCurrentData as data[2 * 1]
+    assert data[2] == 5
+    for address in range(256):
+        assert data[2 * address] == values[address] & 0x7F
+        assert data[2 * address + 1] == values[address] >> 7
+    assert max(data[:-1]) < 0x80
+
+
+def test_round_trip():
+    values = known_values()
+    dump = decode_dump(encode_dump(values))
+    assert dump.values.tolist() == values.tolist()
+    assert dump.bank == 5
+    assert dump.firmware == pytest.approx(0.09)
+    for step in range(rhythm_steps):
+        value = values[base_adress_rythm + step]
+        assert dump.rhythm[step].tolist() == [bool(value & (1 << voice)) for voice in range(rhythm_voices)]
+
+
+def test_rhythm_and_bank_overrides():
+    rhythm = np.zeros((rhythm_steps, rhythm_voices), dtype=bool)
+    rhythm[3, 0] = rhythm[3, 6] = rhythm[15, 2] = True
+    dump = decode_dump(encode_dump(np.zeros(256, dtype=np.int64), rhythm=rhythm, bank=11))
+    assert dump.bank == 11
+    assert dump.values[base_adress_rythm + 3] == 1 + 64
+    assert dump.values[base_adress_rythm + 15] == 4
+    assert (dump.rhythm == rhythm).all()
+
+
+def test_unframed_dumps():
+    values = np.stack([known_values(), known_values()[::-1]])
+    values[:, 1] = [2, 3]
+    data = encode_dumps(values, framed=False)
+    assert len(data) == 2 * dump_size
+    dumps = decode_dumps(data, framed=False)
+    assert dumps.values.tolist() == values.tolist()
+    assert dumps.bank.tolist() == [2, 3]
+
+
+def test_rejects_bad_frames():
+    frame = bytearray(encode_dump(known_values()))
+    with pytest.raises(ValueError):
+        decode_dump(bytes(frame[:-1]))
+    frame[-1] = 0
+    with pytest.raises(ValueError):
+        decode_dump(bytes(frame))
+    with pytest.raises(ValueError):
+        encode_dump(np.full(256, 1 << 14))
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_matches_process_current_data():
+    values = np.stack([known_values(), np.arange(256) * 61 % 16384])
+    values[1, 1] = 11
+    frames = [list(encode_dump(row)) for row in values]
+    result = subprocess.run(['node', '-e', node_script], input=json.dumps(frames), capture_output=True, text=True, check=True)
+    processed = json.loads(result.stdout)
+    assert len(processed) == len(values)
+    for row, data in zip(values, processed):
+        dump = decode_dump(encode_dump(row))
+        assert data['bankNumber'] == dump.bank
+        assert data['firmwareVersion'] == pytest.approx(dump.firmware)
+        # processCurrentData skips addresses 0 and 1 and keeps address 7 as the firmware version
+        for address in range(2, 256):
+            if address != 7:
+                assert data['parameters'][address] == dump.values[address]
+        assert data['rhythmData'] == dump.rhythm.tolist()
@@ -0,0 +1,139 @@
+import re
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from minicontrol.curves import apply_curve, curve_key, curve_table, curve_tables, table_name
+from minicontrol.header import build_sysex_handler, render_curve_tables
+from minicontrol.model import ParameterModel
+
+
+table_pattern = re.compile(r'static const float (\w+)\[(\d+)\] PROGMEM = \{(.*?)\};', re.S)
+
+
+def float32(value):
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def emitted_tables(header):
+    tables = {}
+    for name, size, body in table_pattern.findall(header):
+        values = [float32(float(entry.rstrip('f'))) for entry in body.replace('\n', ' ').split(',') if entry.strip()]
+        assert len(values) == int(size)
+        tables[name] = values
+    return tables
+
+
+def synthetic_model(parameters):
+    model = ParameterModel()
+    model.parameters = parameters
+    model.sysex_name_map = {}
+    return model
+
+
+# A float parameter whose range does not start at 0
+def offset_model():
+    return synthetic_model({'global_parameter': [
+        {'name': 'depth', 'group': 'General', 'sysex_adress': 22, 'data_type': 'float', 'curve': 'exponential',
+         'min_value': 0.2, 'max_value': 1.5, 'default_value': 0.2, 'ui_type': 'slider', 'method': 'set_depth(value);'},
+        {'name': 'pan', 'group': 'General', 'sysex_adress': 23, 'data_type': 'float',
+         'min_value': 0.1, 'max_value': 0.9, 'default_value': 0.5, 'ui_type': 'slider', 'method': 'set_pan(value);'},
+    ]})
+
+
+# An int and a float exponential parameter over the same device range (0-100)
+def colliding_model():
+    return synthetic_model({'global_parameter': [
+        {'name': 'time', 'group': 'General', 'sysex_adress': 20, 'data_type': 'int', 'curve': 'exponential',
+         'min_value': 0, 'max_value': 100, 'default_value': 0, 'ui_type': 'slider', 'method': 'set_time(value);'},
+        {'name': 'level', 'group': 'General', 'sysex_adress': 21, 'data_type': 'float', 'curve': 'exponential',
+         'min_value': 0, 'max_value': 1, 'default_value': 0, 'ui_type': 'slider', 'method': 'set_level(value);'},
+    ]})
+
+
+def test_emitted_tables_match_curve_table():
+    model = ParameterModel()
+    header = build_sysex_handler(model, curves=True)
+    emitted = emitted_tables(header)
+    expected = curve_tables(model)
+    assert sorted(emitted) == [name for name, _, _ in expected]
+    for name, key, values in expected:
+        assert emitted[name] == [float32(value) for value in values], name
+
+
+def test_handlers_reference_emitted_tables():
+    header = build_sysex_handler(ParameterModel(), curves=True)
+    emitted = emitted_tables(header)
+    referenced = set(re.findall(r'SYSEX_CURVE\((sysex_curve_\w+), value\)', header))
+    assert referenced
+    assert referenced <= set(emitted)
+
+
+def test_same_range_different_multiplier_gets_distinct_tables():
+    model = colliding_model()
+    keys = [curve_key(param) for _, param in model.iter_parameters()]
+    assert keys[0] != keys[1]
+    assert table_name(keys[0]) != table_name(keys[1])
+    header = build_sysex_handler(model, curves=True)
+    names = [name for name, _, _ in table_pattern.findall(header)]
+    assert len(names) == len(set(names)) == 2
+    tables = emitted_tables(header)
+    for key in keys:
+        assert tables[table_name(key)] == [float32(value) for value in curve_table(key)]
+
+
+@pytest.mark.skipif(shutil.which('g++') is None, reason='needs g++')
+def test_curves_header_compiles(tmp_path):
+    header = build_sysex_handler(colliding_model(), curves=True)
+    (tmp_path / 'sysex_handler.h').write_text(header)
+    source = tmp_path / 'main.cpp'
+    source.write_text(
+        'static float time_value, level_value;\n'
+        'static void set_time(float value) { time_value = value; }\n'
+        'static void set_level(float value) { level_value = value; }\n'
+        '#include "sysex_handler.h"\n'
+        'int main() { apply_audio_parameter(20, 50); apply_audio_parameter(21, 50); return 0; }\n'
+    )
+    result = subprocess.run(
+        ['g++', '-fsyntax-only', '-I', str(tmp_path), str(source)], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+# Evaluates SYSEX_CURVE(table, value) in C for every table, from a few values below 0 to a few above
+# the top of the table, and returns {name: [(value, result)]}
+def evaluate_macro(tmp_path, model, margin=3):
+    tables = curve_tables(model)
+    (tmp_path / 'curves.h').write_text(render_curve_tables(model))
+    loops = ''.join(
+        f'    for (int value = {-margin}; value <= {len(values) - 1 + margin}; value++)\n'
+        f'        printf("{name} %d %.9g\\n", value, (double)SYSEX_CURVE({name}, value));\n'
+        for name, _, values in tables
+    )
+    source = tmp_path / 'curves.cpp'
+    source.write_text(f'#include <cstdio>\n#include "curves.h"\nint main() {{\n{loops}    return 0;\n}}\n')
+    binary = tmp_path / 'curves'
+    result = subprocess.run(['g++', '-I', str(tmp_path), '-o', str(binary), str(source)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    output = subprocess.run([str(binary)], capture_output=True, text=True, check=True).stdout
+    evaluated = {}
+    for line in output.splitlines():
+        name, value, applied = line.split()
+        evaluated.setdefault(name, []).append((int(value), float32(float(applied))))
+    return tables, evaluated
+
+
+@pytest.mark.skipif(shutil.which('g++') is None, reason='needs g++')
+@pytest.mark.parametrize('model', [ParameterModel, colliding_model, offset_model])
+def test_macro_matches_apply_curve(tmp_path, model):
+    tables, evaluated = evaluate_macro(tmp_path, model())
+    assert tables
+    for name, key, values in tables:
+        top = len(values) - 1
+        assert [value for value, _ in evaluated[name]] == list(range(-3, top + 4))
+        for value, applied in evaluated[name]:
+            # The macro clamps the index to the table, 0 to the top of the device range
+            expected = float32(apply_curve(key, min(max(value, 0), top)))
+            assert applied == expected, (name, value)
@@ -0,0 +1,80 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from minicontrol.preset import decode_preset
+
+# Runs the load-settings path of index.js, requestDeviceValues, sendPreset and planTransfer taken
+# from the file as they are, against a controller that answers dump requests with the given
+# device values, or never answers when they are null
+node_script = r'''
+const fs = require('fs');
+const source = fs.readFileSync('index.js', 'utf8');
+const extract = (name) => source.match(new RegExp(`(async )?function ${name}\\([^]*?\\n}\\n`))[0];
+const constant = (name) => source.match(new RegExp(`(let|const) ${name} = .*;\\n`))[0];
+eval(fs.readFileSync('parameters.index.js', 'utf8').replace('const PARAMETER_INDEX', 'globalThis.PARAMETER_INDEX'));
+const { device, target, ui } = JSON.parse(fs.readFileSync(0, 'utf8'));
+let parameterIndex = PARAMETER_INDEX;
+let currentValues = ui;
+let dumpWaiters = [];
+const sent = [];
+const controller = {
+  active_bank_number: 3,
+  sendSysEx(bytes) {
+    sent.push(['request', bytes[3]]);
+    if (device !== null) setTimeout(() => {
+      const waiters = dumpWaiters;
+      dumpWaiters = [];
+      waiters.forEach(waiter => waiter({ parameters: device }));
+    }, 5);
+  },
+  sendParameter(sysex, value) { sent.push([sysex, value]); },
+};
+eval([
+  'const DUMP_TIMEOUT_MS = 50;', constant('transferOrder'),
+  constant('SYSEX_MESSAGE_SIZE'), constant('FIRMWARE_ADDRESS'), extract('getTransferOrder'),
+  extract('planTransfer'), extract('requestDeviceValues'), extract('sendPreset'),
+  'globalThis.sendPreset = sendPreset;'
+].join('\n'));
+sendPreset(target).then(plan => process.stdout.write(JSON.stringify({ plan, sent, currentValues })));
+'''
+
+node = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+@pytest.fixture(scope='module')
+def target():
+    with open('shared_presets.json', 'r') as f:
+        return decode_preset(json.load(f)['shared_presets'][0]['value'])
+
+
+def load(device, target, ui):
+    data = json.dumps({'device': device, 'target': target, 'ui': ui})
+    result = subprocess.run(['node', '-e', node_script], input=data, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@node
+def test_diff_against_the_device_not_the_page(target):
+    device = list(target)
+    device[20] = target[20] + 1
+    device[143] = target[143] + 1
+    # The page believes the device already holds the preset, it changed 143 on its own since
+    result = load(device, target, {str(sysex): value for sysex, value in enumerate(target)})
+    assert result['plan']['fresh']
+    sent = result['sent']
+    assert sent[0] == ['request', 3] and sent[-1] == [0, 0]
+    assert sorted(sent[1:-1]) == [[20, target[20]], [143, target[143]]]
+    assert result['currentValues']['143'] == target[143]
+
+
+@node
+def test_full_send_without_a_dump(target):
+    result = load(None, target, {str(sysex): value for sysex, value in enumerate(target)})
+    plan = result['plan']
+    assert not plan['fresh']
+    assert plan['messagesSaved'] == 0
+    assert len(result['sent']) == 1 + plan['fullMessages']
+    assert result['sent'][-1] == [0, 0]
@@ -0,0 +1,96 @@
+import io
+
+import pytest
+
+from minicontrol.migrate import PresetMigrator, migrate_stream, read_library, write_library
+from minicontrol.model import ParameterModel
+from minicontrol.preset import decode_preset, firmware_adress, unset_value
+
+master_tuning = 255
+
+
+def library_values():
+    with open('shared_presets.json', 'r') as f:
+        return [(preset, decode_preset(preset['value'])) for preset in read_library(f)]
+
+
+def migrated_values(migrator):
+    return [decode_preset(preset['value']) for preset in migrate_stream((p for p, _ in library_values()), migrator)]
+
+
+def test_unknown_firmware_keeps_presets_as_they_are():
+    sources = [values for _, values in library_values()]
+    assert sources and all(values[firmware_adress] == 0 for values in sources)
+    migrated = migrated_values(PresetMigrator(ParameterModel(), []))
+    assert migrated == sources
+
+
+def test_master_tuning_stays_unset():
+    sources = [values for _, values in library_values()]
+    assert all(values[master_tuning] == unset_value for values in sources)
+    migrator = PresetMigrator(ParameterModel(), [], assume_firmware=0.09)
+    for source, values in zip(sources, migrated_values(migrator)):
+        assert values[master_tuning] == unset_value
+        assert values[firmware_adress] == 9
+        assert values[:firmware_adress] + values[firmware_adress + 1:] == source[:firmware_adress] + source[firmware_adress + 1:]
+
+
+def test_only_addresses_newer_than_the_source_get_defaults():
+    model = ParameterModel()
+    introduced = {param['sysex_adress']: param.get('introduction_version', 0.01) for _, param in model.iter_parameters()}
+    defaults = {param['sysex_adress']: model.scaled_default(param) for _, param in model.iter_parameters()}
+    migrator = PresetMigrator(model, [], assume_firmware=0.05)
+    for (_, source), values in zip(library_values(), migrated_values(migrator)):
+        for sysex_address in range(len(source)):
+            if sysex_address == firmware_adress:
+                continue
+            if introduced.get(sysex_address, 0) > 0.05:
+                assert values[sysex_address] == defaults[sysex_address]
+            else:
+                assert values[sysex_address] == source[sysex_address]
+
+
+def test_rules_apply_to_older_presets_only():
+    rules = [
+        {'version': 0.04, 'move': {'20': 21, '21': 20}, 'scale': {'143': 0.5}, 'reset': [24]},
+        {'version': 0.08, 'scale': {'143': 2}},
+    ]
+    model = ParameterModel()
+    default_24 = next(model.scaled_default(param) for _, param in model.iter_parameters() if param['sysex_adress'] == 24)
+    sources = [values for _, values in library_values()]
+
+    older = migrated_values(PresetMigrator(model, rules, assume_firmware=0.03))
+    for source, values in zip(sources, older):
+        assert (values[20], values[21]) == (source[21], source[20])
+        assert values[143] == min(max(int(source[143] * 0.5 + 0.5) * 2, 0), unset_value - 1)
+        assert values[24] == default_24
+
+    between = migrated_values(PresetMigrator(model, rules, assume_firmware=0.05))
+    for source, values in zip(sources, between):
+        assert (values[20], values[21], values[24]) == (source[20], source[21], source[24])
+        assert values[143] == source[143] * 2
+
+    # Rules newer than the target are left out
+    capped = PresetMigrator(model, rules, target=0.06, assume_firmware=0.05)
+    assert [rule['version'] for rule in capped.rules] == [0.04]
+
+
+def test_library_round_trip():
+    presets = [preset for preset, _ in library_values()]
+    output = io.StringIO()
+    list(write_library(output, migrate_stream(iter(presets), PresetMigrator(ParameterModel(), []))))
+    output.seek(0)
+    assert [preset['name'] for preset in read_library(output)] == [preset['name'] for preset in presets]
+
+
+def test_short_presets_are_padded_with_unset():
+    values = PresetMigrator(ParameterModel(), []).migrate([0] * 10)
+    assert len(values) == 256
+    assert values[10:] == [unset_value] * 246
+
+
+@pytest.mark.parametrize('raw, firmware', [(0, None), (unset_value, None), (9, 0.09)])
+def test_firmware_is_read_from_address_7(raw, firmware):
+    values = [0] * 256
+    values[firmware_adress] = raw
+    assert PresetMigrator(ParameterModel(), []).firmware(values) == firmware
@@ -0,0 +1,90 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from minicontrol.model import ParameterModel
+from minicontrol.param_index import address_space, build_index_slots, build_parameter_index
+
+# Slot fields index.js reads, the fallback copies the whole definition while the generated slots
+# fill in the defaults of the page
+slot_fields = ('sysex_adress', 'name', 'section', 'group', 'float_multiplier', 'scaled_default', 'dependents')
+defaulted_fields = {'data_type': 'int', 'ui_type': 'hidden', 'min_value': 0, 'max_value': 1, 'default_value': 0}
+
+# Runs the parameters.json fallback of index.js, getFloatMultiplier and loadParameterIndex taken
+# from the file as they are
+node_script = r'''
+const fs = require('fs');
+const source = fs.readFileSync('index.js', 'utf8');
+const extract = (name) => source.match(new RegExp(`(async )?function ${name}\\([^]*?\\n}\\n`))[0];
+let parameterIndex = null;
+const controller = {float_multiplier: 100.0};
+const params = JSON.parse(fs.readFileSync(0, 'utf8'));
+const loadParameters = async () => params;
+eval(extract('getFloatMultiplier') + extract('loadParameterIndex') + ';globalThis.loadParameterIndex = loadParameterIndex;');
+loadParameterIndex().then(index => process.stdout.write(JSON.stringify(index)));
+'''
+
+
+def index_from_generated(text):
+    return json.loads(re.search(r'const PARAMETER_INDEX = (\[.*?\n\]);', text, re.S).group(1))
+
+
+def duplicate_model():
+    model = ParameterModel()
+    model.parameters = {
+        'global_parameter': [
+            {'name': 'a', 'group': 'General', 'sysex_adress': 20, 'data_type': 'float', 'default_value': 0.35,
+             'ui_type': 'slider', 'method': 'set_a(value); apply_audio_parameter(21, value); apply_audio_parameter(20, value);'},
+            {'name': 'b', 'group': 'General', 'sysex_adress': 21, 'data_type': 'int', 'default_value': 3,
+             'ui_type': 'slider', 'dependent_addresses': [22, 20]},
+        ],
+        'harp_parameter': [
+            {'name': 'shadow', 'group': 'Harp', 'sysex_adress': 20, 'data_type': 'int', 'default_value': 1, 'ui_type': 'slider'},
+            {'name': 'c', 'group': 'Harp', 'sysex_adress': 22, 'data_type': 'float', 'float_multiplier': 10,
+             'default_value': 1.5, 'ui_type': 'checkbox'},
+        ],
+    }
+    return model
+
+
+@pytest.mark.parametrize('model', [ParameterModel, duplicate_model])
+def test_generated_index_parses_back(model):
+    model = model()
+    slots = build_index_slots(model)
+    assert len(slots) == address_space
+    assert index_from_generated(build_parameter_index(model)) == slots
+
+
+def test_first_definition_wins():
+    slots = build_index_slots(duplicate_model())
+    assert slots[20]['name'] == 'a' and slots[20]['section'] == 'global_parameter'
+    assert slots[20]['dependents'] == [21]
+    assert slots[21]['dependents'] == [20, 22]
+    assert slots[22]['scaled_default'] == 15
+    assert sum(slot is not None for slot in slots) == 3
+
+
+def test_slices_name_their_firmware():
+    sliced = ParameterModel().sliced(0.03)
+    assert build_parameter_index(sliced).endswith('const FIRMWARE_SLICE = 0.03;\n')
+    assert 'FIRMWARE_SLICE' not in build_parameter_index(ParameterModel())
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+@pytest.mark.parametrize('model', [ParameterModel, duplicate_model])
+def test_slots_match_the_javascript_fallback(model):
+    model = model()
+    result = subprocess.run(['node', '-e', node_script], input=json.dumps(model.parameters), capture_output=True, text=True, check=True)
+    fallback = json.loads(result.stdout)
+    slots = build_index_slots(model)
+    assert [slot is None for slot in fallback] == [slot is None for slot in slots]
+    for expected, slot in zip(fallback, slots):
+        if slot is None:
+            continue
+        for field in slot_fields:
+            assert slot[field] == expected[field], field
+        for field, default in defaulted_fields.items():
+            assert slot[field] == expected.get(field, default), field
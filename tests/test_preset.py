@@ -0,0 +1,51 @@
+import base64
+import json
+import math
+import shutil
+import subprocess
+
+import pytest
+
+from minicontrol.preset import decode_legacy, decode_preset, encode_binary_text, encode_legacy, js_parse_float, unset_value
+
+fields = [
+    '', ' ', '12', ' 12', '\t\n12', '12abc', '12.5.3', '3.5e1x', '1e', '1e+', '1e-2', '1E2', '.5', '5.', '.', '-.5',
+    '+7', '-0', '--1', '+-1', '0x10', '1_000', 'abc', 'nan', 'NaN', 'inf', 'Infinity', '-Infinity', '+Infinityx',
+    'Infinit', '1e999', '007', '12 34', '1,5', '\x1c12',
+]
+
+
+def legacy(text):
+    return base64.b64encode(text.encode('ascii')).decode('ascii')
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_fields_parse_as_in_javascript():
+    script = "process.stdout.write(JSON.stringify(JSON.parse(require('fs').readFileSync(0, 'utf8')).map(v => String(parseFloat(v)))))"
+    result = subprocess.run(['node', '-e', script], input=json.dumps(fields), capture_output=True, text=True, check=True)
+    for field, expected in zip(fields, json.loads(result.stdout)):
+        value = js_parse_float(field)
+        if expected == 'NaN':
+            assert math.isnan(value), field
+        else:
+            assert value == float(expected.replace('Infinity', 'inf')), field
+
+
+def test_trailing_junk_is_ignored():
+    assert decode_legacy(legacy(' 12abc;3.5e1x;;x;.5;-0.4;1e2e3')) == [12, 35, unset_value, unset_value, 1, 0, 100]
+
+
+@pytest.mark.parametrize('field', ['Infinity', '-Infinity', '1e999', '-1', '65536'])
+def test_values_the_device_cannot_hold_are_rejected(field):
+    with pytest.raises(ValueError):
+        decode_legacy(legacy(f'1;{field};3'))
+    with pytest.raises(ValueError):
+        decode_preset(legacy(f'1;{field};3'))
+
+
+def test_library_codes_round_trip():
+    with open('shared_presets.json', 'r') as f:
+        for preset in json.load(f)['shared_presets']:
+            values = decode_preset(preset['value'])
+            assert decode_legacy(encode_legacy(values)) == values
+            assert decode_preset(encode_binary_text(values)) == values
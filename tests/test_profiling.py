@@ -0,0 +1,85 @@
+import time
+
+from minicontrol import profiling
+from minicontrol.cli import parse_args
+from minicontrol.profiling import Profiler, compare_reports, iterate, stage
+
+
+def fragments(delay):
+    for i in range(3):
+        time.sleep(delay)
+        yield str(i)
+
+
+def test_stages_do_nothing_without_a_profiler():
+    assert profiling._active is None
+    with stage('outside'):
+        pass
+    source = fragments(0)
+    assert iterate('outside', source) is source
+
+
+def test_nested_stages_and_items():
+    with Profiler() as profiler:
+        with stage('page'):
+            for name in ('a', 'b', 'a'):
+                with stage('param', item=name):
+                    time.sleep(0.002 if name == 'b' else 0)
+        with stage('header'):
+            pass
+    stages = {entry['stage']: entry for entry in profiler.report(target='build')['stages']}
+    assert list(stages) == ['page/param', 'page', 'header']
+    assert stages['page/param']['calls'] == 3
+    assert [item['item'] for item in stages['page/param']['slowest']] == ['b', 'a']
+    assert stages['page']['seconds'] >= stages['page/param']['seconds']
+    # Block counts and tracemalloc bytes are only reported where they were measured
+    assert 'blocks' in stages['page'] and 'blocks' not in stages['page/param']
+    assert 'peak_bytes' not in stages['page']
+    assert [line.split()[0] for line in profiler.summary()] == ['page', 'header']
+    assert profiling._active is None
+
+
+def test_iterate_times_the_producer_only():
+    with Profiler() as profiler:
+        for _ in iterate('fragments', fragments(0.002)):
+            time.sleep(0.01)
+    (entry,) = profiler.report()['stages']
+    assert entry['calls'] == 1
+    assert 0.006 <= entry['seconds'] < 0.03
+
+
+def test_max_depth_skips_deeper_stages():
+    with Profiler(max_depth=1) as profiler:
+        with stage('page'):
+            with stage('param'):
+                pass
+            assert iterate('fragments', ['x']) == ['x']
+    assert [entry['stage'] for entry in profiler.report()['stages']] == ['page']
+
+
+def test_memory_and_calls():
+    with Profiler(trace_memory=True, profile_calls=True) as profiler:
+        with stage('allocate'):
+            with stage('inner'):
+                kept = [bytearray(1000) for _ in range(100)]
+    report = profiler.report()
+    stages = {entry['stage']: entry for entry in report['stages']}
+    assert stages['allocate/inner']['allocated_bytes'] >= 100 * 1000
+    assert stages['allocate']['peak_bytes'] >= stages['allocate/inner']['peak_bytes'] > 0
+    assert report['functions']
+    assert profiler.exclusive
+    del kept
+
+
+def test_compare_reports():
+    before = {'stages': [{'stage': 'page', 'seconds': 0.02}, {'stage': 'header', 'seconds': 0.01}]}
+    after = {'stages': [{'stage': 'page', 'seconds': 0.01}, {'stage': 'header', 'seconds': 0.02}, {'stage': 'new', 'seconds': 0.001}]}
+    lines = compare_reports(before, after)
+    assert [line.split()[0] for line in lines[1:]] == ['header', 'new', 'page']
+    assert lines[1].endswith('+100%') and lines[2].endswith('new') and lines[3].endswith('-50%')
+
+
+def test_cli_depth_option():
+    assert parse_args(['--profile', 'report.json', '--profile-depth', '2']).profile_depth == 2
+    assert parse_args(['--max-depth', '3']).profile_depth == 3
+    assert parse_args([]).profile_depth is None
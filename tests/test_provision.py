@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from minicontrol.device import VirtualMinichord, bank_count
+from minicontrol.model import ParameterModel
+from minicontrol.preset import unset_value
+from minicontrol.provision import LoopbackTransport, Provisioner, Transport, library_banks, main
+
+
+@pytest.fixture(scope='module')
+def model():
+    return ParameterModel()
+
+
+@pytest.fixture(scope='module')
+def banks():
+    with open('shared_presets.json', 'r') as f:
+        return library_banks(json.load(f))
+
+
+def provision(model, banks, transports, retries=3, timeout=0.05):
+    provisioner = Provisioner(model, banks, retries=retries, timeout=timeout)
+    return provisioner, asyncio.run(provisioner.run(transports))
+
+
+def assert_saved(provisioner, device):
+    for bank, target in enumerate(provisioner.banks):
+        for sysex_address in provisioner.order.addresses:
+            if target[sysex_address] != unset_value:
+                assert device.banks[bank][sysex_address] == target[sysex_address], (bank, sysex_address)
+
+
+def test_every_bank_is_saved(model, banks):
+    devices = [VirtualMinichord(model) for _ in range(3)]
+    provisioner, results = provision(model, banks, [LoopbackTransport(device, f'd{i}') for i, device in enumerate(devices)])
+    for device, metrics in zip(devices, results):
+        assert (metrics.banks_saved, metrics.banks_failed, metrics.retries) == (bank_count, 0, 0)
+        assert len(metrics.bank_latencies) == bank_count
+        assert_saved(provisioner, device)
+
+
+def test_lost_messages_are_retried(model, banks):
+    devices = [VirtualMinichord(model) for _ in range(4)]
+    transports = [LoopbackTransport(device, f'd{i}', loss_rate=0.02, seed=i) for i, device in enumerate(devices)]
+    provisioner, results = provision(model, banks, transports, retries=10)
+    assert sum(metrics.retries for metrics in results) > 0
+    for device, metrics in zip(devices, results):
+        assert metrics.banks_saved == bank_count and not metrics.errors
+        assert_saved(provisioner, device)
+
+
+def test_failed_banks_stay_out_of_the_latencies(model, banks):
+    _, (metrics,) = provision(model, banks, [LoopbackTransport(VirtualMinichord(model), loss_rate=1.0)], retries=1, timeout=0.01)
+    assert (metrics.banks_saved, metrics.banks_failed) == (0, bank_count)
+    assert metrics.retries == bank_count
+    assert metrics.bank_latencies == []
+    summary = metrics.summary()
+    assert summary['bank_latency_mean_ms'] is None and summary['bank_latency_p95_ms'] is None
+    assert summary['errors'][0] == 'bank 0: no dump after 2 attempts'
+
+
+def test_values_are_clamped_to_the_control_ranges(model, banks):
+    provisioner = Provisioner(model, banks)
+    (low, high), = [provisioner.ranges[255]]
+    values = list(banks[0])
+    values[255] = high + 100
+    assert provisioner.clamp(values)[255] == high
+    values[255] = unset_value
+    assert provisioner.clamp(values)[255] == unset_value
+
+
+def test_bank_count_is_checked(model, banks):
+    with pytest.raises(ValueError):
+        Provisioner(model, banks[:5])
+
+
+def test_transport_needs_send_and_receive():
+    class SendOnly(Transport):
+        async def send(self, message):
+            pass
+    with pytest.raises(TypeError):
+        SendOnly()
+
+
+def test_cli_reports_failures(capsys):
+    assert main(['--loopback', '2', '--latency', '0', '--json']) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert [device['banks_saved'] for device in report['devices']] == [bank_count, bank_count]
+    assert main(['--loopback', '1', '--latency', '0', '--loss-rate', '1', '--retries', '0', '--timeout', '0.01']) == 1
@@ -0,0 +1,73 @@
+import base64
+import json
+
+import numpy as np
+import pytest
+
+from minicontrol.model import ParameterModel
+from minicontrol.preset import decode_binary, decode_preset, parameter_size, unset_value
+from minicontrol.randomize import ParameterRanges, encode_binary_batch, random_library, sample_presets
+
+
+@pytest.fixture(scope='module')
+def ranges():
+    return ParameterRanges(ParameterModel())
+
+
+def library_values():
+    with open('shared_presets.json', 'r') as f:
+        return [decode_preset(preset['value']) for preset in json.load(f)['shared_presets']]
+
+
+@pytest.mark.parametrize('curve_aware', [False, True])
+def test_samples_stay_in_range(ranges, curve_aware):
+    values = sample_presets(ranges, 5000, seed=1, curve_aware=curve_aware).astype(np.float64)
+    random = ~ranges.fixed
+    device_multiplier = np.where(ranges.is_float, ranges.multiplier, 1.0)
+    sampled = values[:, ranges.addresses[random]]
+    assert (sampled >= np.round(ranges.low * device_multiplier)[random]).all()
+    assert (sampled <= np.round(ranges.high * device_multiplier)[random]).all()
+    # Floats keep two decimals once scaled back
+    floats = sampled[:, ranges.is_float[random]] / ranges.multiplier[random][ranges.is_float[random]]
+    assert np.allclose(floats * 100, np.round(floats * 100))
+
+
+def test_fixed_and_unset_addresses(ranges):
+    values = sample_presets(ranges, 100, seed=2)
+    model = ParameterModel()
+    defaults = {param['sysex_adress']: model.scaled_default(param) for _, param in model.iter_parameters()}
+    for sysex_address in ranges.addresses[ranges.fixed]:
+        assert (values[:, sysex_address] == defaults[sysex_address]).all()
+    untouched = np.setdiff1d(np.arange(parameter_size), ranges.addresses)
+    assert (values[:, untouched] == unset_value).all()
+
+
+def test_seeded_batches_are_reproducible_across_sizes(ranges):
+    assert (sample_presets(ranges, 10, seed=3) == sample_presets(ranges, 40, seed=3)[:10]).all()
+    assert not (sample_presets(ranges, 10, seed=3) == sample_presets(ranges, 10, seed=4)).all()
+
+
+def test_library_presets_centre_the_samples(ranges):
+    library = library_values()
+    centre = library[0]
+    values = sample_presets(ranges, 4000, seed=5, library_values=[centre])
+    for sysex_address in ranges.addresses[~ranges.fixed]:
+        if centre[sysex_address] == unset_value:
+            continue
+        position = np.flatnonzero(ranges.addresses == sysex_address)[0]
+        multiplier = ranges.multiplier[position] if ranges.is_float[position] else 1.0
+        low, high = ranges.low[position] * multiplier, ranges.high[position] * multiplier
+        if low < centre[sysex_address] < high and high - low >= 10:
+            assert abs(np.median(values[:, sysex_address]) - centre[sysex_address]) <= 0.05 * (high - low), sysex_address
+
+
+def test_binary_records_decode_to_the_samples(ranges):
+    values = sample_presets(ranges, 20, seed=6)
+    records = encode_binary_batch(values, firmware=9)
+    library = random_library(records)
+    assert [preset['name'] for preset in library['shared_presets']][:2] == ['random 01', 'random 02']
+    for row, preset in zip(values, library['shared_presets']):
+        decoded, firmware, bank = decode_binary(base64.b64decode(preset['value']))
+        assert list(decoded) == row.tolist()
+        assert firmware == 9
+        assert decode_preset(preset['value']) == row.tolist()
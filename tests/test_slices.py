@@ -0,0 +1,83 @@
+import json
+import os
+import re
+
+import pytest
+
+from minicontrol.cache import BuildCache
+from minicontrol.model import ParameterModel
+from minicontrol.slices import build_slices
+
+repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    # Slices resolve their paths against the working directory, the page's root
+    monkeypatch.chdir(tmp_path)
+    return ParameterModel(os.path.join(repository, 'parameters.json'), os.path.join(repository, 'sysex_name_map.json'))
+
+
+def build(model, directory):
+    report = build_slices(model, BuildCache('cache.json'), directory)
+    with open(os.path.join(directory, 'slices.json'), 'r') as f:
+        return report, json.load(f)
+
+
+def page_of(directory, entry):
+    with open(os.path.join(directory, entry['page']), 'r') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('directory', ['firmware', os.path.join('out', 'fw')])
+def test_manifest_pages_are_relative_to_the_manifest(model, directory):
+    report, manifest = build(model, directory)
+    versions = model.introduction_versions()
+    assert [entry['firmware'] for entry in manifest] == versions
+    assert [firmware for firmware, _, _ in report] == versions
+    for entry in manifest:
+        assert entry['page'] == f"{entry['firmware']}/index.html"
+        assert os.path.exists(os.path.join(directory, entry['page']))
+
+
+@pytest.mark.parametrize('directory', ['firmware', os.path.join('out', 'fw')])
+def test_pages_resolve_against_the_root(model, directory):
+    _, manifest = build(model, directory)
+    for entry in manifest:
+        page = page_of(directory, entry)
+        base = re.search(r'<base href="([^"]*)" />', page).group(1)
+        slice_dir = os.path.join(directory, str(entry['firmware']))
+        assert os.path.normpath(os.path.join(slice_dir, base)) == '.'
+        # Shared scripts come from the root, the slice's own index from its directory
+        scripts = re.findall(r'<script src="([^"]*)"></script>', page)
+        assert 'index.js' in scripts
+        assert f"{directory.replace(os.sep, '/')}/{entry['firmware']}/parameters.index.js" in scripts
+        for script in scripts:
+            if script.endswith('parameters.index.js'):
+                assert os.path.exists(script)
+
+
+def test_pages_name_a_manifest_outside_firmware(model):
+    _, manifest = build(model, 'firmware')
+    assert 'firmware-slices' not in page_of('firmware', manifest[0])
+    directory = os.path.join('out', 'fw')
+    _, manifest = build(model, directory)
+    for entry in manifest:
+        meta = re.search(r'<meta name="firmware-slices" content="([^"]*)" />', page_of(directory, entry)).group(1)
+        assert meta == 'out/fw/slices.json'
+        assert os.path.exists(meta)
+
+
+def test_slices_only_hold_supported_parameters(model):
+    report, manifest = build(model, 'firmware')
+    counts = {firmware: count for firmware, count, _ in report}
+    for entry in manifest:
+        expected = [
+            param['sysex_adress'] for _, param in model.iter_parameters()
+            if param.get('introduction_version', 0.01) <= entry['firmware']
+        ]
+        assert counts[entry['firmware']] == len(expected)
+        with open(os.path.join('firmware', str(entry['firmware']), 'parameters.index.js'), 'r') as f:
+            index = f.read()
+        assert index.endswith(f"const FIRMWARE_SLICE = {entry['firmware']};\n")
+    assert counts[manifest[-1]['firmware']] == sum(1 for _ in model.iter_parameters())
@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from minicontrol.model import ParameterModel
+from minicontrol.preset import binary_format, decode_preset, encode_binary_text, encode_legacy, unset_value
+from minicontrol.store import PresetStore, main, model_defaults, preset_hash
+
+
+@pytest.fixture(scope='module')
+def library():
+    with open('shared_presets.json', 'r') as f:
+        return json.load(f)
+
+
+def mixed_library(library):
+    presets = [dict(preset) for preset in library['shared_presets']]
+    first = decode_preset(presets[0]['value'])
+    presets += [
+        # The same values again, under another name and in the binary format
+        {'name': 'copy', 'author': 'someone', 'value': encode_binary_text(first, 9, 3), 'format': binary_format},
+        dict(presets[1], name='again'),
+        # Shorter and longer than a dump, and an unpadded legacy code
+        {'name': 'short', 'author': 'old', 'value': encode_legacy(first[:200])},
+        {'name': 'long', 'author': 'new', 'value': encode_binary_text(first + [5, 6]), 'format': binary_format},
+        {'name': 'unpadded', 'author': 'old', 'value': encode_legacy(first[:10]).rstrip('='), 'tags': ['x']},
+    ]
+    return {'shared_presets': presets}
+
+
+def test_export_round_trip(library):
+    store = PresetStore.from_library(library, ParameterModel())
+    assert store.library() == library
+
+
+@pytest.mark.parametrize('base_names', [(), ('again',)])
+def test_export_round_trip_of_mixed_records(library, base_names):
+    mixed = mixed_library(library)
+    store = PresetStore.from_library(mixed, ParameterModel(), base_names)
+    assert store.library() == mixed
+    report = store.report()
+    assert report['presets'] == len(mixed['shared_presets'])
+    assert report['duplicates'] == 2
+    if base_names:
+        assert report['stored_against_base'] > 0
+
+
+def test_save_and_load(library, tmp_path):
+    mixed = mixed_library(library)
+    PresetStore.from_library(mixed, ParameterModel(), ('again',)).save(str(tmp_path / 'presets.store.npz'))
+    store = PresetStore.load(str(tmp_path / 'presets.store.npz'))
+    assert store.library() == mixed
+
+
+def test_format_conversion_keeps_the_values(library):
+    mixed = mixed_library(library)
+    store = PresetStore.from_library(mixed, ParameterModel())
+    for output_format in (binary_format, 'legacy'):
+        exported = store.library(output_format)['shared_presets']
+        assert [decode_preset(preset['value']) for preset in exported] == [decode_preset(preset['value']) for preset in mixed['shared_presets']]
+        assert all((preset.get('format') == binary_format) == (output_format == binary_format) for preset in exported)
+
+
+def test_materialized_objects_match_their_hash(library):
+    store = PresetStore.from_library(mixed_library(library), ParameterModel(), ('again',))
+    rows = store.materialize()
+    reference = np.full(rows.shape[1], unset_value, dtype=np.uint16)
+    reference[:len(store.defaults)] = store.defaults
+    for object_id, row in enumerate(rows):
+        length = store.lengths[object_id]
+        assert preset_hash(row[:length]) == store.hashes[object_id]
+        assert (row[length:] == reference[length:]).all()
+
+
+def test_find(library):
+    store = PresetStore.from_library(mixed_library(library), ParameterModel())
+    names = store.entries['name']
+    assert [names[entry] for entry in store.find(name='COPY')] == ['copy']
+    assert set(names[entry] for entry in store.find(author='old')) == {'short', 'unpadded'}
+    assert len(store.find()) == len(store)
+    copies = store.find_hash(store.hashes[store.entries['object'][0]][:10])
+    assert [names[entry] for entry in copies] == [names[0], 'copy']
+    with pytest.raises(ValueError):
+        PresetStore.from_library(library, ParameterModel(), ('missing',))
+
+
+def test_cli_build_and_export(library, tmp_path, capsys):
+    store_path = str(tmp_path / 'shared.store.npz')
+    exported = tmp_path / 'exported.json'
+    assert main(['build', 'shared_presets.json', '-o', store_path]) == 0
+    assert main(['export', str(exported), '--store', store_path]) == 0
+    assert json.loads(exported.read_text()) == library
+    assert main(['report', '--store', store_path]) == 0
+    assert 'distinct' in capsys.readouterr().out
+
+
+def test_empty_library():
+    store = PresetStore.from_library({'shared_presets': []}, ParameterModel())
+    assert len(store) == 0 and store.library() == {'shared_presets': []}
+    assert np.array_equal(store.defaults, model_defaults(ParameterModel()))
@@ -0,0 +1,100 @@
+import pytest
+
+from minicontrol.model import ParameterModel
+from minicontrol.validate import ValidationError, check_model, format_errors, validate_model
+
+
+def model_of(*params, group='global_parameter'):
+    model = ParameterModel()
+    model.parameters = {group: list(params)}
+    return model
+
+
+def param(sysex_address=20, **fields):
+    return {
+        'name': f'p{sysex_address}', 'group': 'General', 'sysex_adress': sysex_address, 'data_type': 'int',
+        'default_value': 0, 'ui_type': 'slider', 'min_value': 0, 'max_value': 10, **fields
+    }
+
+
+def errors_of(*params):
+    errors, _ = validate_model(model_of(*params))
+    return dict(errors)
+
+
+def test_repository_parameters_are_valid():
+    assert validate_model(ParameterModel()) == ([], [])
+
+
+def test_missing_fields_and_bad_addresses():
+    incomplete = {'name': 'x', 'sysex_adress': 21}
+    errors = errors_of(param(20), param(20), param(300), param(True), incomplete)
+    assert errors['$.global_parameter[1].sysex_adress'].startswith('duplicate address 20')
+    assert 'outside' in errors['$.global_parameter[2].sysex_adress']
+    assert 'outside' in errors['$.global_parameter[3].sysex_adress']
+    assert errors['$.global_parameter[4].group'] == 'missing required field'
+    assert errors['$.global_parameter[4].ui_type'] == 'missing required field'
+
+
+def test_values_must_fit_fourteen_bits():
+    errors = errors_of(param(20, data_type='float', max_value=200), param(21, options=[{'value': 1 << 14}]))
+    assert 'does not fit' in errors['$.global_parameter[0].max_value']
+    assert 'does not fit' in errors['$.global_parameter[1].options[0].value']
+
+
+def test_mistyped_fields_are_reported_not_raised():
+    errors = errors_of(
+        param(20, min_value='low', max_value=None, float_multiplier='x'),
+        param(21, options=['a', {'value': 'x'}]),
+        param(22, options={'value': 1}),
+        param(23, method=['set(value);']),
+        param(24, dependent_addresses=[[20], 'x', 20]),
+        param(25, dependent_addresses=20),
+        param(26, name=['listed']),
+        'not a parameter',
+        param(27, data_type='double'),
+    )
+    assert errors == {
+        '$.global_parameter[0].float_multiplier': "'x' is not a number",
+        '$.global_parameter[0].min_value': "'low' is not a number",
+        '$.global_parameter[0].max_value': 'None is not a number',
+        '$.global_parameter[1].options[0]': "option must be an object, not 'a'",
+        '$.global_parameter[1].options[1].value': "'x' is not a number",
+        '$.global_parameter[2].options': "{'value': 1} is not a list",
+        '$.global_parameter[3].method': "['set(value);'] is not a string",
+        '$.global_parameter[4].dependent_addresses[0]': '[20] is not an address',
+        '$.global_parameter[4].dependent_addresses[1]': "'x' is not an address",
+        '$.global_parameter[5].dependent_addresses': '20 is not a list',
+        '$.global_parameter[6].name': "['listed'] is not a string",
+        '$.global_parameter[7]': "parameter must be an object, not 'not a parameter'",
+        '$.global_parameter[8].data_type': "unknown data type 'double'",
+    }
+
+
+def test_references_must_resolve():
+    errors = errors_of(param(20, dependent_addresses=[21, 30]), param(21, method='set(value); apply_audio_parameter(31, value);'))
+    assert errors == {
+        '$.global_parameter[0].dependent_addresses[1]': 'references address 30, which no parameter defines',
+        '$.global_parameter[1].method': 'references address 31, which no parameter defines',
+    }
+
+
+def test_group_must_be_a_list():
+    model = ParameterModel()
+    model.parameters = {'global_parameter': {'name': 'x'}}
+    assert validate_model(model)[0] == [('$.global_parameter', 'parameter group must be a list')]
+
+
+def test_stale_name_order_only_warns():
+    errors, warnings = validate_model(model_of(param(20)), {'global_parameter': {'General': ['p20', 'gone']}})
+    assert errors == []
+    assert warnings == [('parameter_name_order.global_parameter.General', "'gone' matches no parameter")]
+
+
+def test_check_model_raises_with_every_error():
+    with pytest.raises(ValidationError) as raised:
+        check_model(model_of(param(20), param(20, method=7)))
+    assert format_errors(raised.value.errors) == [
+        '$.global_parameter[1].sysex_adress: duplicate address 20, already used by $.global_parameter[0]',
+        '$.global_parameter[1].method: 7 is not a string',
+    ]
@@ -0,0 +1,72 @@
+import os
+from types import SimpleNamespace
+
+from minicontrol import watch
+
+
+def touch(path):
+    mtime = os.stat(path).st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+# Runs the watch loop on a parameters file saved once after it starts, each call of run is handed
+# to the next of builds. The loop is stopped after a fixed number of polls.
+def run_watch(monkeypatch, tmp_path, builds, polls=200):
+    parameters = tmp_path / 'parameters.json'
+    name_map = tmp_path / 'sysex_name_map.json'
+    parameters.write_text('{}')
+    name_map.write_text('{}')
+    files = SimpleNamespace(parameters=str(parameters), name_map=str(name_map))
+    calls = []
+    sleeps = []
+
+    def sleep(delay):
+        sleeps.append(delay)
+        if len(sleeps) == 1:
+            touch(files.parameters)
+        if len(sleeps) > polls:
+            raise KeyboardInterrupt
+
+    def run(model, cache, args):
+        calls.append(len(calls))
+        return builds[min(len(calls), len(builds)) - 1](files)
+
+    monkeypatch.setattr(watch, 'watched_files', lambda model: [files.parameters, files.name_map])
+    monkeypatch.setattr(watch, 'apply_changes', lambda model, changed: None)
+    monkeypatch.setattr(watch, 'run', run)
+    monkeypatch.setattr(watch.time, 'sleep', sleep)
+    watch.watch(SimpleNamespace(name_map_path=files.name_map), SimpleNamespace(force=False), SimpleNamespace(serve=None))
+    return calls
+
+
+def test_save_during_build_is_rebuilt(monkeypatch, tmp_path, capsys):
+    def save_while_building(files):
+        touch(files.parameters)
+        return 0
+    calls = run_watch(monkeypatch, tmp_path, [save_while_building, lambda files: 0])
+    assert len(calls) == 2
+    assert capsys.readouterr().out.count('Rebuilt in') == 2
+
+
+def test_name_map_written_by_the_build_is_not_an_edit(monkeypatch, tmp_path):
+    def write_name_map(files):
+        touch(files.name_map)
+        return 0
+    assert len(run_watch(monkeypatch, tmp_path, [write_name_map])) == 1
+
+
+def test_failed_build_is_reported(monkeypatch, tmp_path, capsys):
+    def fail(files):
+        raise TypeError('unsupported operand')
+    assert len(run_watch(monkeypatch, tmp_path, [fail])) == 1
+    out = capsys.readouterr().out
+    assert 'Build failed: TypeError: unsupported operand' in out
+    assert 'Build failed after changes to' in out
+    assert 'Rebuilt in' not in out
+
+
+def test_non_zero_status_is_not_a_rebuild(monkeypatch, tmp_path, capsys):
+    run_watch(monkeypatch, tmp_path, [lambda files: 1])
+    out = capsys.readouterr().out
+    assert 'Build failed after changes to' in out
+    assert 'Rebuilt in' not in out